@@ -4,13 +4,40 @@
 # Copyright 2020 Ecosoft Co., Ltd. (<http://ecosoft.co.th>)
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
-from odoo import _, api, fields, models
+from collections import defaultdict
+
+from odoo import Command, _, api, fields, models
+from odoo.exceptions import UserError
+from odoo.tools import clean_context, float_compare
+
+LOG_ACCESS_USER_COLUMNS = ("create_uid", "write_uid")
+LOG_ACCESS_DATE_COLUMNS = ("create_date", "write_date")
+
+
+def _get_copied_one2many_fields(model):
+    return [
+        name
+        for name, field in model._fields.items()
+        if field.type == "one2many" and field.store and field.copy
+    ]
 
 
 class BaseRevision(models.AbstractModel):
     _name = "base.revision"
     _description = "Document Revision (abstract)"
 
+    # How copy_revision_with_context duplicates the document: "orm" through
+    # copy(), "sql" by cloning the rows of the document and of its lines with
+    # INSERT ... SELECT (see _copy_revision_sql). The "revision_copy_mode"
+    # context key overrides it.
+    _revision_copy_mode = "orm"
+
+    # Line values compared by get_revision_diff, with the decimal precision
+    # application of the numbers (the currency's when None), and the line
+    # value whose difference is the amount delta of a line.
+    _revision_diff_fields = {}
+    _revision_diff_amount_field = None
+
     @api.depends("old_revision_ids")
     def _compute_has_old_revisions(self):
         for rec in self:
@@ -87,15 +114,362 @@ class BaseRevision(models.AbstractModel):
         return {"active": False, "current_revision_id": new_revision.id}
 
     def copy_revision_with_context(self):
-        default_data = self.default_get([])
         new_rev_number = self.revision_number + 1
         vals = self._get_new_rev_data(new_rev_number)
-        default_data.update(vals)
-        new_revision = self.copy(default_data)
+        copy_mode = self._context.get("revision_copy_mode", self._revision_copy_mode)
+        if copy_mode == "sql" and not self._inherits:
+            new_revision = self._copy_revision_sql(vals)
+        else:
+            default_data = self.default_get([])
+            default_data.update(vals)
+            new_revision = self.copy(default_data)
         self.old_revision_ids.write({"current_revision_id": new_revision.id})
         self.write(self._prepare_revision_data(new_revision))
         return new_revision
 
+    def _get_revision_sql_one2many_fields(self):
+        """One2many fields whose lines are cloned with the document in "sql" mode,
+        in cloning order: the copied ones by default."""
+        return _get_copied_one2many_fields(self)
+
+    def _get_revision_sql_line_domain(self, field):
+        """Domain of the lines of the one2many ``field`` cloned in "sql" mode, to
+        leave out the lines the copy_data() of its model does not copy."""
+        return []
+
+    def _copy_revision_sql(self, vals):
+        """
+        Duplicate the document for a new revision with set-based SQL: one
+        INSERT ... SELECT for the document and one per line model, whatever
+        the number of lines, instead of copy() creating every line through the
+        ORM. The columns are handled like copy() does, the copied values and the
+        defaults of the others, and the many2one columns pointing at a cloned
+        row are remapped to its copy. No python constraint, onchange or chatter
+        is run, and the fields computed from changed values are only marked to
+        be recomputed on the next flush.
+        """
+        self.ensure_one()
+        self.env.flush_all()
+        overrides = {
+            name: value
+            for name, value in vals.items()
+            if self._fields[name].store and self._fields[name].column_type
+        }
+        return self._revision_sql_clone(
+            self,
+            [self.id],
+            overrides,
+            {},
+            self._get_revision_sql_one2many_fields(),
+        )
+
+    @api.model
+    def _revision_sql_clone(self, model, old_ids, overrides, id_maps, one2many_fields):
+        """
+        Insert a copy of the ``old_ids`` rows of ``model`` and return the copies,
+        in the order of ``old_ids``. ``overrides`` gives column values of the
+        copies and ``id_maps`` the {old id: new id} of the rows cloned so far per
+        model. The lines of ``one2many_fields`` are cloned after the rows.
+        """
+        cr = self.env.cr
+        cr.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+            [model._table, len(old_ids)],
+        )
+        new_ids = [row[0] for row in cr.fetchall()]
+        id_maps.setdefault(model._name, {}).update(zip(old_ids, new_ids))
+
+        fields_by_name = {
+            name: field
+            for name, field in model._fields.items()
+            if field.store and field.column_type and name != "id"
+        }
+        defaults = model.default_get(
+            [
+                name
+                for name, field in fields_by_name.items()
+                if not field.copy and not field.compute and name not in overrides
+            ]
+        )
+        now = cr.now()
+        columns, expressions, params = ['"id"'], ["map.new_id"], []
+        joins, join_params = [], []
+        changed, to_compute = set(overrides), []
+        for name, field in fields_by_name.items():
+            columns.append(f'"{name}"')
+            if name in LOG_ACCESS_USER_COLUMNS:
+                expressions.append("%s")
+                params.append(self.env.uid)
+            elif name in LOG_ACCESS_DATE_COLUMNS:
+                expressions.append("%s")
+                params.append(now)
+            elif name in overrides:
+                expressions.append("%s")
+                params.append(field.convert_to_column_insert(overrides[name], model))
+            elif field.type == "many2one" and field.comodel_name in id_maps:
+                # the inverse of the cloned one2many and the references to the
+                # other cloned rows point at the copies, copied or not; the
+                # other references are kept, or reset when not copied
+                comodel_map = id_maps[field.comodel_name]
+                if field.copy or field.compute:
+                    expressions.append(f'COALESCE("map_{name}".new_id, t."{name}")')
+                else:
+                    expressions.append(f'COALESCE("map_{name}".new_id, %s)')
+                    params.append(
+                        field.convert_to_column_insert(defaults[name], model)
+                        if name in defaults
+                        else None
+                    )
+                joins.append(
+                    f'LEFT JOIN unnest(%s::int[], %s::int[]) AS "map_{name}"(old_id, new_id)'
+                    f' ON "map_{name}".old_id = t."{name}"'
+                )
+                join_params += [list(comodel_map), list(comodel_map.values())]
+                changed.add(name)
+                if field.compute and not field.copy:
+                    to_compute.append(field)
+            elif not field.copy and not field.compute:
+                expressions.append("%s")
+                params.append(
+                    field.convert_to_column_insert(defaults[name], model)
+                    if name in defaults
+                    else None
+                )
+                changed.add(name)
+            else:
+                # copied as is, the ones copy() would not copy are recomputed
+                expressions.append(f't."{name}"')
+                if not field.copy:
+                    to_compute.append(field)
+        cr.execute(
+            f"""
+            INSERT INTO "{model._table}" ({", ".join(columns)})
+            SELECT {", ".join(expressions)}
+              FROM "{model._table}" AS t
+              JOIN unnest(%s::int[], %s::int[]) AS map(old_id, new_id) ON map.old_id = t.id
+              {" ".join(joins)}
+            """,
+            params + [old_ids, new_ids] + join_params,
+        )
+
+        for name, field in model._fields.items():
+            if field.type == "many2many" and field.store:
+                if field.copy or field.compute:
+                    cr.execute(
+                        f"""
+                        INSERT INTO "{field.relation}" ("{field.column1}", "{field.column2}")
+                        SELECT map.new_id, rel."{field.column2}"
+                          FROM "{field.relation}" AS rel
+                          JOIN unnest(%s::int[], %s::int[]) AS map(old_id, new_id)
+                            ON map.old_id = rel."{field.column1}"
+                        """,
+                        [old_ids, new_ids],
+                    )
+                    if not field.copy:
+                        to_compute.append(field)
+                else:
+                    changed.add(name)
+            elif (
+                field.type == "one2many"
+                and field.store
+                and not field.compute
+                and name not in one2many_fields
+            ):
+                changed.add(name)
+
+        cloned_inverses = set()
+        orm_one2many_fields = []
+        for name in one2many_fields:
+            field = model._fields[name]
+            comodel = self.env[field.comodel_name].with_context(
+                clean_context(self.env.context)
+            )
+            inverse = comodel._fields.get(field.inverse_name)
+            if comodel._inherits or not (
+                inverse and inverse.type == "many2one" and inverse.store
+            ):
+                orm_one2many_fields.append(name)
+                continue
+            # fields sharing the same inverse (e.g. filtered by a domain) hold
+            # the same rows, which are cloned once and all of them
+            if (field.comodel_name, field.inverse_name) in cloned_inverses:
+                continue
+            cloned_inverses.add((field.comodel_name, field.inverse_name))
+            line_ids = (
+                comodel.sudo()
+                .with_context(active_test=False)
+                .search(
+                    [(field.inverse_name, "in", old_ids)]
+                    + self._get_revision_sql_line_domain(field),
+                    order="id",
+                )
+                .ids
+            )
+            if line_ids:
+                self._revision_sql_clone(
+                    comodel,
+                    line_ids,
+                    {},
+                    id_maps,
+                    _get_copied_one2many_fields(comodel),
+                )
+
+        new_records = model.browse(new_ids)
+        old_records = model.browse(old_ids)
+        for name in orm_one2many_fields:
+            for old_record, new_record in zip(old_records, new_records):
+                new_record.write(
+                    {
+                        name: [
+                            Command.create(line_vals)
+                            for line_vals in old_record[name].copy_data()
+                        ]
+                    }
+                )
+        for field in to_compute:
+            self.env.add_to_compute(field, new_records)
+        new_records.modified(sorted(changed))
+        return new_records
+
+    def _get_revision_chain(self):
+        """All the revisions of the document, the current one included."""
+        self.ensure_one()
+        current = self.current_revision_id or self
+        return current.with_context(active_test=False).old_revision_ids | current
+
+    def _get_previous_revision(self):
+        self.ensure_one()
+        previous = self._get_revision_chain().filtered(
+            lambda rev: rev.revision_number < self.revision_number
+        )
+        return previous.sorted("revision_number")[-1:]
+
+    def _get_revision_diff_rows(self):
+        """
+        Return {record id: [line values]} of the lines of the records compared
+        by get_revision_diff, in line order. Every line gives its ``section``,
+        ``product_id`` and ``name`` and the ``_revision_diff_fields`` values,
+        the numbers as floats. Documents without lines return nothing.
+        """
+        return {}
+
+    def _get_revision_diff_totals(self, previous):
+        """Deltas of the document totals added to the result of get_revision_diff."""
+        return {}
+
+    def get_revision_diff(self, revision_id=None):
+        """
+        Compare the document with ``revision_id``, by default the revision it
+        replaced, and return the added, removed and changed lines in one call:
+
+            {"res_id": id, "revision_id": id,
+             "added": [line], "removed": [line], "changed": [line],
+             **_get_revision_diff_totals()}
+
+        Lines are keyed by (section, product, occurrence) so the same product
+        in the same section is aligned in order, the lines without product by
+        their description instead, and matched with a hash join. Each line
+        gives its section, product, old and new values (None when it is added
+        or removed), the names of the changed ``changes`` values and its
+        ``amount_delta``.
+        """
+        self.ensure_one()
+        if revision_id:
+            previous = self.with_context(active_test=False).browse(revision_id).exists()
+            if not previous or previous == self or previous not in self._get_revision_chain():
+                raise UserError(
+                    _("%(revision)s is not a revision of %(name)s.")
+                    % {"revision": revision_id, "name": self.display_name}
+                )
+        else:
+            previous = self._get_previous_revision()
+        if not previous:
+            raise UserError(
+                _("%s has no previous revision to compare with.") % self.display_name
+            )
+
+        rows_by_record = (self | previous)._get_revision_diff_rows()
+        old_lines, new_lines = (
+            self._key_revision_diff_rows(rows_by_record.get(record.id, []))
+            for record in (previous, self)
+        )
+        precisions = {
+            name: self.env["decimal.precision"].precision_get(application)
+            for name, application in self._revision_diff_fields.items()
+            if application
+        }
+        currency = (
+            self.currency_id if "currency_id" in self._fields else self.env.company.currency_id
+        )
+        amount_field = self._revision_diff_amount_field
+        product_names = {
+            product.id: product.display_name
+            for product in self.env["product.product"]
+            .with_context(active_test=False)
+            .browse(
+                {
+                    line["product_id"]
+                    for line in (*old_lines.values(), *new_lines.values())
+                    if line["product_id"]
+                }
+            )
+        }
+
+        def line_diff(key, old, new):
+            line = old or new
+            return {
+                "section": key[0],
+                "product_id": line["product_id"],
+                "product_name": product_names.get(line["product_id"], ""),
+                "old": old,
+                "new": new,
+                "changes": [],
+                "amount_delta": (new[amount_field] if new and amount_field else 0.0)
+                - (old[amount_field] if old and amount_field else 0.0),
+            }
+
+        added, changed = [], []
+        for key, new in new_lines.items():
+            old = old_lines.pop(key, None)
+            if old is None:
+                added.append(line_diff(key, None, new))
+                continue
+            changes = []
+            for name in self._revision_diff_fields:
+                if not isinstance(new[name], float):
+                    if (old[name] or "") != (new[name] or ""):
+                        changes.append(name)
+                elif float_compare(
+                    old[name],
+                    new[name],
+                    precision_digits=precisions.get(name, currency.decimal_places),
+                ):
+                    changes.append(name)
+            if changes:
+                diff = line_diff(key, old, new)
+                diff["changes"] = changes
+                changed.append(diff)
+        removed = [line_diff(key, old, None) for key, old in old_lines.items()]
+
+        return {
+            "res_id": self.id,
+            "revision_id": previous.id,
+            "added": added,
+            "removed": removed,
+            "changed": changed,
+            **self._get_revision_diff_totals(previous),
+        }
+
+    @api.model
+    def _key_revision_diff_rows(self, rows):
+        lines = {}
+        occurrences = defaultdict(int)
+        for row in rows:
+            key = (row["section"], row["product_id"] or row["name"])
+            occurrences[key] += 1
+            lines[(*key, occurrences[key])] = row
+        return lines
+
     @api.model_create_multi
     def create(self, vals_list):
         name_field = self._context.get("revision_name_field", "name")
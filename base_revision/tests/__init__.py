@@ -1,4 +1,5 @@
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 from . import test_base_revision
+from . import test_base_revision_sql
 
 # from . import common
@@ -1,7 +1,7 @@
 # Copyright 2020 Ecosoft (http://ecosoft.co.th)
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from odoo import fields, models
+from odoo import api, fields, models
 
 
 class BaseRevisionTester(models.Model):
@@ -24,9 +24,38 @@ class BaseRevisionTester(models.Model):
     old_revision_ids = fields.One2many(
         comodel_name="base.revision.tester",
     )
+    line_ids = fields.One2many(
+        comodel_name="base.revision.tester.line",
+        inverse_name="tester_id",
+        copy=True,
+    )
+    amount_total = fields.Float(compute="_compute_amount_total", store=True)
+
+    @api.depends("line_ids.amount")
+    def _compute_amount_total(self):
+        for rec in self:
+            rec.amount_total = sum(rec.line_ids.mapped("amount"))
 
     def action_confirm(self):
         self.write({"state": "confirmed"})
 
     def action_cancel(self):
         self.write({"state": "cancel"})
+
+
+class BaseRevisionTesterLine(models.Model):
+    _name = "base.revision.tester.line"
+    _description = "Base Revision Tester Line"
+
+    # not copied, like the order of a sale order line
+    tester_id = fields.Many2one(
+        comodel_name="base.revision.tester",
+        required=True,
+        ondelete="cascade",
+        copy=False,
+    )
+    name = fields.Char()
+    amount = fields.Float()
+    parent_id = fields.Many2one(comodel_name="base.revision.tester.line")
+    partner_ids = fields.Many2many(comodel_name="res.partner")
+    note = fields.Char(copy=False, default="To review")
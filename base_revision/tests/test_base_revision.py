@@ -15,9 +15,9 @@ class TestBaseRevision(common.TransactionCase):
 
         cls.loader = FakeModelLoader(cls.env, cls.__module__)
         cls.loader.backup_registry()
-        from .base_revision_tester import BaseRevisionTester
+        from .base_revision_tester import BaseRevisionTester, BaseRevisionTesterLine
 
-        cls.loader.update_registry((BaseRevisionTester,))
+        cls.loader.update_registry((BaseRevisionTester, BaseRevisionTesterLine))
 
         cls.revision_model = cls.env[BaseRevisionTester._name]
 
@@ -0,0 +1,110 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from odoo_test_helper import FakeModelLoader
+
+from odoo.tests import common
+
+
+class TestBaseRevisionSql(common.TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.loader = FakeModelLoader(cls.env, cls.__module__)
+        cls.loader.backup_registry()
+        from .base_revision_tester import BaseRevisionTester, BaseRevisionTesterLine
+
+        cls.loader.update_registry((BaseRevisionTester, BaseRevisionTesterLine))
+
+        cls.revision_model = cls.env[BaseRevisionTester._name].with_context(
+            revision_copy_mode="sql"
+        )
+        cls.partner = cls.env["res.partner"].create({"name": "Mr Odoo"})
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loader.restore_registry()
+        return super().tearDownClass()
+
+    def _create_tester(self):
+        tester = self.revision_model.create(
+            {
+                "name": "TEST0001",
+                "line_ids": [
+                    (0, 0, {"name": "Section", "amount": 0.0}),
+                    (0, 0, {"name": "Line 1", "amount": 10.0}),
+                    (
+                        0,
+                        0,
+                        {
+                            "name": "Line 2",
+                            "amount": 5.0,
+                            "partner_ids": [(6, 0, self.partner.ids)],
+                        },
+                    ),
+                ],
+            }
+        )
+        section = tester.line_ids[0]
+        (tester.line_ids - section).write({"parent_id": section.id, "note": "Done"})
+        return tester
+
+    def test_revision_sql(self):
+        """Check the document and its lines are cloned like copy() does"""
+        tester_1 = self._create_tester()
+        tester_1.action_cancel()
+        tester_1.create_revision()
+
+        revision_1 = tester_1.current_revision_id
+        self.assertEqual(revision_1.revision_number, 1)
+        self.assertEqual(revision_1.name, "TEST0001-01")
+        self.assertEqual(revision_1.unrevisioned_name, tester_1.name)
+        self.assertTrue(revision_1.active)
+        self.assertFalse(tester_1.active)
+        self.assertEqual(revision_1.old_revision_ids, tester_1)
+
+        old_lines = tester_1.line_ids
+        new_lines = revision_1.line_ids
+        self.assertEqual(len(new_lines), 3)
+        self.assertFalse(new_lines & old_lines)
+        self.assertEqual(new_lines.mapped("name"), old_lines.mapped("name"))
+        self.assertEqual(new_lines.mapped("amount"), old_lines.mapped("amount"))
+        self.assertEqual(new_lines[2].partner_ids, self.partner)
+        self.assertEqual(old_lines[2].partner_ids, self.partner)
+        # the references between lines are remapped to the copies
+        self.assertEqual(new_lines[1].parent_id, new_lines[0])
+        self.assertEqual(new_lines[2].parent_id, new_lines[0])
+        self.assertEqual(old_lines[1].parent_id, old_lines[0])
+        # fields not copied get their default
+        self.assertEqual(set(new_lines.mapped("note")), {"To review"})
+        self.assertEqual(set(old_lines[1:].mapped("note")), {"Done"})
+        self.assertEqual(revision_1.amount_total, 15.0)
+
+    def test_revision_sql_inverse_not_copied(self):
+        """Check the copies of the lines belong to the copy of the document even
+        if their inverse field is not copied"""
+        self.assertFalse(
+            self.env["base.revision.tester.line"]._fields["tester_id"].copy
+        )
+        tester_1 = self._create_tester()
+        tester_1.create_revision()
+        revision_1 = tester_1.current_revision_id
+        self.assertEqual(len(revision_1.line_ids), 3)
+        self.assertEqual(revision_1.line_ids.tester_id, revision_1)
+        self.assertEqual(len(tester_1.line_ids), 3)
+        self.assertEqual(tester_1.line_ids.tester_id, tester_1)
+
+    def test_revision_sql_compute(self):
+        """Check the fields computed from the copies are recomputed"""
+        tester_1 = self._create_tester()
+        tester_1.create_revision()
+        revision_1 = tester_1.current_revision_id
+        revision_1.line_ids[1].amount = 20.0
+        self.assertEqual(revision_1.amount_total, 25.0)
+        self.assertEqual(tester_1.amount_total, 15.0)
+
+        revision_1.create_revision()
+        revision_2 = revision_1.current_revision_id
+        self.assertEqual(revision_2.revision_number, 2)
+        self.assertEqual(revision_2.amount_total, 25.0)
+        self.assertEqual(revision_2.old_revision_ids, tester_1 + revision_1)
+        self.assertEqual(len(revision_2.line_ids), 3)
@@ -1,11 +1,23 @@
+from collections import defaultdict
+
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
 
+# A PR follows the most advanced state among its purchase orders.
+PO_STATE_PRIORITY = {'draft': 1, 'sent': 2, 'pending': 3, 'purchase': 4, 'cancel': 5}
+PO_TO_PR_STATE = {
+    'draft': 'draft',
+    'sent': 'rfq_sent',
+    'pending': 'pending',
+    'purchase': 'purchase',
+    'cancel': 'cancel',
+}
+
 class CustomPR(models.Model):
     _name = 'custom.pr'
     _description = 'Custom Purchase Requisition'
 
-    name = fields.Char(string="PR Number", readonly=True, copy=False)
+    name = fields.Char(string="PR Number", readonly=True, copy=False, index=True)
     pr_type = fields.Selection(
         [('standard', 'PR'), ('cash', 'Cash PR')],
         string="Type",
@@ -255,36 +267,50 @@ class PurchaseOrder(models.Model):
     _inherit = "purchase.order"
 
     pr_name = fields.Char(string="PR Name", readonly=True)
+    custom_pr_id = fields.Many2one(
+        'custom.pr',
+        string="Purchase Requisition",
+        compute='_compute_custom_pr_id',
+        store=True,
+        index=True,
+        readonly=True,
+    )
 
-    def _update_pr_state(self):
-        """Helper to sync PR state with the highest PO state for the same pr_name"""
+    @api.depends('pr_name')
+    def _compute_custom_pr_id(self):
+        names = set(self.filtered('pr_name').mapped('pr_name'))
+        prs = self.env['custom.pr'].sudo().search([('name', 'in', list(names))]) if names else []
+        pr_by_name = {}
+        for pr in prs:
+            pr_by_name.setdefault(pr.name, pr.id)
         for order in self:
-            if order.pr_name:
-                pr = self.env['custom.pr'].sudo().search([('name', '=', order.pr_name)], limit=1)
-                if pr:
-                    all_pos = self.env['purchase.order'].sudo().search([('pr_name', '=', order.pr_name)])
-                    priority = {'draft': 1, 'sent': 2, 'pending': 3, 'purchase': 4, 'cancel': 5 }
-                    best_po = max(all_pos, key=lambda po: priority.get(po.state, 0))
-
-                    # Update PR state
-                    mapping = {
-                        'draft': 'draft',
-                        'sent': 'rfq_sent',
-                        'pending': 'pending',
-                        'purchase': 'purchase',
-                        'cancel': 'cancel', 
-                    }
-                    pr.state = mapping.get(best_po.state, pr.state)
+            order.custom_pr_id = pr_by_name.get(order.pr_name, False)
 
-    @api.model
-    def create(self, vals):
-        order = super().create(vals)
+    def _update_pr_state(self):
+        """Helper to sync PR state with the highest PO state of the same PR"""
+        prs = self.sudo().custom_pr_id
+        if not prs:
+            return
+        states_by_pr = defaultdict(list)
+        for pr, state in self.env['purchase.order'].sudo()._read_group(
+                [('custom_pr_id', 'in', prs.ids)], ['custom_pr_id', 'state']):
+            states_by_pr[pr].append(state)
+
+        prs_by_state = defaultdict(lambda: self.env['custom.pr'].sudo())
+        for pr, states in states_by_pr.items():
+            best_state = max(states, key=lambda state: PO_STATE_PRIORITY.get(state, 0))
+            pr_state = PO_TO_PR_STATE.get(best_state)
+            if pr_state and pr.state != pr_state:
+                prs_by_state[pr_state] |= pr
+        for pr_state, state_prs in prs_by_state.items():
+            state_prs.write({'state': pr_state})
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        orders = super().create(vals_list)
         # When PO is created, immediately set PR → pending
-        if order.pr_name:
-            pr = self.env['custom.pr'].sudo().search([('name', '=', order.pr_name)], limit=1)
-            if pr:
-                pr.state = 'pending'
-        return order
+        orders.sudo().custom_pr_id.write({'state': 'pending'})
+        return orders
 
     def write(self, vals):
         res = super().write(vals)
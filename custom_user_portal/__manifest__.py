@@ -26,6 +26,7 @@
         'views/templates.xml',
         'views/portal_pr_form_template.xml',
         'views/quotation.xml',
+        'views/quotation_comparison_views.xml',
         # 'views/quotation_form_template.xml',
         'views/cash_odoo_ui.xml',
         'views/pr_odoo_ui.xml',
@@ -36,6 +37,7 @@
         'views/purchase_order_inherit.xml',
 
         'data/ir_sequence_data.xml',
+        'data/project_budget_ledger_data.xml',
     ],
     'demo': [
         'demo/demo.xml',
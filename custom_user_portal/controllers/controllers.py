@@ -56,23 +56,14 @@ class PortalPR(http.Controller):
         }
         return request.render("custom_user_portal.portal_pr_form_template", values)
 
-    # getting all the products in inventory
+    # getting one page of the products in inventory
     @http.route("/products", auth="public", type="json", website=True)
-    def get_all_products(self, **kwargs):
+    def get_all_products(self, search="", offset=0, limit=None, **kwargs):
         try:
-            products = request.env["product.template"].sudo().search([])
-            product_list = [
-                {
-                    "id": p.id,
-                    "name": p.name,
-                    "price": p.list_price,
-                    "type": p.type,
-                }
-                for p in products
-            ]
+            result = request.env["product.template"]._search_portal_catalogue(search, offset, limit)
 
-            if not product_list:
-                product_list = [
+            if not result["total"] and not search:
+                result["products"] = [
                     {"id": 1, "name": "Pieces", "price": 0.0, "type": "consu"},
                     {"id": 2, "name": "Units", "price": 0.0, "type": "consu"},
                     {"id": 3, "name": "Boxes", "price": 0.0, "type": "consu"},
@@ -80,10 +71,30 @@ class PortalPR(http.Controller):
                     {"id": 5, "name": "Liters", "price": 0.0, "type": "consu"},
                 ]
 
-            return {"products": product_list}
+            return result
         except Exception as e:
             return {"products": [], "error": str(e)}
 
+    # same page as plain JSON, cacheable by the browser with ETag / If-None-Match
+    @http.route("/products/catalogue", auth="public", type="http", methods=["GET"], website=True)
+    def get_products_catalogue(self, q="", offset=0, limit=None, **kwargs):
+        try:
+            result = request.env["product.template"]._search_portal_catalogue(q, offset, limit)
+        except ValueError:
+            return request.make_response(
+                json.dumps({"products": [], "error": "Invalid offset or limit."}),
+                headers=[("Content-Type", "application/json")],
+                status=400,
+            )
+
+        headers = [("ETag", '"%s"' % result["etag"]), ("Cache-Control", "private, no-cache")]
+        if result["etag"] in request.httprequest.if_none_match:
+            return request.make_response("", headers=headers, status=304)
+        return request.make_response(
+            json.dumps(result),
+            headers=headers + [("Content-Type", "application/json")],
+        )
+
     # getting the requested_by user and show all PR on portal
     @http.route("/my/purchase-request", type="http", auth="user", website=True)
     def portal_pr_list(self, **kwargs):
@@ -129,16 +140,10 @@ class PortalPR(http.Controller):
                 headers=[("Content-Type", "application/json")],
             )
 
-        project = (
-            request.env["project.project"]
-            .sudo()
-            .search(
-                [("budget_type", "=", budget_type), ("budget_code", "=", budget_code)],
-                limit=1,
-            )
-        )
+        # one indexed read of the budget ledger maintained with the purchase orders
+        ledger = request.env["project.budget.ledger"]._get_ledger(budget_type, budget_code)
 
-        if not project:
+        if not ledger:
             return request.make_response(
                 json.dumps(
                     {
@@ -149,12 +154,13 @@ class PortalPR(http.Controller):
                 headers=[("Content-Type", "application/json")],
             )
 
-        if project.budget_left <= 0:
+        budget_left = ledger.remaining_amount
+        if budget_left <= 0:
             return request.make_response(
                 json.dumps(
                     {
                         "success": False,
-                        "message": f"No budget left. Remaining: {project.budget_left}",
+                        "message": f"No budget left. Remaining: {budget_left}",
                     }
                 ),
                 headers=[("Content-Type", "application/json")],
@@ -164,8 +170,10 @@ class PortalPR(http.Controller):
             json.dumps(
                 {
                     "success": True,
-                    "budget_left": project.budget_left,
-                    "message": f"Budget available: {project.budget_left}",
+                    "budget_left": budget_left,
+                    "committed": ledger.committed_amount,
+                    "spent": ledger.spent_amount,
+                    "message": f"Budget available: {budget_left}",
                 }
             ),
             headers=[("Content-Type", "application/json")],
@@ -3,5 +3,8 @@
 from . import models
 from . import purchase_requisition_inherit
 from . import quotation_model
+from . import quotation_comparison
+from . import project_budget_ledger
 from . import project
+from . import product_template
 from . import purchase_order_inherit
\ No newline at end of file
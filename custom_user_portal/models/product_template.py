@@ -0,0 +1,89 @@
+import hashlib
+import json
+from bisect import bisect_left
+
+from odoo import api, models
+
+PORTAL_CATALOGUE_PAGE_SIZE = 80
+PORTAL_CATALOGUE_MAX_PAGE_SIZE = 200
+
+# {(database, company id): (version, snapshot)}, one snapshot per company
+# replaced when the products change
+_portal_catalogues = {}
+
+
+class ProductTemplate(models.Model):
+    _inherit = "product.template"
+
+    @api.model
+    def _get_portal_catalogue_version(self):
+        """Version of the product templates: any create, write or unlink changes it."""
+        self.flush_model(["write_date"])
+        self.env.cr.execute("SELECT max(write_date), count(*) FROM product_template")
+        write_date, count = self.env.cr.fetchone()
+        return f"{write_date}:{count}"
+
+    @api.model
+    def _get_portal_catalogue(self, company_id):
+        """Catalogue snapshot of a company shared by the portal requests.
+
+        The worker keeps one snapshot per company, built again and replacing
+        the previous one once the product templates version changed. Returns
+        the snapshot etag, the (id, name, price, type) rows sorted by lowered
+        name and those lowered names for the prefix search.
+        """
+        key = (self.env.cr.dbname, company_id)
+        version = self._get_portal_catalogue_version()
+        cached = _portal_catalogues.get(key)
+        if cached and cached[0] == version:
+            return cached[1]
+        snapshot = self._build_portal_catalogue(company_id)
+        _portal_catalogues[key] = (version, snapshot)
+        return snapshot
+
+    @api.model
+    def _build_portal_catalogue(self, company_id):
+        products = self.sudo().search_read(
+            [("company_id", "in", [False, company_id])], ["name", "list_price", "type"], order="id"
+        )
+        rows = sorted(
+            ((p["id"], p["name"] or "", p["list_price"], p["type"]) for p in products),
+            key=lambda row: (row[1].lower(), row[0]),
+        )
+        etag = hashlib.sha1(json.dumps(rows).encode()).hexdigest()
+        return etag, tuple(rows), tuple(row[1].lower() for row in rows)
+
+    @api.model
+    def _search_portal_catalogue(self, term="", offset=0, limit=PORTAL_CATALOGUE_PAGE_SIZE):
+        """One page of the portal catalogue.
+
+        Names starting with ``term`` are found by bisecting the snapshot; for
+        terms of three characters or more the names containing it are added
+        through the trigram index of the product name.
+        """
+        company_id = self.env.company.id
+        etag, rows, keys = self._get_portal_catalogue(company_id)
+        offset = max(int(offset or 0), 0)
+        limit = min(max(int(limit or PORTAL_CATALOGUE_PAGE_SIZE), 1), PORTAL_CATALOGUE_MAX_PAGE_SIZE)
+        term = (term or "").strip().lower()
+
+        matches = rows
+        if term:
+            matches = rows[bisect_left(keys, term):bisect_left(keys, term + "\uffff")]
+            if len(term) >= 3 and len(matches) < offset + limit:
+                found_ids = set(self.sudo().search(
+                    [("name", "ilike", term), ("company_id", "in", [False, company_id])]
+                )._ids)
+                found_ids.difference_update(row[0] for row in matches)
+                matches = matches + tuple(row for row in rows if row[0] in found_ids)
+
+        page = matches[offset:offset + limit]
+        return {
+            "products": [
+                {"id": row[0], "name": row[1], "price": row[2], "type": row[3]} for row in page
+            ],
+            "total": len(matches),
+            "offset": offset,
+            "limit": limit,
+            "etag": hashlib.sha1(f"{etag}:{term}:{offset}:{limit}".encode()).hexdigest(),
+        }
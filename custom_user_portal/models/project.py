@@ -1,5 +1,7 @@
 from odoo import models, fields, api
 
+from .project_budget_ledger import COMMITTED_PO_STATES, SPENT_PO_STATES
+
 
 class ProjectProject(models.Model):
     _inherit = "project.project"
@@ -21,15 +23,56 @@ class ProjectProject(models.Model):
         "purchase.order", "project_id", string="Purchase Orders"
     )
 
+    budget_ledger_ids = fields.One2many(
+        "project.budget.ledger", "project_id", string="Budget Ledger"
+    )
+
     @api.depends(
+        "budget_type",
+        "budget_code",
         "budget_allowance",
         "purchase_order_ids.grand_total",
         "purchase_order_ids.state",
     )
     def _compute_budget_left(self):
+        amounts = self.filtered("id")._get_purchase_budget_amounts()
         for project in self:
-            spent = 0
-            for po in project.purchase_order_ids:
-                if po.state == "purchase":  # only deduct if confirmed as Purchase
-                    spent += po.grand_total
+            spent = amounts.get(project.id, {}).get("spent")
+            if spent is None:
+                # only deduct if confirmed as Purchase
+                spent = sum(po.grand_total for po in project.purchase_order_ids if po.state in SPENT_PO_STATES)
             project.budget_left = project.budget_allowance - spent
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        projects = super().create(vals_list)
+        projects._sync_budget_ledger()
+        return projects
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"budget_type", "budget_code", "budget_allowance"}.intersection(vals):
+            self._sync_budget_ledger()
+        return res
+
+    def _sync_budget_ledger(self):
+        """Upsert the budget ledger rows of the projects from their purchase orders."""
+        projects = self.exists()
+        amounts = projects._get_purchase_budget_amounts()
+        self.env["project.budget.ledger"]._upsert([(
+            project.id, project.budget_type or None, project.budget_code or None, project.budget_allowance,
+            amounts[project.id]["committed"], amounts[project.id]["spent"],
+            project.budget_allowance - amounts[project.id]["spent"],
+        ) for project in projects])
+
+    def _get_purchase_budget_amounts(self):
+        """Committed and spent purchase amounts per project id, in one grouped query."""
+        amounts = {project_id: {"committed": 0.0, "spent": 0.0} for project_id in self.ids}
+        if not self.ids:
+            return amounts
+        for project, state, grand_total in self.env["purchase.order"].sudo()._read_group(
+                [("project_id", "in", self.ids), ("state", "in", COMMITTED_PO_STATES + SPENT_PO_STATES)],
+                ["project_id", "state"], ["grand_total:sum"]):
+            key = "spent" if state in SPENT_PO_STATES else "committed"
+            amounts[project.id][key] += grand_total
+        return amounts
@@ -0,0 +1,161 @@
+from odoo import api, fields, models, tools
+
+# purchase order states counted against a project budget
+COMMITTED_PO_STATES = ("pending",)
+SPENT_PO_STATES = ("purchase",)
+
+
+class ProjectBudgetLedger(models.Model):
+    """One row per project with its committed, spent and remaining budget.
+
+    The rows are upserted by ``project.project._sync_budget_ledger`` in the same
+    transaction as the project or purchase order write that moves the project
+    budget, so the portal budget check reads a single indexed row instead of
+    summing the project's purchase orders.
+    """
+    _name = "project.budget.ledger"
+    _description = "Project Budget Ledger"
+    _log_access = False
+    _rec_name = "project_id"
+
+    project_id = fields.Many2one("project.project", string="Project", required=True, readonly=True,
+                                 ondelete="cascade")
+    budget_type = fields.Selection([("opex", "Opex"), ("capex", "Capex")], string="Budget Type", readonly=True)
+    budget_code = fields.Char(string="Cost Center Code", readonly=True)
+    budget_allowance = fields.Float(string="Budget Allowance", readonly=True)
+    committed_amount = fields.Float(string="Committed", readonly=True,
+                                    help="Purchase orders pending approval.")
+    spent_amount = fields.Float(string="Spent", readonly=True, help="Confirmed purchase orders.")
+    remaining_amount = fields.Float(string="Remaining", readonly=True)
+
+    _sql_constraints = [
+        ("project_uniq", "unique(project_id)", "A project has a single budget ledger."),
+    ]
+
+    def init(self):
+        tools.create_index(self.env.cr, "project_budget_ledger_budget_key_index", self._table,
+                           ["budget_type", "budget_code"])
+
+    @api.model
+    def _rebuild(self):
+        """(Re)build the ledger of every project from its purchase orders,
+        called from the module data once all the columns exist."""
+        self.env.flush_all()
+        self.env.cr.execute(
+            """
+            INSERT INTO project_budget_ledger (project_id, budget_type, budget_code, budget_allowance,
+                                               committed_amount, spent_amount, remaining_amount)
+                 SELECT p.id, p.budget_type, p.budget_code, coalesce(p.budget_allowance, 0.0),
+                        coalesce(sum(po.grand_total) FILTER (WHERE po.state IN %(committed)s), 0.0),
+                        coalesce(sum(po.grand_total) FILTER (WHERE po.state IN %(spent)s), 0.0),
+                        coalesce(p.budget_allowance, 0.0)
+                            - coalesce(sum(po.grand_total) FILTER (WHERE po.state IN %(spent)s), 0.0)
+                   FROM project_project p
+              LEFT JOIN purchase_order po ON po.project_id = p.id
+               GROUP BY p.id
+            ON CONFLICT (project_id) DO UPDATE
+                    SET budget_type = EXCLUDED.budget_type,
+                        budget_code = EXCLUDED.budget_code,
+                        budget_allowance = EXCLUDED.budget_allowance,
+                        committed_amount = EXCLUDED.committed_amount,
+                        spent_amount = EXCLUDED.spent_amount,
+                        remaining_amount = EXCLUDED.remaining_amount
+            """,
+            {"committed": COMMITTED_PO_STATES, "spent": SPENT_PO_STATES},
+        )
+        self.invalidate_model()
+
+    @api.model
+    def _upsert(self, rows):
+        """Write the ledger rows given as (project id, budget type, budget code,
+        allowance, committed, spent, remaining) tuples in one statement."""
+        if not rows:
+            return
+        self.env.cr.execute(
+            """
+            INSERT INTO project_budget_ledger (project_id, budget_type, budget_code, budget_allowance,
+                                               committed_amount, spent_amount, remaining_amount)
+                 VALUES %s
+            ON CONFLICT (project_id) DO UPDATE
+                    SET budget_type = EXCLUDED.budget_type,
+                        budget_code = EXCLUDED.budget_code,
+                        budget_allowance = EXCLUDED.budget_allowance,
+                        committed_amount = EXCLUDED.committed_amount,
+                        spent_amount = EXCLUDED.spent_amount,
+                        remaining_amount = EXCLUDED.remaining_amount
+            """ % ", ".join(["%s"] * len(rows)),
+            rows,
+        )
+        self.invalidate_model()
+
+    @api.model
+    def _get_ledger(self, budget_type, budget_code):
+        return self.sudo().search([("budget_type", "=", budget_type), ("budget_code", "=", budget_code)],
+                                  limit=1)
+
+
+class CustomPR(models.Model):
+    _inherit = "custom.pr"
+
+    @api.depends("budget_type", "budget_details")
+    def _compute_has_valid_project(self):
+        Ledger = self.env["project.budget.ledger"].sudo()
+        keys = {(rec.budget_type, rec.budget_details) for rec in self if rec.budget_type and rec.budget_details}
+        remaining = {}
+        if keys:
+            ledgers = Ledger.search([("budget_code", "in", list({code for _type, code in keys}))])
+            for ledger in ledgers:
+                remaining.setdefault((ledger.budget_type, ledger.budget_code), ledger.remaining_amount)
+        for rec in self:
+            rec.has_valid_project = remaining.get((rec.budget_type, rec.budget_details), 0.0) > 0
+
+
+class PurchaseOrder(models.Model):
+    _inherit = "purchase.order"
+
+    # purchase order values moving the budget of its project
+    _budget_ledger_fields = {"state", "project_id", "custom_line_ids"}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        orders = super().create(vals_list)
+        orders.project_id._sync_budget_ledger()
+        return orders
+
+    def write(self, vals):
+        if not self._budget_ledger_fields.intersection(vals):
+            return super().write(vals)
+        projects = self.project_id
+        res = super().write(vals)
+        (projects | self.project_id)._sync_budget_ledger()
+        return res
+
+    def unlink(self):
+        projects = self.project_id
+        res = super().unlink()
+        projects._sync_budget_ledger()
+        return res
+
+
+class PurchaseOrderCustomLine(models.Model):
+    _inherit = "purchase.order.custom.line"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        lines.order_id.project_id._sync_budget_ledger()
+        return lines
+
+    def write(self, vals):
+        if not {"quantity", "price_unit", "order_id"}.intersection(vals):
+            return super().write(vals)
+        projects = self.order_id.project_id
+        res = super().write(vals)
+        (projects | self.order_id.project_id)._sync_budget_ledger()
+        return res
+
+    def unlink(self):
+        projects = self.order_id.project_id
+        res = super().unlink()
+        projects._sync_budget_ledger()
+        return res
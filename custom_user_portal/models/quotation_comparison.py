@@ -0,0 +1,70 @@
+from odoo import _, fields, models, tools
+
+
+class PurchaseQuotationComparison(models.Model):
+    _name = "purchase.quotation.comparison"
+    _description = "Vendor Quotation Comparison"
+    _auto = False
+    _order = "quotation_count desc, rfq_origin"
+    _rec_name = "rfq_origin"
+
+    rfq_origin = fields.Char(string="RFQ Origin", readonly=True)
+    pr_name = fields.Char(string="PR Name", readonly=True)
+    quotation_count = fields.Integer(string="Quotations", readonly=True)
+    priced_count = fields.Integer(string="Priced Quotations", readonly=True)
+    best_quotation_id = fields.Many2one("purchase.quotation", string="Best Quotation", readonly=True)
+    best_vendor_id = fields.Many2one("res.partner", string="Best Vendor", readonly=True)
+    best_total = fields.Float(string="Best Amount", readonly=True)
+    highest_total = fields.Float(string="Highest Amount", readonly=True)
+    average_total = fields.Float(string="Average Amount", readonly=True)
+    spread_amount = fields.Float(string="Spread", readonly=True,
+                                 help="Difference between the highest and the best quotation.")
+    saving_percent = fields.Float(string="Saving vs Average (%)", readonly=True, group_operator="avg")
+
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute(
+            """
+            CREATE OR REPLACE VIEW %s AS (
+                WITH priced AS (
+                    SELECT q.id, q.rfq_origin, q.vendor_id, q.total_excl_vat,
+                           row_number() OVER (
+                               PARTITION BY q.rfq_origin ORDER BY q.total_excl_vat, q.id
+                           ) AS position
+                      FROM purchase_quotation q
+                     WHERE q.rfq_origin IS NOT NULL AND q.total_excl_vat > 0
+                )
+                SELECT
+                    min(q.id) AS id,
+                    q.rfq_origin,
+                    max(q.pr_name) AS pr_name,
+                    count(q.id) AS quotation_count,
+                    count(p.id) AS priced_count,
+                    max(CASE WHEN p.position = 1 THEN p.id END) AS best_quotation_id,
+                    max(CASE WHEN p.position = 1 THEN p.vendor_id END) AS best_vendor_id,
+                    coalesce(min(p.total_excl_vat), 0.0) AS best_total,
+                    coalesce(max(p.total_excl_vat), 0.0) AS highest_total,
+                    coalesce(avg(p.total_excl_vat), 0.0) AS average_total,
+                    coalesce(max(p.total_excl_vat) - min(p.total_excl_vat), 0.0) AS spread_amount,
+                    coalesce(
+                        (avg(p.total_excl_vat) - min(p.total_excl_vat)) * 100.0 / nullif(avg(p.total_excl_vat), 0),
+                        0.0
+                    ) AS saving_percent
+                FROM purchase_quotation q
+                LEFT JOIN priced p ON p.id = q.id
+                WHERE q.rfq_origin IS NOT NULL
+                GROUP BY q.rfq_origin
+            )
+            """ % self._table
+        )
+
+    def action_open_quotations(self):
+        self.ensure_one()
+        return {
+            "type": "ir.actions.act_window",
+            "name": _("Quotations of %s", self.rfq_origin),
+            "res_model": "purchase.quotation",
+            "view_mode": "tree,form",
+            "domain": [("rfq_origin", "=", self.rfq_origin)],
+            "context": {"create": False},
+        }
@@ -13,7 +13,7 @@ class PurchaseQuotation(models.Model):
     _inherit = ["mail.thread", "mail.activity.mixin"]
     # Basic Info
     vendor_id = fields.Many2one("res.partner", string="Vendor")
-    rfq_origin = fields.Char(string="RFQ Origin")
+    rfq_origin = fields.Char(string="RFQ Origin", index=True)
     vendor_ref = fields.Char(string="Vendor Reference")
     pr_name = fields.Char(string="PR Name", readonly=True)
     notes = fields.Text(string="Notes")
@@ -129,35 +129,49 @@ class PurchaseQuotation(models.Model):
 
     @api.depends("rfq_origin", "total_excl_vat")
     def _compute_is_best(self):
-        """Ensure only the quotation with the lowest total_excl_vat per RFQ is marked as best."""
-        # Fetch all relevant rfq_origin values in current batch
-        rfq_origins = self.mapped("rfq_origin")
-        if not rfq_origins:
-            return
-
-        # Fetch all quotations sharing those RFQs (even outside current batch)
-        all_quotations = self.env["purchase.quotation"].search([("rfq_origin", "in", rfq_origins)])
+        """Ensure only the quotation with the lowest total_excl_vat per RFQ is marked as best.
+
+        The RFQs of the batch are ranked in one window query; quotations of
+        those RFQs outside the batch are only written when their flag changes.
+        """
+        rfq_origins = tuple(set(self.filtered("rfq_origin").mapped("rfq_origin")))
+        ranking = {}
+        if rfq_origins:
+            self.flush_model(["rfq_origin", "total_excl_vat"])
+            # ties on the amount keep the oldest quotation, like min() over the search did
+            self.env.cr.execute(
+                """
+                SELECT id, rfq_origin, is_best,
+                       total_excl_vat > 0
+                       AND row_number() OVER (
+                           PARTITION BY rfq_origin, total_excl_vat > 0
+                           ORDER BY total_excl_vat, id
+                       ) = 1 AS best
+                  FROM purchase_quotation
+                 WHERE rfq_origin IN %s
+                """,
+                [rfq_origins],
+            )
+            ranking = {
+                quotation_id: (origin, bool(is_best), bool(best))
+                for quotation_id, origin, is_best, best in self.env.cr.fetchall()
+            }
 
-        # Group them by rfq_origin
-        rfq_groups = {}
-        for rec in all_quotations:
-            rfq_groups.setdefault(rec.rfq_origin, []).append(rec)
+        # RFQs without any priced quotation have no best one
+        priced_origins = {origin for origin, _is_best, best in ranking.values() if best}
+        for rec in self:
+            rec.is_best = rec.id in ranking and ranking[rec.id][2]
 
-        # Determine the best for each group
-        for group in rfq_groups.values():
-            valid_records = [r for r in group if r.total_excl_vat > 0]
-            if not valid_records:
+        batch_ids = set(self.ids)
+        to_flag = {True: [], False: []}
+        for quotation_id, (origin, is_best, best) in ranking.items():
+            if quotation_id in batch_ids or origin not in priced_origins:
                 continue
-
-            # Find the one with minimum total_excl_vat
-            min_rec = min(valid_records, key=lambda r: r.total_excl_vat)
-
-            # Reset all to False first
-            for r in group:
-                r.is_best = False
-
-            # Then mark only the minimum one as True
-            min_rec.is_best = True
+            if is_best != best:
+                to_flag[best].append(quotation_id)
+        for flag, quotation_ids in to_flag.items():
+            if quotation_ids:
+                self.browse(quotation_ids).write({"is_best": flag})
 
     @api.depends("is_best")
     def _compute_is_best_badge(self):
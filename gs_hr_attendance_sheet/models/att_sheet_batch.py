@@ -17,12 +17,18 @@ from datetime import datetime, date, timedelta, time
 from dateutil.relativedelta import relativedelta
 from odoo import models, fields, tools, api, exceptions, _
 from odoo.exceptions import UserError, ValidationError
+from odoo.tools.misc import format_date
 import babel
 import inspect
 from operator import itemgetter
 import logging
+from time import perf_counter as time_counter
 DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 TIME_FORMAT = "%H:%M:%S"
+# sheets whose lines are computed in one savepoint by gen_att_sheet
+SHEET_GENERATION_CHUNK = 50
+
+_logger = logging.getLogger(__name__)
 
 
 class AttendanceSheetBatch(models.Model):
@@ -56,6 +62,7 @@ class AttendanceSheetBatch(models.Model):
         string='BY', required=True)
 
     company_id = fields.Many2one('res.company', string='Company', tracking=True, default=lambda self: self.env.company, required=True)
+    generation_report = fields.Text(string='Generation Report', readonly=True)
 
     @api.onchange('type', 'department_id','company_id', 'date_from', 'date_to')
     def onchange_employee(self):
@@ -92,103 +99,156 @@ class AttendanceSheetBatch(models.Model):
                                             locale=locale)))
 
     def action_done(self):
-        for batch in self:
-            payslip_batch_name = batch.name.replace("Attendance", "Payslip")
-            payslip_batch_id = self.env["hr.payslip.run"].sudo().create({
-                "name": payslip_batch_name or batch.name,
-                "date_start": batch.date_from,
-                "date_end": batch.date_to,
+        """
+        Approve the confirmed sheets of the submitted batches in one go: their
+        payslips are created together, attached to the payslip batch of their
+        attendance batch with one write per batch and the payslip batch
+        summaries are computed once at the end. The time spent in every stage
+        is logged.
+        """
+        timings = {}
+        start = time_counter()
+        batches = self.filtered(lambda b: b.state == "att_sub")
+        payslip_runs = self.env["hr.payslip.run"].sudo().create([{
+            "name": batch.name.replace("Attendance", "Payslip") or batch.name,
+            "date_start": batch.date_from,
+            "date_end": batch.date_to,
+        } for batch in batches])
+        run_by_batch = dict(zip(batches, payslip_runs))
+        timings["payslip batches"] = time_counter() - start
+
+        start = time_counter()
+        sheets = batches.att_sheet_ids.filtered(lambda sheet: sheet.state == 'confirm')
+        sheets.action_approve()
+        timings["approval and payslips"] = time_counter() - start
+
+        start = time_counter()
+        for batch in batches:
+            (batch.att_sheet_ids & sheets).payslip_id.write({
+                "payslip_run_id": run_by_batch[batch].id,
             })
-            if batch.state != "att_sub":
-                continue
-            for sheet in batch.att_sheet_ids:
-                if sheet.state == 'confirm':
-                    sheet.action_approve()
-                    payslip_id = self.env["hr.payslip"].search([("attendance_sheet_id", "=", sheet.id)], limit=1)
-                    if payslip_id and payslip_batch_id:
-                        payslip_id.payslip_run_id = payslip_batch_id.id
-            batch_info = dir(payslip_batch_id)
-            if "_generate_batch_payslip_data_summary" in batch_info:
-                payslip_batch_id._generate_batch_payslip_data_summary()
-            batch.payslip_batch_id = payslip_batch_id.id
-            batch.write({'state': 'done'})
+        timings["payslip attachment"] = time_counter() - start
+
+        start = time_counter()
+        if hasattr(payslip_runs, "_generate_batch_payslip_data_summary"):
+            payslip_runs._generate_batch_payslip_data_summary()
+        timings["summary"] = time_counter() - start
+
+        for batch in batches:
+            batch.write({'payslip_batch_id': run_by_batch[batch].id, 'state': 'done'})
+        _logger.info(
+            "Attendance batches %s closed, %s sheets approved: %s", batches.ids, len(sheets),
+            ", ".join("%s %.2fs" % (stage, duration) for stage, duration in timings.items()))
 
     def action_att_gen(self):
         return self.write({'state': 'att_gen'})
 
     def gen_att_sheet(self):
-
-        att_sheets = self.env['attendance.sheet']
+        """
+        Create the sheets of the batch employees together and compute their
+        lines chunk by chunk. The employees whose sheet cannot be generated are
+        reported on the batch instead of aborting the whole batch.
+        """
         att_sheet_obj = self.env['attendance.sheet']
+        errors = []
         for batch in self:
-            from_date = batch.date_from
-            to_date = batch.date_to
-            if self.type == 'department':
-                employee_ids = self.env['hr.employee'].search(
-                    [('department_id', '=', batch.department_id.id)])
-
-                if not employee_ids:
-                    raise UserError(_("There is no  Employees In This Department"))
-                for employee in employee_ids:
-
-                    contract_ids = employee._get_contracts(from_date, to_date)
-
-                    # if not contract_ids:
-                    #     raise UserError(_(
-                    #         "There is no  Running contracts for :%s " % employee.name))
-
-                    # Add Custom Condition
-                    if not employee.contract_id or (employee.contract_id.state != "open"):
-                        raise UserError(_(
-                            "There is no  Running contracts for :%s " % employee.name))
-                    else:
-                        new_sheet = att_sheet_obj.new({
-                            'employee_id': employee.id,
-                            'date_from': from_date,
-                            'date_to': to_date,
-                            'batch_id':batch.id
-                        })
-                        new_sheet.onchange_employee()
-                        values = att_sheet_obj._convert_to_write(new_sheet._cache)
-                        att_sheet_id = att_sheet_obj.create(values)
-
-
-                        att_sheet_id.get_attendances()
-                        att_sheets += att_sheet_id
-            if self.type == 'company':
-                employee_ids = self.env['hr.employee'].search(
-                    [('company_id', '=', batch.company_id.id)])
-
-                if not employee_ids:
-                    raise UserError(_("There is no  Employees In This Company"))
-                for employee in employee_ids:
-
-                    contract_ids = employee._get_contracts(from_date, to_date)
-
-                    # if not contract_ids:
-                    #     raise UserError(_(
-                    #         "There is no  Running contracts for :%s " % employee.name))
-
-                    # Add Custom Condition
-                    if not employee.contract_id or (employee.contract_id.state != "open"):
-                        raise UserError(_(
-                            "There is no  Running contracts for :%s " % employee.name))
-                    else:
-
-                        new_sheet = att_sheet_obj.new({
-                            'employee_id': employee.id,
-                            'date_from': from_date,
-                            'date_to': to_date,
-                            'batch_id':batch.id
-                        })
-                        new_sheet.onchange_employee()
-                        values = att_sheet_obj._convert_to_write(new_sheet._cache)
-                        att_sheet_id = att_sheet_obj.create(values)
-
-
-                        att_sheet_id.get_attendances()
-                        att_sheets += att_sheet_id
+            employees = batch._get_sheet_employees()
+            vals_list, batch_errors = batch._prepare_sheet_vals_list(employees)
+            att_sheets = att_sheet_obj.create(vals_list)
+            batch_errors += batch._compute_sheet_lines(att_sheets)
+            batch.generation_report = "\n".join(
+                "%s: %s" % (employee.name, message) for employee, message in batch_errors)
+            errors += batch_errors
             batch.action_att_gen()
+        return self._generation_result_action(errors)
+
+    def _get_sheet_employees(self):
+        self.ensure_one()
+        if self.type == 'department':
+            employees = self.env['hr.employee'].search(
+                [('department_id', '=', self.department_id.id)])
+            if not employees:
+                raise UserError(_("There is no  Employees In This Department"))
+        else:
+            employees = self.env['hr.employee'].search(
+                [('company_id', '=', self.company_id.id)])
+            if not employees:
+                raise UserError(_("There is no  Employees In This Company"))
+        return employees
+
+    def _prepare_sheet_vals_list(self, employees):
+        """
+        Return the values of the sheets of the employees, set like
+        attendance.sheet.onchange_employee does, and the (employee, message)
+        of the employees without running contract or attendance policy.
+        """
+        self.ensure_one()
+        contract_by_employee = {}
+        for contract in employees._get_contracts(self.date_from, self.date_to):
+            contract_by_employee.setdefault(contract.employee_id.id, contract)
+        period = format_date(self.env, self.date_to, date_format="MMMM y")
+        vals_list = []
+        errors = []
+        for employee in employees:
+            if not employee.contract_id or employee.contract_id.state != "open":
+                errors.append((employee, _("There is no  Running contracts for :%s ", employee.name)))
+                continue
+            contract = contract_by_employee.get(employee.id) or employee.contract_id
+            if not contract.att_policy_id:
+                errors.append((employee, _("Employee %s does not have attendance policy", employee.name)))
+                continue
+            vals_list.append({
+                'name': 'Attendance Sheet - %s - %s' % (employee.name or '', period),
+                'employee_id': employee.id,
+                'company_id': employee.company_id.id,
+                'contract_id': contract.id,
+                'att_policy_id': contract.att_policy_id.id,
+                'date_from': self.date_from,
+                'date_to': self.date_to,
+                'batch_id': self.id,
+            })
+        return vals_list, errors
+
+    def _compute_sheet_lines(self, att_sheets):
+        """
+        Compute the lines of the sheets by chunks, each in a savepoint. The
+        sheets of a failing chunk are computed again one by one so that only
+        the faulty ones are left without lines; return their errors.
+        """
+        errors = []
+        for start in range(0, len(att_sheets), SHEET_GENERATION_CHUNK):
+            chunk = att_sheets[start:start + SHEET_GENERATION_CHUNK]
+            try:
+                with self.env.cr.savepoint():
+                    chunk.get_attendances()
+            except Exception:
+                _logger.info("Attendance sheets chunk failed, computing its sheets one by one", exc_info=True)
+                for sheet in chunk:
+                    try:
+                        with self.env.cr.savepoint():
+                            sheet.get_attendances()
+                    except Exception as e:
+                        _logger.warning("Attendance sheet of %s failed: %s", sheet.employee_id.name, e)
+                        errors.append((sheet.employee_id, str(e)))
+        return errors
+
+    @api.model
+    def _generation_result_action(self, errors):
+        if errors:
+            message = _("%s sheet(s) could not be generated, see the batch generation report.", len(errors))
+        else:
+            message = _("Attendance sheets generated.")
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _("Attendance Sheets"),
+                'message': message,
+                'type': 'warning' if errors else 'success',
+                'sticky': bool(errors),
+                'next': {'type': 'ir.actions.client', 'tag': 'soft_reload'},
+            },
+        }
 
     def submit_att_sheet(self):
         for batch in self:
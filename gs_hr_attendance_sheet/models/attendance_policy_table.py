@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+from collections import namedtuple
+
+# Rule lines of a compiled policy, sorted like the policy methods walk them.
+LateRuleLine = namedtuple(
+    'LateRuleLine', ['time', 'type', 'rate', 'amount', 'factors'])
+DiffRuleLine = namedtuple('DiffRuleLine', ['time', 'type', 'rate', 'amount'])
+AbsenceRuleLine = namedtuple('AbsenceRuleLine', ['counter', 'rate'])
+
+
+class AttendancePolicyTable:
+    """Rules of an attendance policy read once, evaluated in memory.
+
+    ``hr.attendance.policy`` searches its overtime rules and walks its rule
+    lines again for every attendance line it evaluates; compile the policy
+    once per batch with ``_compile_policy_table`` and evaluate the days
+    against this table instead. The evaluation methods give the same results
+    as ``get_overtime``, ``get_late``, ``get_diff`` and ``get_absence``.
+    """
+
+    __slots__ = ('overtime', 'late_lines', 'diff_lines', 'absence_lines')
+
+    def __init__(self, overtime, late_lines=None, diff_lines=None, absence_lines=None):
+        # None when the policy has no such rule: the period is then returned as is
+        self.overtime = overtime
+        self.late_lines = late_lines
+        self.diff_lines = diff_lines
+        self.absence_lines = absence_lines
+
+    def get_late(self, period, cnt):
+        """Late amount of ``period`` and the updated ``cnt`` of [time, count] pairs."""
+        if period <= 0:
+            return 0, cnt
+        if self.late_lines is None:
+            return period, cnt
+        for line in self.late_lines:
+            if period < line.time:
+                continue
+            no = 1
+            for counter in cnt:
+                if counter[0] == line.time:
+                    no = counter[1]
+                    counter[1] += 1
+                    break
+            else:
+                cnt.append([line.time, 2])
+            factor = 1
+            if no == 0:
+                factor = 0
+            else:
+                # factors of the first to the fifth time, the first set one
+                # from the count down applies
+                for threshold in range(min(no, 5), 0, -1):
+                    if line.factors[threshold - 1] > 0:
+                        factor = line.factors[threshold - 1]
+                        break
+            if line.type == 'rate':
+                return line.rate * period * factor, cnt
+            if line.type == 'fix':
+                return line.amount * factor, cnt
+            return period, cnt
+        return 0, cnt
+
+    def get_diff(self, period):
+        if self.diff_lines is None:
+            return period
+        for line in self.diff_lines:
+            if period >= line.time:
+                if line.type == 'rate':
+                    return line.rate * period
+                if line.type == 'fix':
+                    return line.amount
+                return period
+        return 0
+
+    def get_absence(self, period, cnt):
+        if self.absence_lines is None:
+            return period
+        for line in self.absence_lines:
+            if cnt >= line.counter:
+                return line.rate * period
+        return 0
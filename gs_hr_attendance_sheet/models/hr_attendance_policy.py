@@ -15,6 +15,10 @@ from odoo import models, fields, api, tools, _
 import babel
 import time
 from datetime import datetime, timedelta
+from odoo.tools import frozendict
+
+from .attendance_policy_table import (
+    AbsenceRuleLine, AttendancePolicyTable, DiffRuleLine, LateRuleLine)
 
 
 class HrAttendancePolicy(models.Model):
@@ -74,6 +78,35 @@ class HrAttendancePolicy(models.Model):
             res['wd_after'] = res['we_after'] = res['ph_after'] = 0
         return res
 
+    def _compile_policy_table(self):
+        """
+        Read the rules of the policy once into an AttendancePolicyTable, which
+        evaluates the attendance lines without querying the policy again.
+        """
+        self.ensure_one()
+        overtime = {}
+        for ot_type, prefix in (('workday', 'wd'), ('weekend', 'we'), ('ph', 'ph')):
+            rules = self.overtime_rule_ids.filtered(lambda r: r.type == ot_type)
+            rule = min(rules, key=lambda r: r.id) if rules else False
+            overtime[prefix + '_rate'] = rule.rate if rule else 1
+            overtime[prefix + '_after'] = rule.active_after if rule else 0
+
+        late_lines = diff_lines = absence_lines = None
+        if self.late_rule_id:
+            late_lines = tuple(
+                LateRuleLine(line.time, line.type, line.rate, line.amount,
+                             (line.first, line.second, line.third, line.fourth, line.fifth))
+                for line in self.late_rule_id.line_ids.sorted(key=lambda r: r.time, reverse=True))
+        if self.diff_rule_id:
+            diff_lines = tuple(
+                DiffRuleLine(line.time, line.type, line.rate, line.amount)
+                for line in self.diff_rule_id.line_ids.sorted(key=lambda r: r.time, reverse=True))
+        if self.absence_rule_id:
+            absence_lines = tuple(
+                AbsenceRuleLine(int(line.counter), line.rate)
+                for line in self.absence_rule_id.line_ids.sorted(key=lambda r: r.counter, reverse=True))
+        return AttendancePolicyTable(frozendict(overtime), late_lines, diff_lines, absence_lines)
+
     def get_late(self, period, cnt):
         res = period
         flag = False
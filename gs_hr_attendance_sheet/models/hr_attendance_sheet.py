@@ -571,10 +571,21 @@ class AttendanceSheet(models.Model):
                 public_holiday.append(ph.id)
         return public_holiday
 
+    def _prepare_attendance_line_vals(self, vals_list):
+        """
+        Hook on the values of the lines computed by get_attendances, which
+        creates them in one batch per sheet once every day is evaluated.
+        """
+        self.ensure_one()
+        return vals_list
+
     def get_attendances(self):
+        # policies compiled once for all the sheets of the batch
+        policy_tables = {}
         for att_sheet in self:
             att_sheet.line_ids.unlink()
             att_line = self.env["attendance.sheet.line"]
+            line_vals_list = []
             from_date = att_sheet.date_from
             to_date = att_sheet.date_to
             emp = att_sheet.employee_id
@@ -590,12 +601,17 @@ class AttendanceSheet(models.Model):
             if not policy_id:
                 raise ValidationError(_(
                     'Please add Attendance Policy to the %s `s contract ' % emp.name))
+            if policy_id.id not in policy_tables:
+                policy_tables[policy_id.id] = policy_id._compile_policy_table()
+            policy_table = policy_tables[policy_id.id]
 
             emp_contract = att_sheet.employee_id.contract_id
             emp_contract_end_date = emp_contract.expected_end_date if emp_contract and emp_contract.expected_end_date else False
 
             all_dates = [(from_date + timedelta(days=x)) for x in
                          range((to_date - from_date).days + 1)]
+            work_intervals_by_day = calendar_id.att_get_work_intervals_range(
+                from_date, to_date, tz)
             abs_cnt = 0
             unpaid_leave = 0
             paid_leave = 0
@@ -620,8 +636,7 @@ class AttendanceSheet(models.Model):
                                             second=59)
                 day_str = str(day.weekday())
                 date = day.strftime('%Y-%m-%d')
-                work_intervals = calendar_id.att_get_work_intervals_new(day_start,
-                                                                        day_end, tz)
+                work_intervals = work_intervals_by_day[day]
                 attendance_intervals = self.get_attendance_intervals(emp,
                                                                      day_start,
                                                                      day_end,
@@ -629,7 +644,7 @@ class AttendanceSheet(models.Model):
                 leaves = self._get_emp_leave_intervals(emp, day_start, day_end)
                 public_holiday = self.get_public_holiday(date, emp)
                 reserved_intervals = []
-                overtime_policy = policy_id.get_overtime()
+                overtime_policy = policy_table.overtime
                 abs_flag = False
                 if work_intervals:
                     if public_holiday:
@@ -668,21 +683,21 @@ class AttendanceSheet(models.Model):
                                     # 'worked_hours': (float_worked_hours - 1) if float_worked_hours else 0,
                                     'overtime': float_overtime,
                                     'act_overtime': act_float_overtime,
-                                    'att_sheet_id': self.id,
+                                    'att_sheet_id': att_sheet.id,
                                     'status': 'ph',
                                     'note': _("working on Public Holiday")
                                 }
                                 if att_sheet.employee_id.compute_attendance:
-                                    att_line.create(values)
+                                    line_vals_list.append(values)
                         else:
                             values = {
                                 'date': date,
                                 'day': day_str,
-                                'att_sheet_id': self.id,
+                                'att_sheet_id': att_sheet.id,
                                 'status': 'ph',
                             }
                             if att_sheet.employee_id.compute_attendance:
-                                att_line.create(values)
+                                line_vals_list.append(values)
                     else:
                         for i, work_interval in enumerate(work_intervals):
                             float_worked_hours = 0
@@ -872,7 +887,7 @@ class AttendanceSheet(models.Model):
                                                      'wd_rate']
                             float_late = late_in.total_seconds() / 3600
                             act_float_late = late_in.total_seconds() / 3600
-                            policy_late, late_cnt = policy_id.get_late(
+                            policy_late, late_cnt = policy_table.get_late(
                                 float_late,
                                 late_cnt)
                             float_diff = diff_time.total_seconds() / 3600
@@ -882,11 +897,11 @@ class AttendanceSheet(models.Model):
                                 abs_flag = True
 
                                 act_float_diff = float_diff
-                                float_diff = policy_id.get_absence(float_diff,
-                                                                   abs_cnt)
+                                float_diff = policy_table.get_absence(float_diff,
+                                                                      abs_cnt)
                             else:
                                 act_float_diff = float_diff
-                                float_diff = policy_id.get_diff(float_diff)
+                                float_diff = policy_table.get_diff(float_diff)
                             values = {
                                 'date': date,
                                 'day': day_str,
@@ -905,10 +920,10 @@ class AttendanceSheet(models.Model):
                                 'act_diff_time': act_float_diff,
                                 # 'act_diff_time': act_float_diff - 1 if act_float_diff > 0 else 0,
                                 'status': status,
-                                'att_sheet_id': self.id
+                                'att_sheet_id': att_sheet.id
                             }
                             if att_sheet.employee_id.compute_attendance or status == "leave":
-                                att_line.create(values)
+                                line_vals_list.append(values)
                         out_work_intervals = [x for x in attendance_intervals if
                                               x not in reserved_intervals]
                         if out_work_intervals:
@@ -942,10 +957,10 @@ class AttendanceSheet(models.Model):
                                     # 'worked_hours': (float_worked_hours - 1) if float_worked_hours else 0,
                                     'act_overtime': act_float_overtime,
                                     'note': _("overtime out of work intervals"),
-                                    'att_sheet_id': self.id
+                                    'att_sheet_id': att_sheet.id
                                 }
                                 if att_sheet.employee_id.compute_attendance:
-                                    att_line.create(values)
+                                    line_vals_list.append(values)
                 else:
                     if attendance_intervals:
                         # print "thats weekend be over time "
@@ -982,22 +997,24 @@ class AttendanceSheet(models.Model):
                                 'act_overtime': act_float_overtime,
                                 'worked_hours': float_worked_hours,
                                 # 'worked_hours': (float_worked_hours - 1) if float_worked_hours else 0,
-                                'att_sheet_id': self.id,
+                                'att_sheet_id': att_sheet.id,
                                 'status': 'weekend',
                                 'note': _("working in weekend")
                             }
                             if att_sheet.employee_id.compute_attendance:
-                                att_line.create(values)
+                                line_vals_list.append(values)
                     else:
                         values = {
                             'date': date,
                             'day': day_str,
-                            'att_sheet_id': self.id,
+                            'att_sheet_id': att_sheet.id,
                             'status': 'weekend',
                             'note': ""
                         }
                         if att_sheet.employee_id.compute_attendance:
-                            att_line.create(values)
+                            line_vals_list.append(values)
+
+            att_line.create(att_sheet._prepare_attendance_line_vals(line_vals_list))
 
             # leave_ids = self.env['hr.leave'].search([('employee_id', '=', att_sheet.employee_id.id),
             #                                          ('request_date_from', '>=',att_sheet.date_from),
@@ -1056,7 +1073,8 @@ class AttendanceSheet(models.Model):
 
     def action_create_payslip(self):
         payslip_obj = self.env['hr.payslip']
-        payslips = payslip_obj
+        struct_id = self.env.ref("gs_hr_attendance_sheet.structure_attendance_sheet")
+        payslip_vals_list = []
         for sheet in self:
             contracts = sheet.employee_id._get_contracts(sheet.date_from,
                                                          sheet.date_to)
@@ -1069,7 +1087,6 @@ class AttendanceSheet(models.Model):
             if not contract:
                 contract = self.env['hr.contract'].search(
                     [('employee_id', '=', sheet.employee_id.id), ('state', '=', 'open')], limit=1)
-            struct_id = self.env.ref("gs_hr_attendance_sheet.structure_attendance_sheet")
             new_payslip = payslip_obj.new({
                 'name': sheet.employee_id.name + 'Payslip',
                 'employee_id': sheet.employee_id.id,
@@ -1081,19 +1098,20 @@ class AttendanceSheet(models.Model):
                 'attendance_sheet_id': sheet.id,
             })
             # new_payslip._onchange_employee()
-            payslip_dict = new_payslip._convert_to_write({
-                name: new_payslip[name] for name in new_payslip._cache})
+            payslip_vals_list.append(new_payslip._convert_to_write({
+                name: new_payslip[name] for name in new_payslip._cache}))
 
-            payslip_id = payslip_obj.create(payslip_dict)
-            worked_day_lines = self._get_workday_lines()
+        # all the payslips are created and computed together
+        payslips = payslip_obj.create(payslip_vals_list)
+        for sheet, payslip_id in zip(self, payslips):
             payslip_id.worked_days_line_ids = [(0, 0, x) for x in
-                                               worked_day_lines]
-            payslip_id.compute_sheet()
-            payslip_id.is_bool = False
-            # payslip_id.gs_onchange_employee()
-            # payslip_id.onchange_employee_ref()
+                                               sheet._get_workday_lines()]
+        payslips.compute_sheet()
+        payslips.write({'is_bool': False})
+        # payslip_id.gs_onchange_employee()
+        # payslip_id.onchange_employee_ref()
+        for sheet, payslip_id in zip(self, payslips):
             sheet.payslip_id = payslip_id
-            payslips += payslip_id
         return payslips
 
     def _get_workday_lines(self):
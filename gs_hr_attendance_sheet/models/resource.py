@@ -25,8 +25,8 @@
 
 import pytz
 from operator import itemgetter
-from odoo import api, fields, models, _
-from datetime import timedelta
+from odoo import api, fields, models, tools, _
+from datetime import datetime, timedelta
 from odoo.addons.resource.models.utils import float_to_time
 
 
@@ -69,60 +69,60 @@ class ResourceCalendar(models.Model):
         return clean_work_intervals
 
     def att_get_work_intervals_new(self, day_start, day_end, tz):
+        self.ensure_one()
         tz_info = fields.Datetime.context_timestamp(self, day_start).tzinfo
-        day_start_utc = day_start.replace(tzinfo=tz_info)
-        day_end_utc = day_end.replace(tzinfo=tz_info)
-        att_work_intervals = self._leave_intervals(day_start_utc,
-                                                   day_end_utc)
-        day_wrok_att = self._get_day_attendances(day_start.date(),
-                                                 day_start.replace(hour=0,
-                                                                   minute=0,
-                                                                   second=0).time(),
-                                                 day_end.time())
-        working_intervals = []
+        return list(self._att_get_work_intervals_cached(
+            self.write_date, day_start, day_end, tz_info))
 
+    def att_get_work_intervals_range(self, date_from, date_to, tz):
+        """
+        Work intervals of every day between the two dates, keyed by date, as
+        returned by att_get_work_intervals_new for the full day.
+        """
+        self.ensure_one()
+        intervals_by_day = {}
+        for offset in range((date_to - date_from).days + 1):
+            day = date_from + timedelta(days=offset)
+            day_start = datetime(day.year, day.month, day.day)
+            intervals_by_day[day] = self.att_get_work_intervals_new(
+                day_start, day_start.replace(hour=23, minute=59, second=59), tz)
+        return intervals_by_day
+
+    @tools.ormcache('self.id', 'write_date', 'day_start', 'day_end', 'tz_info')
+    def _att_get_work_intervals_cached(self, write_date, day_start, day_end, tz_info):
+        """
+        Work intervals of the calendar between two naive local datetimes, in
+        naive UTC. Employees sharing a calendar share the result; the calendar
+        write date in the key drops it when the calendar is modified.
+        """
+        day_midnight = day_start.replace(hour=0, minute=0, second=0)
+        working_intervals = []
         for att in self._get_day_attendances(day_start.date(),
-                                             day_start.replace(hour=0, minute=0,
-                                                               second=0).time(),
+                                             day_midnight.time(),
                                              day_end.time()):
-            dt_f = day_start.replace(hour=0, minute=0, second=0) + timedelta(
-                seconds=(att.hour_from * 3600))
+            dt_f = day_midnight + timedelta(seconds=(att.hour_from * 3600))
             if dt_f < day_start:
                 dt_f = day_start
-            dt_t = day_start.replace(hour=0, minute=0, second=0) + timedelta(
-                seconds=(att.hour_to * 3600))
+            dt_t = day_midnight + timedelta(seconds=(att.hour_to * 3600))
             if dt_t > day_end:
                 dt_t = day_end
-            working_interval = (dt_f, dt_t)
-            working_interval_tz = (
+            working_intervals.append((
                 dt_f.replace(tzinfo=tz_info).astimezone(pytz.UTC).replace(
                     tzinfo=None),
                 dt_t.replace(tzinfo=tz_info).astimezone(pytz.UTC).replace(
-                    tzinfo=None))
-            working_intervals.append(working_interval_tz)
-        clean_work_intervals = self.att_interval_clean(working_intervals)
-
-        return clean_work_intervals
+                    tzinfo=None)))
+        return tuple(self.att_interval_clean(working_intervals))
 
     def att_interval_clean(self, intervals):
-        intervals = sorted(intervals,
-                           key=itemgetter(0))  # sort on first datetime
+        """Merge the overlapping or touching intervals, sorted on their start."""
         cleaned = []
-        working_interval = None
-        while intervals:
-            current_interval = intervals.pop(0)
-            if not working_interval:  # init
-                working_interval = [current_interval[0], current_interval[1]]
-            elif working_interval[1] < current_interval[
-                0]:
-                cleaned.append(tuple(working_interval))
-                working_interval = [current_interval[0], current_interval[1]]
-            elif working_interval[1] < current_interval[
-                1]:
-                working_interval[1] = current_interval[1]
-        if working_interval:
-            cleaned.append(tuple(working_interval))
-        return cleaned
+        for start, stop in sorted(intervals, key=itemgetter(0)):
+            if cleaned and start <= cleaned[-1][1]:
+                if stop > cleaned[-1][1]:
+                    cleaned[-1][1] = stop
+            else:
+                cleaned.append([start, stop])
+        return [tuple(interval) for interval in cleaned]
 
     def att_interval_without_leaves(self, interval, leave_intervals):
         if not interval:
@@ -147,3 +147,26 @@ class ResourceCalendar(models.Model):
             1]:  # remove intervals moved outside base interval due to leaves
             intervals.append((current_interval[0], current_interval[1]))
         return intervals
+
+
+class ResourceCalendarAttendance(models.Model):
+    _inherit = "resource.calendar.attendance"
+
+    # The work intervals cached per calendar write date miss the changes made
+    # to the attendances directly, without going through their calendar.
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        attendances = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return attendances
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
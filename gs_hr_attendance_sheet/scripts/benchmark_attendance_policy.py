@@ -0,0 +1,116 @@
+"""
+Benchmark of the attendance policy evaluation of the sheet computation.
+
+Run it from an Odoo shell on a database with gs_hr_attendance_sheet installed:
+
+    odoo-bin shell -d <database> < gs_hr_attendance_sheet/scripts/benchmark_attendance_policy.py
+
+A synthetic policy is evaluated against ``EMPLOYEE_COUNT`` months of punches,
+once through the policy methods like get_attendances used to and once through
+the compiled policy table; both must give the same amounts. Everything is
+rolled back at the end.
+"""
+import random
+import time
+
+EMPLOYEE_COUNT = 200
+DAYS = 30
+
+
+def _create_policy(env):
+    late_rule = env["hr.late.rule"].create({
+        "name": "Benchmark Late",
+        "line_ids": [(0, 0, {
+            "type": "rate", "rate": 1.0 + index, "time": 0.25 * (index + 1),
+            "first": 1, "second": 1.5, "third": 2, "fourth": 2.5, "fifth": 3,
+        }) for index in range(4)],
+    })
+    diff_rule = env["hr.diff.rule"].create({
+        "name": "Benchmark Difference",
+        "line_ids": [(0, 0, {"type": "rate", "rate": 1.0, "time": 0.5}),
+                     (0, 0, {"type": "fix", "amount": 50.0, "time": 2.0})],
+    })
+    absence_rule = env["hr.absence.rule"].create({
+        "name": "Benchmark Absence",
+        "line_ids": [(0, 0, {"rate": 1.0, "counter": "1"}),
+                     (0, 0, {"rate": 2.0, "counter": "3"})],
+    })
+    early_rule = env["hr.early.rule"].create({"name": "Benchmark Early"})
+    overtime_rules = env["hr.overtime.rule"].create([
+        {"name": "Benchmark WD", "type": "workday", "rate": 1.5, "active_after": 0.5},
+        {"name": "Benchmark WE", "type": "weekend", "rate": 2.0, "active_after": 0.0},
+        {"name": "Benchmark PH", "type": "ph", "rate": 2.5, "active_after": 0.0},
+    ])
+    return env["hr.attendance.policy"].create({
+        "name": "Benchmark Policy",
+        "late_rule_id": late_rule.id,
+        "early_rule_id": early_rule.id,
+        "diff_rule_id": diff_rule.id,
+        "absence_rule_id": absence_rule.id,
+        "overtime_rule_ids": [(6, 0, overtime_rules.ids)],
+    })
+
+
+def _punches(employee_count=EMPLOYEE_COUNT, days=DAYS):
+    """(late, difference, overtime, absent) hours of every employee-day."""
+    rng = random.Random(42)
+    return [[(
+        rng.choice([0, 0, 0.1, 0.3, 0.6, 1.2]),
+        rng.choice([0, 0, 0.4, 0.8, 2.5]),
+        rng.choice([0, 0.3, 1.0, 2.0]),
+        rng.random() < 0.05,
+    ) for _day in range(days)] for _employee in range(employee_count)]
+
+
+def _evaluate(evaluator, overtime_getter, punches):
+    amounts = []
+    for month in punches:
+        late_cnt = []
+        abs_cnt = 0
+        for late, diff, overtime, absent in month:
+            overtime_policy = overtime_getter()
+            overtime = overtime * overtime_policy["wd_rate"] if overtime > overtime_policy["wd_after"] else 0
+            late_amount, late_cnt = evaluator.get_late(late, late_cnt)
+            if absent:
+                abs_cnt += 1
+                diff_amount = evaluator.get_absence(diff, abs_cnt)
+            else:
+                diff_amount = evaluator.get_diff(diff)
+            amounts.append((overtime, late_amount, diff_amount))
+    return amounts
+
+
+def run(env):
+    cr = env.cr
+    cr.execute("SAVEPOINT benchmark_attendance_policy")
+    try:
+        policy = _create_policy(env)
+        env.flush_all()
+        punches = _punches()
+
+        env.invalidate_all()
+        queries = cr.sql_log_count
+        start = time.perf_counter()
+        legacy = _evaluate(policy, policy.get_overtime, punches)
+        legacy_time = time.perf_counter() - start
+        legacy_queries = cr.sql_log_count - queries
+
+        env.invalidate_all()
+        queries = cr.sql_log_count
+        start = time.perf_counter()
+        table = policy._compile_policy_table()
+        compiled = _evaluate(table, lambda: table.overtime, punches)
+        compiled_time = time.perf_counter() - start
+        compiled_queries = cr.sql_log_count - queries
+
+        assert legacy == compiled, "the compiled policy diverges from the policy methods"
+        days = EMPLOYEE_COUNT * DAYS
+        print(f"policy methods : {days} days in {legacy_time:.3f}s, {legacy_queries} queries")
+        print(f"compiled table : {days} days in {compiled_time:.3f}s, {compiled_queries} queries")
+    finally:
+        cr.execute("ROLLBACK TO SAVEPOINT benchmark_attendance_policy")
+        env.invalidate_all()
+
+
+if "env" in globals():
+    run(env)  # noqa: F821
@@ -0,0 +1 @@
+from . import test_att_sheet_batch
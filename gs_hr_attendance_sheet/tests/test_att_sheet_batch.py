@@ -0,0 +1,73 @@
+from datetime import date
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged("post_install", "-at_install")
+class TestAttendanceSheetBatch(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.department = cls.env["hr.department"].create({"name": "Sheet Batch Department"})
+        policy = cls.env["hr.attendance.policy"].create({
+            "name": "Sheet Batch Policy",
+            "overtime_rule_ids": [(0, 0, {
+                "name": overtime_type, "type": overtime_type, "active_after": 1.0, "rate": 1.5,
+            }) for overtime_type in ("workday", "weekend", "ph")],
+            "late_rule_id": cls.env["hr.late.rule"].create({
+                "name": "Late In Rule",
+                "line_ids": [(0, 0, {"type": "rate", "time": 0.25, "rate": 1.0})],
+            }).id,
+            "early_rule_id": cls.env["hr.early.rule"].create({
+                "name": "Early Check Out Rule",
+                "line_ids": [(0, 0, {"type": "rate", "time": 0.25, "rate": 1.0})],
+            }).id,
+            "diff_rule_id": cls.env["hr.diff.rule"].create({
+                "name": "Difference Time Rule",
+                "line_ids": [(0, 0, {"type": "rate", "time": 0.25, "rate": 1.0})],
+            }).id,
+            "absence_rule_id": cls.env["hr.absence.rule"].create({
+                "name": "Absence Rule",
+                "line_ids": [(0, 0, {"counter": "1", "rate": 1.0})],
+            }).id,
+        })
+        calendar = cls.env.company.resource_calendar_id
+        cls.employees = cls.env["hr.employee"].create([{
+            "name": "Sheet Batch Employee %s" % index,
+            "department_id": cls.department.id,
+            "resource_calendar_id": calendar.id,
+            "tz": "UTC",
+            "compute_attendance": True,
+        } for index in range(3)])
+        cls.env["hr.contract"].create([{
+            "name": "Contract %s" % employee.name,
+            "employee_id": employee.id,
+            "wage": 1000.0,
+            "date_start": date(2024, 1, 1),
+            "joining_date": date(2024, 1, 1),
+            "resource_calendar_id": calendar.id,
+            "att_policy_id": policy.id,
+            "state": "open",
+        } for employee in cls.employees])
+        cls.batch = cls.env["attendance.sheet.batch"].create({
+            "name": "Sheet Batch",
+            "type": "department",
+            "department_id": cls.department.id,
+            "date_from": date(2024, 1, 1),
+            "date_to": date(2024, 1, 7),
+        })
+
+    def test_multi_employee_sheets_computed_together(self):
+        vals_list, errors = self.batch._prepare_sheet_vals_list(self.employees)
+        self.assertFalse(errors)
+        sheets = self.env["attendance.sheet"].create(vals_list)
+        sheets.get_attendances()
+        for sheet in sheets:
+            self.assertTrue(sheet.line_ids)
+            self.assertEqual(sheet.line_ids.att_sheet_id, sheet)
+
+    def test_gen_att_sheet_without_errors(self):
+        self.batch.gen_att_sheet()
+        self.assertFalse(self.batch.generation_report)
+        self.assertEqual(self.batch.att_sheet_ids.employee_id, self.employees)
+        self.assertEqual(self.batch.state, "att_gen")
@@ -49,7 +49,7 @@
     'images': ['static/description/DFR2.gif'],
 
     # 'depends': ['base', 'mail', 'account', 'sale_management'],
-    'depends': ['base', 'mail', 'pr_account', 'sale_management'],
+    'depends': ['base', 'mail', 'pr_account', 'sale_management', 'report_xlsx'],
 
     'auto_install': True,
 
@@ -22,6 +22,14 @@ class ksDynamicFinancialReportController(http.Controller):
         ]
         return pdf
 
+    @http.route(['/dfr/pdf/download_async'], type='json', auth='user', methods=['POST'])
+    def download_pdf_report_async(self, id, data, context, reportname):
+        """Queue the PDF on the background report worker and return the job
+        status; the client polls /report/async/status/<token> until it is done."""
+        job = request.env['report.async.job'].with_context(context).enqueue(
+            reportname, 'pdf', docids=[int(id)], data=data, context=context)
+        return job._get_status()
+
     @http.route('/ks_dynamic_financial_report', type='http', auth='user', methods=['POST'], csrf=False)
     def get_report(self, model, ks_df_informations, output_format, financial_id=None, **kw):
         uid = request.session.uid
@@ -15,6 +15,8 @@ from odoo import models, fields, api, _
 from odoo.osv import expression
 from odoo.tools import date_utils, get_lang, ustr
 
+from .ks_report_context import KsReportContext
+
 FETCH_RANGE = 20
 _logger = logging.getLogger(__name__)
 
@@ -112,6 +114,12 @@ class ks_dynamic_financial_base(models.Model):
     def ks_default_company(self):
         return self.env.company
 
+    def ks_get_report_context(self, ks_df_informations=None):
+        """Build the formatting context shared by the loops of one report call."""
+        ks_company_id = (ks_df_informations or {}).get('company_id')
+        ks_company = self.env['res.company'].sudo().browse(ks_company_id) if ks_company_id else None
+        return KsReportContext(self.env, ks_company)
+
     # properties for getters and setters
 
     ks_differentiation_filter = property(ks_set_differentiation_filter, ks_get_differentiation_filter)
@@ -898,12 +906,9 @@ class ks_dynamic_financial_base(models.Model):
                 'lines': []
             } for x in sorted(ks_account_ids, key=lambda a: a.code)
         }  # base for accounts to display
+        ks_report_ctx = self.ks_get_report_context(ks_df_informations)
         for ks_account in ks_account_ids:
-            ks_company_id = self.env['res.company'].sudo().browse(ks_df_informations.get('company_id'))
-            ks_currency = ks_account.company_id.currency_id or ks_company_id.currency_id
-            ks_symbol = ks_currency.symbol
-            ks_rounding = ks_currency.rounding
-            ks_position = ks_currency.position
+            ks_currency = ks_account.company_id.currency_id or ks_report_ctx.currency
 
             ks_opening_balance = 0
             KS_WHERE_INIT = WHERE
@@ -1044,22 +1049,14 @@ class ks_dynamic_financial_base(models.Model):
                     ks_move_lines[ks_account.code].update({'debit': ks_row['debit'],
                                                            'credit': ks_row['credit'],
                                                            'balance': ks_row['balance'] + ks_move_lines[ks_account.code]['initial_balance'],
-                                                           'company_currency_id': ks_currency.id,
-                                                           'company_currency_symbol': ks_symbol,
-                                                           'company_currency_precision': ks_rounding,
-                                                           'company_currency_position': ks_position,
+                                                           **ks_report_ctx.ks_currency_vals(ks_currency),
                                                            'count': len(ks_current_lines),
                                                            'pages': self.ks_fetch_page_list(len(ks_current_lines)),
                                                            'single_page': True if len(ks_current_lines) <= FETCH_RANGE else False,
                                                            })
 
                     if self.env.context.get('OFFSET', False):
-                        for i in range(0, len(ks_move_lines[ks_account.code]['lines'])):
-                            lang = self.env.user.lang
-                            lang_id = self.env['res.lang'].search([('code', '=', lang)])['date_format'].replace('/', '-')
-                            if ks_move_lines[ks_account.code]['lines'][i].get('ldate') != None:
-                                ks_move_lines[ks_account.code]['lines'][i]['ldate'] = datetime.datetime.strptime(
-                                    (ks_move_lines[ks_account.code]['lines'][i]['ldate']).strftime(lang_id), lang_id).date()
+                        ks_report_ctx.ks_apply_date_format(ks_move_lines[ks_account.code]['lines'], 'ldate')
 
         return ks_move_lines, 0.0, 0.0, 0.0
 
@@ -2875,12 +2872,8 @@ class ks_dynamic_financial_base(models.Model):
                 FETCH FIRST %s ROWS ONLY
             ''') % (KS_WHERE_CURRENT, KS_ORDER_BY_CURRENT, ks_offset_count, fetch_range)
         cr.execute(sql)
-        for ks_row in cr.dictfetchall():
-            lang = self.env.user.lang
-            lang_id = self.env['res.lang'].search([('code', '=', lang)])['date_format'].replace('/', '-')
-
-            dt_con_dt_maturity = ks_row['ldate'].strftime(lang_id)
-            ks_row['ldate'] = datetime.datetime.strptime(dt_con_dt_maturity, lang_id).date()
+        ks_report_ctx = self.ks_get_report_context(ks_df_informations)
+        for ks_row in ks_report_ctx.ks_apply_date_format(cr.dictfetchall(), 'ldate'):
             ks_current_balance = ks_row['balance']
             ks_row['balance'] = ks_opening_balance + ks_current_balance
             ks_opening_balance += ks_current_balance
@@ -3175,11 +3168,9 @@ class ks_dynamic_financial_base(models.Model):
                 'lines': []
             } for x in ks_partner_ids
         }
+        ks_report_ctx = self.ks_get_report_context(ks_df_informations)
         for ks_partner in ks_partner_ids:
             ks_currency = ks_partner.company_id.currency_id or ks_company_id.currency_id
-            ks_symbol = ks_currency.symbol
-            ks_rounding = ks_currency.rounding
-            ks_position = ks_currency.position
             ks_opening_balance = 0.0
             KS_WHERE_INIT = WHERE
 
@@ -3316,10 +3307,7 @@ class ks_dynamic_financial_base(models.Model):
                     ks_move_lines[ks_partner.id]['credit'] = ks_row['credit'] - (
                         initial_bal_data[0].get('initial_credit', 0.0) if len(initial_bal_data) > 0 else 0.0)
                     ks_move_lines[ks_partner.id]['balance'] = ks_row['balance']
-                    ks_move_lines[ks_partner.id]['company_currency_id'] = ks_currency.id
-                    ks_move_lines[ks_partner.id]['company_currency_symbol'] = ks_symbol
-                    ks_move_lines[ks_partner.id]['company_currency_precision'] = ks_rounding
-                    ks_move_lines[ks_partner.id]['company_currency_position'] = ks_position
+                    ks_move_lines[ks_partner.id].update(ks_report_ctx.ks_currency_vals(ks_currency))
                     ks_move_lines[ks_partner.id]['count'] = len(ks_current_lines)
                     ks_move_lines[ks_partner.id]['pages'] = self.ks_fetch_page_list(len(ks_current_lines))
                     ks_move_lines[ks_partner.id]['single_page'] = True if len(
@@ -3738,6 +3726,7 @@ class ks_dynamic_financial_base(models.Model):
         '''
         ks_as_on_date = ks_df_informations['date'].get('ks_end_date')
         ks_period_dict = self.ks_prepare_due_bucket_list(ks_as_on_date)
+        ks_report_ctx = self.ks_get_report_context(ks_df_informations)
         ks_company_id = self.env['res.company'].sudo().browse(ks_df_informations.get('company_id'))
         ks_company_ids = ks_df_informations.get('company_ids')
         company_currency_id = ks_company_id.currency_id.id
@@ -3871,13 +3860,8 @@ class ks_dynamic_financial_base(models.Model):
                 ks_partner_dict['Total']['total'] += ks_total_balance
                 ks_partner_dict['Total'].update({'company_currency_id': company_currency_id})
                 if self.env.context.get('OFFSET', False):
-                    lang = self.env.user.lang
-                    lang_id = self.env['res.lang'].search([('code', '=', lang)])['date_format'].replace('/', '-')
-                    for i in range(0, len(ks_partner_dict[ks_partner.id]['lines'])):
-                        if ks_partner_dict[ks_partner.id]['lines'][i]['date_maturity']:
-                            ks_partner_dict[ks_partner.id]['lines'][i]['date_maturity'] = \
-                                ks_partner_dict[ks_partner.id]['lines'][i]['date_maturity'].strftime(lang_id)
-                        # ks_partner_dict[ks_partner.id]['lines'][i]['date_maturity'] = datetime.datetime.strptime(dt_con_dt_maturity, lang_id).date()
+                    ks_report_ctx.ks_apply_date_format(ks_partner_dict[ks_partner.id]['lines'], 'date_maturity',
+                                                       as_string=True)
 
             else:
 
@@ -4030,12 +4014,8 @@ class ks_dynamic_financial_base(models.Model):
                     if (ks_fn_lst['range_0'] or ks_fn_lst['range_1'] or ks_fn_lst['range_2'] or ks_fn_lst['range_3'] or
                             ks_fn_lst['range_4'] or ks_fn_lst['range_5'] or ks_fn_lst[
                                 'range_6']):
-                        lang = self.env.user.lang
-                        lang_id = self.env['res.lang'].search([('code', '=', lang)])['date_format'].replace('/', '-')
-                        if ks_fn_lst['date_maturity']:
-                            dt_con_dt_maturity = ks_fn_lst['date_maturity'].strftime(lang_id)
-                            ks_fn_lst['date_maturity'] = datetime.datetime.strptime(dt_con_dt_maturity, lang_id).date()
                         ks_move_lines.append(ks_fn_lst)
+                self.ks_get_report_context(ks_df_informations).ks_apply_date_format(ks_move_lines, 'date_maturity')
 
             if ks_move_lines:
                 return count, offset, sorted(ks_move_lines, key=lambda x: x['date']), ks_period_list
@@ -4045,8 +4025,6 @@ class ks_dynamic_financial_base(models.Model):
     def ks_prepare_due_bucket_list(self, ks_as_on_date=False):
         ks_periods = {}
         ks_date_from = fields.Date.from_string(ks_as_on_date if ks_as_on_date else self.ks_as_on_date)
-        lang = self.env.user.lang
-        language_id = self.env['res.lang'].search([('code', '=', lang)])[0]
         ks_due_bucket_list = [self.ks_due_bucket_1, self.ks_due_bucket_2, self.ks_due_bucket_3, self.ks_due_bucket_4,
                               self.ks_due_bucket_5]
         ks_start = False
@@ -4161,8 +4139,6 @@ class ks_dynamic_financial_base(models.Model):
         ks_month_detail_line = []
         ks_dates_list = []
         for ks_date_line in ks_results:
-            lang = self.env.user.lang
-            lang_id = self.env['res.lang'].search([('code', '=', lang)])['date_format'].replace('/', '-')
             ks_dates = '%s-%s' % (ks_date_line['month'], ks_date_line['yyyy'])
             # ks_new_date = fields.Datetime.to_datetime(ks_dates).date()
             # string_date = ks_new_date.strftime(lang_id)
@@ -4589,8 +4565,6 @@ class ks_dynamic_financial_base(models.Model):
 
     def ks_get_default_informations(self, ks_df_informations, ks_earlier_informations):
 
-        lang = self.env.user.lang
-        lang_id = self.env['res.lang'].search([('code', '=', lang)])['date_format'].replace('/', '-')
         ks_earlier_date = (ks_earlier_informations or {}).get('date', {})
 
         # Default values.
@@ -4830,8 +4804,6 @@ class ks_dynamic_financial_base(models.Model):
     def _ks_fetch_dates_interval(self, ks_df_informations, ks_start_date, ks_end_date, ks_process,
                                  ks_interval_type=None,
                                  ks_range_constrain=False):
-        lang = self.env.user.lang
-        lang_id = self.env['res.lang'].search([('code', '=', lang)])['date_format'].replace('/', '-')
         if not ks_interval_type:
             date = ks_end_date or ks_start_date
             if not date:
@@ -4852,9 +4824,6 @@ class ks_dynamic_financial_base(models.Model):
             else:
                 ks_interval_type = 'custom'
 
-        lang = self.env.user.lang
-        lang_id = self.env['res.lang'].search([('code', '=', lang)])['date_format'].replace('/', '-')
-
         return {
             'ks_string': self._ks_construct_date_string(ks_df_informations, ks_process, ks_interval_type, ks_end_date,
                                                         ks_start_date, ks_range_constrain=ks_range_constrain),
@@ -4870,14 +4839,11 @@ class ks_dynamic_financial_base(models.Model):
                                   ks_range_constrain=False):
 
         ks_string = None
-        lang = self.env.user.lang
-        lang_id = self.env['res.lang'].search([('code', '=', lang)])['date_format'].replace('/', '-')
+        lang_id = self.ks_get_report_context().date_format
         if not ks_string:
             ks_fy_day = self.env.company.fiscalyear_last_day
             ks_fy_month = int(self.env.company.fiscalyear_last_month)
             if ks_process == 'single' and ks_end_date:
-                lang = self.env.user.lang
-                lang_id = self.env['res.lang'].search([('code', '=', lang)])['date_format'].replace('/', '-')
                 dt_con = ks_end_date.strftime(lang_id)
                 ks_string = (_('As of') + ' {}'.format(dt_con))
 
@@ -4922,8 +4888,6 @@ class ks_dynamic_financial_base(models.Model):
 
     @api.model
     def ks_fetch_eariler_dates_interval(self, ks_df_informations, ks_interval_vals):
-        lang = self.env.user.lang
-        lang_id = self.env['res.lang'].search([('code', '=', lang)])['date_format'].replace('/', '-')
         ks_interval_type = ks_interval_vals['ks_interval_type']
         ks_process = ks_interval_vals['ks_process']
         ks_range_constrain = ks_interval_vals.get('ks_range_constrain', False)
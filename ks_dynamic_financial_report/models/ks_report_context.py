@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import datetime
+
+from odoo.tools import get_lang
+
+# A date whose day, month and year are all distinguishable, used to find out
+# whether the language date format survives a strftime/strptime round trip.
+KS_PROBE_DATE = datetime.date(2001, 12, 31)
+
+
+class KsReportContext:
+    """Language, date and currency formatting resolved once per report call.
+
+    The report engines used to look up ``res.lang`` and the company currency
+    for every partner, account or move line they produced; build one of these
+    before the loops and use its formatters on the rows instead.
+    """
+
+    __slots__ = ('lang', 'date_format', 'company', 'currency', '_currency_vals', '_date_converter')
+
+    def __init__(self, env, company=None):
+        self.lang = get_lang(env, env.user.lang)
+        self.date_format = self.lang.date_format.replace('/', '-')
+        self.company = company or env.company
+        self.currency = self.company.currency_id
+        self._currency_vals = {}
+        self._date_converter = self._ks_compile_date_converter(self.date_format)
+
+    @staticmethod
+    def _ks_compile_date_converter(date_format):
+        """Return the function normalizing a date through the language format.
+
+        Most formats carry the full day, month and year so the round trip is
+        the identity and the rows are left untouched.
+        """
+        def _ks_round_trip(value):
+            return datetime.datetime.strptime(value.strftime(date_format), date_format).date()
+
+        try:
+            if _ks_round_trip(KS_PROBE_DATE) == KS_PROBE_DATE:
+                return None
+        except ValueError:
+            pass
+        return _ks_round_trip
+
+    def ks_to_lang_date(self, value):
+        if not value or self._date_converter is None:
+            return value
+        return self._date_converter(value)
+
+    def ks_format_date(self, value):
+        return value.strftime(self.date_format) if value else value
+
+    def ks_apply_date_format(self, rows, key, as_string=False):
+        """Normalize ``key`` of every row in place, in a single pass."""
+        if as_string:
+            date_format = self.date_format
+            for row in rows:
+                if row.get(key):
+                    row[key] = row[key].strftime(date_format)
+        elif self._date_converter is not None:
+            converter = self._date_converter
+            for row in rows:
+                if row.get(key):
+                    row[key] = converter(row[key])
+        return rows
+
+    def ks_currency_vals(self, currency=None):
+        """``company_currency_*`` keys of the line dicts, read once per currency."""
+        currency = currency or self.currency
+        vals = self._currency_vals.get(currency.id)
+        if vals is None:
+            vals = self._currency_vals[currency.id] = {
+                'company_currency_id': currency.id,
+                'company_currency_symbol': currency.symbol,
+                'company_currency_precision': currency.rounding,
+                'company_currency_position': currency.position,
+            }
+        return vals
@@ -161,8 +161,8 @@ class KsDynamicFinancialXlsxGL(models.Model):
         # line_header_bold.num_format = currency_id
 
         row_pos_2 += 0
-        lang = self.env.user.lang
-        lang_id = self.env['res.lang'].search([('code', '=', lang)])['date_format'].replace('/', '-')
+        ks_report_ctx = self.ks_get_report_context(ks_df_informations)
+        lang_id = ks_report_ctx.date_format
         ks_new_start_date = (datetime.datetime.strptime(
             ks_df_informations['date'].get('ks_start_date'), '%Y-%m-%d').date()).strftime(lang_id)
         new_end_date = ks_df_informations['date'].get('ks_end_date') if ks_df_informations['date'].get('ks_end_date') else date.today()
@@ -302,9 +302,7 @@ class KsDynamicFinancialXlsxGL(models.Model):
                         elif not sub_line['initial_bal'] and not sub_line['ending_bal']:
                             row_pos += 1
                             date_2 = sub_line.get('ldate')
-                            lang = self.env.user.lang
-                            lang_id = self.env['res.lang'].search([('code', '=', lang)])['date_format']
-                            new_date = date_2.strftime(lang_id)
+                            new_date = date_2.strftime(ks_report_ctx.lang.date_format)
                             sheet.write(row_pos, 0, new_date,
                                         line_header_light_date)
                             sheet.write_string(row_pos, 1, sub_line.get('lcode'),
@@ -144,8 +144,8 @@ class KsDynamicFinancialXlsxPL(models.Model):
             '#,##0.' + '0' * ks_company_id.currency_id.decimal_places or 2)
 
         row_pos_2 += 0
-        lang = self.env.user.lang
-        lang_id = self.env['res.lang'].search([('code', '=', lang)])['date_format'].replace('/', '-')
+        ks_report_ctx = self.ks_get_report_context(ks_df_informations)
+        lang_id = ks_report_ctx.date_format
         ks_new_start_date = (datetime.datetime.strptime(
             ks_df_informations['date'].get('ks_start_date'), '%Y-%m-%d').date()).strftime(lang_id)
         for_e_date = ks_df_informations['date'].get('ks_end_date') if ks_df_informations['date'].get(
@@ -258,14 +258,12 @@ class KsDynamicFinancialXlsxPL(models.Model):
                         elif not sub_line['initial_bal'] and not sub_line['ending_bal']:
                             row_pos += 1
                             date_3 = sub_line.get('ldate')
-                            lang = self.env.user.lang
-                            lang_id = self.env['res.lang'].search([('code', '=', lang)])['date_format']
-                            new_date = date_3.strftime(lang_id)
+                            new_date = date_3.strftime(ks_report_ctx.lang.date_format)
                             sheet.write(row_pos, 0, new_date,
                                         line_header_light_date)
                             sheet.write_string(row_pos, 1, sub_line.get('lcode'),
                                                line_header_light)
-                            sheet.write_string(row_pos, 2, sub_line.get('account_name')[lang] if lang and isinstance(
+                            sheet.write_string(row_pos, 2, sub_line.get('account_name')[ks_report_ctx.lang.code] if isinstance(
                                 sub_line.get('account_name'), dict) else sub_line.get('account_name') or '',
                                                line_header_light)
                             # sheet.write_string(row_pos, 3, sub_line.get('lref') or '',
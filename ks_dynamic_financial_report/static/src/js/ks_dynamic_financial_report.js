@@ -21,7 +21,6 @@ import { parseFloat } from "@web/views/fields/parsers";
 import { Dropdown } from "@web/core/dropdown/dropdown";
 import { DropdownItem } from "@web/core/dropdown/dropdown_item";
 import { MultiRecordSelector } from "@web/core/record_selectors/multi_record_selector";
-import { downloadFile } from "@web/core/network/download";
 
 
 export class ksDynamicReportsWidget extends Component {
@@ -448,27 +447,36 @@ export class ksDynamicReportsWidget extends Component {
             (self.props.action.xml_id == _t('ks_dynamic_financial_report.ks_df_rec_action'))) {
                 this.props.action.context['OFFSET']=true
                 }
-        var pdf_data = await this.orm.call("ks.dynamic.financial.reports", 'ks_get_dynamic_fin_info', [this.props.action.context.id, this.ks_df_report_opt], {
+        var pdf_job = await this.orm.call("ks.dynamic.financial.reports", 'ks_get_dynamic_fin_info', [this.props.action.context.id, this.ks_df_report_opt], {
             context: this.props.action.context
         }).then(async (data) => {
             var report_name = self.ksGetReportName();
             var action = self.ksGetReportAction(report_name, data);
             self.props.action.context['OFFSET']=false;
-             var pdf_report = await this.rpc("/dfr/pdf/download", {
+            // Large ledgers are rendered by the background report worker
+            return await this.rpc("/dfr/pdf/download_async", {
                 id: self.props.action.context.id,
                 data: action.data,
                 context: action.context,
                 reportname: report_name
             });
-            return pdf_report;
         });
-        var filename = self.props.action.name;
-        const byteArray = new Uint8Array(pdf_data.length);
-        for (let i = 0; i < pdf_data.length; i++) {
-            byteArray[i] = pdf_data.charCodeAt(i);
+        await this.ksWaitAsyncReport(pdf_job);
+    }
+    async ksWaitAsyncReport(job) {
+        this.notificationService.add(_t("The report is being generated, it will download when ready."), { type: 'info' });
+        for (let attempt = 0; attempt < 200; attempt++) {
+            if (job.state === 'done') {
+                window.location.href = job.url;
+                return;
+            }
+            if (job.state === 'failed') {
+                this.notificationService.add(job.error, { type: 'danger' });
+                return;
+            }
+            await new Promise((resolve) => setTimeout(resolve, 3000));
+            job = await this.rpc(`/report/async/status/${job.token}`);
         }
-        const blob = new Blob([byteArray], { type: "application/pdf" });
-        await downloadFile(blob, filename, "application/pdf");
     }
     async ksPrintReportXlsx() {
 
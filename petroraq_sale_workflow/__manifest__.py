@@ -20,6 +20,7 @@
         "security/ir.model.access.csv",
         "data/payment_terms.xml",
         "data/estimation_sequence.xml",
+        "data/estimation_display_data.xml",
         # "data/sequence.xml",
         "views/sale_order_views.xml",
         "views/estimation_views.xml",
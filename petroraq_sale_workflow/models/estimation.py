@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError, ValidationError
 from odoo.tools import format_amount, html_escape
@@ -8,12 +10,23 @@ SECTION_TYPES = [
     ("equipment", "Equipment"),
     ("subcontract", "Sub Contract / TPS"),
 ]
+# Display rows of a section are numbered from its rank times this step, so
+# that inserting a line only renumbers the rows of its own section.
+DISPLAY_SECTION_SEQUENCE_STEP = 100000
 
 
 class PetroraqEstimation(models.Model):
     _name = "petroraq.estimation"
     _description = "Estimation"
     _inherit = ["mail.thread", "mail.activity.mixin", "base.revision"]
+    _revision_copy_mode = "sql"
+    _revision_diff_fields = {
+        "name": None,
+        "quantity": "Product Unit of Measure",
+        "unit_cost": None,
+        "subtotal": None,
+    }
+    _revision_diff_amount_field = "subtotal"
 
     current_revision_id = fields.Many2one(
         comodel_name="petroraq.estimation",
@@ -276,27 +289,63 @@ class PetroraqEstimation(models.Model):
     )
     def _compute_totals(self):
         for record in self:
-            material_total = sum(record.line_ids.filtered(lambda l: l.section_type == "material").mapped("subtotal"))
-            labor_total = sum(record.line_ids.filtered(lambda l: l.section_type == "labor").mapped("subtotal"))
-            equipment_total = sum(record.line_ids.filtered(lambda l: l.section_type == "equipment").mapped("subtotal"))
-            subcontract_total = sum(
-                record.line_ids.filtered(lambda l: l.section_type == "subcontract").mapped("subtotal"))
-            record.material_total = material_total
-            record.labor_total = labor_total
-            record.equipment_total = equipment_total
-            record.subcontract_total = subcontract_total
-            base_total = material_total + labor_total + equipment_total + subcontract_total
-            overhead_amount = base_total * (record.overhead_percent or 0.0) / 100.0
-            risk_amount = base_total * (record.risk_percent or 0.0) / 100.0
-            buffer_total = base_total + overhead_amount + risk_amount
-            profit_amount = buffer_total * (record.profit_percent or 0.0) / 100.0
-
-            record.total_amount = base_total
-            record.overhead_amount = overhead_amount
-            record.risk_amount = risk_amount
-            record.buffer_total_amount = buffer_total
-            record.profit_amount = profit_amount
-            record.total_with_profit = buffer_total + profit_amount
+            section_totals = record._get_section_totals()
+            record.material_total = section_totals["material"]
+            record.labor_total = section_totals["labor"]
+            record.equipment_total = section_totals["equipment"]
+            record.subcontract_total = section_totals["subcontract"]
+            totals = record._get_costing_totals(sum(section_totals.values()))
+
+            record.total_amount = totals["total_amount"]
+            record.overhead_amount = totals["overhead_amount"]
+            record.risk_amount = totals["risk_amount"]
+            record.buffer_total_amount = totals["buffer_total_amount"]
+            record.profit_amount = totals["profit_amount"]
+            record.total_with_profit = totals["total_with_profit"]
+
+    def _get_section_totals(self):
+        self.ensure_one()
+        section_totals = dict.fromkeys(("material", "labor", "equipment", "subcontract"), 0.0)
+        for section_type, subtotal in zip(self.line_ids.mapped("section_type"), self.line_ids.mapped("subtotal")):
+            if section_type in section_totals:
+                section_totals[section_type] += subtotal
+        return section_totals
+
+    def _get_costing_totals(self, base_total, percents=None):
+        self.ensure_one()
+        percents = percents or {}
+        overhead_percent = percents.get("overhead_percent", self.overhead_percent) or 0.0
+        risk_percent = percents.get("risk_percent", self.risk_percent) or 0.0
+        profit_percent = percents.get("profit_percent", self.profit_percent) or 0.0
+
+        overhead_amount = base_total * overhead_percent / 100.0
+        risk_amount = base_total * risk_percent / 100.0
+        buffer_total = base_total + overhead_amount + risk_amount
+        profit_amount = buffer_total * profit_percent / 100.0
+        return {
+            "total_amount": base_total,
+            "overhead_amount": overhead_amount,
+            "risk_amount": risk_amount,
+            "buffer_total_amount": buffer_total,
+            "profit_amount": profit_amount,
+            "total_with_profit": buffer_total + profit_amount,
+        }
+
+    def costing_scenarios(self, scenarios):
+        """
+        What-if costing of the estimation, nothing is written.
+        Same contract as ``sale.order.costing_scenarios``: the section totals are
+        summed once and every scenario only reapplies the percentages.
+        """
+        self.ensure_one()
+        scenarios = [self.env["sale.order"]._costing_check_scenario(scenario) for scenario in scenarios]
+        section_totals = self._get_section_totals()
+        base_total = sum(section_totals.values())
+        return [
+            dict(scenario, currency=self.currency_id.id, **section_totals,
+                 **self._get_costing_totals(base_total, scenario))
+            for scenario in scenarios
+        ]
 
     @api.onchange("overhead_percent", "risk_percent", "profit_percent")
     def _onchange_percent_validation(self):
@@ -348,6 +397,36 @@ class PetroraqEstimation(models.Model):
     def create_revision(self):
         return super(PetroraqEstimation, self.with_context(allow_estimation_write=True)).create_revision()
 
+    def _get_revision_sql_one2many_fields(self):
+        # the display rows are cloned after the lines so their source lines are remapped
+        return ["line_ids", "display_line_ids"]
+
+    def _get_revision_diff_rows(self):
+        # lines sectioned by their section type, in the order of the estimation
+        section_labels = dict(SECTION_TYPES)
+        lines = self.env["petroraq.estimation.line"].search(
+            [("estimation_id", "in", self.ids)], order="estimation_id, section_type, id"
+        )
+        rows_by_estimation = defaultdict(list)
+        for line in lines:
+            row = {
+                "id": line.id,
+                "section": section_labels.get(line.section_type, ""),
+                "product_id": line.product_id.id,
+            }
+            for name in self._revision_diff_fields:
+                row[name] = (line[name] or "") if name == "name" else float(line[name] or 0.0)
+            rows_by_estimation[line.estimation_id.id].append(row)
+        return rows_by_estimation
+
+    def _get_revision_diff_totals(self, previous):
+        totals = super()._get_revision_diff_totals(previous)
+        totals.update({
+            "total_amount_delta": self.total_amount - previous.total_amount,
+            "total_with_profit_delta": self.total_with_profit - previous.total_with_profit,
+        })
+        return totals
+
     def _ensure_sale_order(self):
         self.ensure_one()
         if not self.partner_id:
@@ -405,9 +484,11 @@ class PetroraqEstimation(models.Model):
             "subcontract": _("Sub Contract / TPS"),
         }
         lines = []
-        estimation_lines = self.line_ids.sorted(lambda l: (l.section_type or "", l.id))
+        lines_by_section = defaultdict(list)
+        for line in self.line_ids.sorted(lambda l: (l.section_type or "", l.id)):
+            lines_by_section[line.section_type].append(line)
         for section_type in SECTION_TYPES:
-            section_lines = estimation_lines.filtered(lambda l: l.section_type == section_type[0])
+            section_lines = lines_by_section.get(section_type[0])
             if not section_lines:
                 continue
             section_name = section_map.get(section_type[0], section_type[1])
@@ -440,79 +521,130 @@ class PetroraqEstimation(models.Model):
                 })
         return lines
 
-    def _rebuild_display_lines(self):
+    def _prepare_display_lines(self, section_types=None):
+        """
+        Wanted display rows of the estimation, keyed by ``("section", section_type)``
+        for the section headers and ``("line", line id)`` for the lines.
+        """
+        self.ensure_one()
         section_map = {
             "material": _("Material"),
             "labor": _("Labor"),
             "equipment": _("Equipment"),
             "subcontract": _("Sub Contract / TPS"),
         }
+        lines_by_section = defaultdict(list)
+        for line in self.line_ids.sorted(lambda l: (l.section_type or "", l.id)):
+            lines_by_section[line.section_type].append(line)
+
+        rows = {}
+        for rank, (section_type, section_label) in enumerate(SECTION_TYPES):
+            if section_types is not None and section_type not in section_types:
+                continue
+            section_lines = lines_by_section.get(section_type)
+            if not section_lines:
+                continue
+            section_name = section_map.get(section_type, section_label)
+            sequence = rank * DISPLAY_SECTION_SEQUENCE_STEP
+            rows[("section", section_type)] = {
+                "display_type": "line_section",
+                "name": section_name,
+                "sequence": sequence,
+                "section_type": section_type,
+            }
+            for line in section_lines:
+                sequence += 1
+                rows[("line", line.id)] = {
+                    "source_line_id": line.id,
+                    "display_type": "line_note" if not line.product_id else False,
+                    "name": line.name or (line.product_id.display_name if line.product_id else section_name),
+                    "product_id": line.product_id.id if line.product_id else False,
+                    "uom_id": line.uom_id.id if line.uom_id else False,
+                    "quantity": line.quantity or 0.0,
+                    "quantity_hours": line.quantity_hours or 0.0,
+                    "unit_cost": line.unit_cost or 0.0,
+                    "sequence": sequence,
+                    "section_type": section_type,
+                }
+        return rows
+
+    def _rebuild_display_lines(self, section_types=None):
+        """
+        Bring the display rows in line with the estimation lines as a diff: only
+        the rows whose values changed are written, missing ones are created and
+        obsolete ones deleted, each in one batch. ``section_types`` limits the
+        work to the sections touched by a change.
+        """
         DisplayLine = self.env["petroraq.estimation.display.line"]
+        to_unlink = DisplayLine
+        to_create = {"section": [], "line": []}
+        to_write = defaultdict(lambda: DisplayLine)
+        headers = {}
+
         for estimation in self:
-            estimation.display_line_ids.unlink()
-            sequence = 1
-            estimation_lines = estimation.line_ids.sorted(lambda l: (l.section_type or "", l.id))
-            for section_type, section_label in SECTION_TYPES:
-                section_lines = estimation_lines.filtered(lambda l: l.section_type == section_type)
-                if not section_lines:
+            wanted = estimation._prepare_display_lines(section_types)
+            existing = {}
+            for row in estimation.display_line_ids:
+                if section_types is not None and row.section_type not in section_types:
                     continue
-                section_name = section_map.get(section_type, section_label)
-                DisplayLine.create({
-                    "estimation_id": estimation.id,
-                    "display_type": "line_section",
-                    "name": section_name,
-                    "sequence": sequence,
-                    "section_type": section_type,
-                })
-                sequence += 1
-                for line in section_lines:
-                    display_vals = {
-                        "estimation_id": estimation.id,
-                        "display_type": False,
-                        "name": line.name
-                                or (line.product_id.display_name if line.product_id else section_name),
-                        "product_id": line.product_id.id if line.product_id else False,
-                        "uom_id": line.uom_id.id if line.uom_id else False,
-                        "quantity": line.quantity or 0.0,
-                        "quantity_hours": line.quantity_hours or 0.0,
-                        "unit_cost": line.unit_cost or 0.0,
-                        "sequence": sequence,
-                        "section_type": section_type,
-                    }
-                    if not line.product_id:
-                        display_vals["display_type"] = "line_note"
-                    DisplayLine.create(display_vals)
-                    sequence += 1
+                if row.display_type == "line_section" and not row.source_line_id:
+                    key = ("section", row.section_type)
+                else:
+                    key = ("line", row.source_line_id.id)
+                if key not in wanted or key in existing:
+                    to_unlink |= row
+                    continue
+                existing[key] = row
+
+            for key, vals in wanted.items():
+                vals = dict(vals, estimation_id=estimation.id)
+                if key[0] == "line":
+                    vals["section_key"] = (estimation.id, vals["section_type"])
+                row = existing.get(key)
+                if not row:
+                    to_create[key[0]].append(vals)
+                    continue
+                if key[0] == "section":
+                    headers[(estimation.id, row.section_type)] = row
+                changes = row._get_display_changes(vals)
+                if changes:
+                    to_write[tuple(sorted(changes.items()))] |= row
+
+        to_unlink.unlink()
+        if to_create["section"]:
+            for row in DisplayLine.create(to_create["section"]):
+                headers[(row.estimation_id.id, row.section_type)] = row
+        for vals in to_create["line"]:
+            vals["section_id"] = headers[vals.pop("section_key")].id
+        for changes, rows in to_write.items():
+            changes = dict(changes)
+            if "section_key" in changes:
+                changes["section_id"] = headers[changes.pop("section_key")].id
+            rows.write(changes)
+        if to_create["line"]:
+            DisplayLine.create(to_create["line"])
 
-    def action_create_work_order(self):
+    @api.model
+    def _rebuild_legacy_display_lines(self):
+        """
+        Rebuild the display rows created before they were linked to their
+        section header and source line, called on module update: the section
+        subtotals only sum the rows linked to their header.
+        """
+        legacy_rows = self.env["petroraq.estimation.display.line"].search([
+            ("display_type", "=", False),
+            ("section_id", "=", False),
+        ])
+        legacy_rows.with_context(active_test=False).estimation_id._rebuild_display_lines()
+
+    def _create_work_order(self, order):
+        """
+        Create the project, work order, cost centers, BOQ lines and tasks of the
+        estimation. All the values are prepared first and every model is
+        inserted with one multi-row create, so the stored computes depending on
+        the BOQ run once when the records are flushed instead of per line.
+        """
         self.ensure_one()
-        if self.work_order_id:
-            return {
-                "type": "ir.actions.act_window",
-                "name": _("Work Order"),
-                "res_model": "pr.work.order",
-                "res_id": self.work_order_id.id,
-                "view_mode": "form",
-                "target": "current",
-            }
-        order = self._ensure_sale_order()
-        if order.state != "sale":
-            raise UserError(_("You can only create a work order after the quotation is confirmed."))
-
-        if order.work_order_id:
-            self.with_context(allow_estimation_write=True).work_order_id = order.work_order_id.id
-            return {
-                "type": "ir.actions.act_window",
-                "name": _("Work Order"),
-                "res_model": "pr.work.order",
-                "res_id": order.work_order_id.id,
-                "view_mode": "form",
-                "target": "current",
-            }
-
-        Project = self.env["project.project"]
-        WorkOrder = self.env["pr.work.order"]
-
         project_vals = {
             "name": order.order_inquiry_id.description if order.order_inquiry_id else (order.name or self.name),
             "partner_id": order.partner_id.id,
@@ -521,7 +653,7 @@ class PetroraqEstimation(models.Model):
         if order.analytic_account_id:
             project_vals["analytic_account_id"] = order.analytic_account_id.id
 
-        project = Project.create(project_vals)
+        project = self.env["project.project"].create(project_vals)
 
         work_order_vals = {
             "company_id": order.company_id.id,
@@ -533,57 +665,70 @@ class PetroraqEstimation(models.Model):
         if order.analytic_account_id:
             work_order_vals["analytic_account_id"] = order.analytic_account_id.id
 
-        work_order = WorkOrder.create(work_order_vals)
+        work_order = self.env["pr.work.order"].create(work_order_vals)
 
-        for picking in order.picking_ids:
-            picking.move_ids_without_package.write({
-                "work_order_id": work_order.id,
-            })
+        order.picking_ids.move_ids_without_package.write({
+            "work_order_id": work_order.id,
+        })
 
-        section_map = {
-            "material": _("Material"),
-            "labor": _("Labor"),
-            "equipment": _("Equipment"),
-            "subcontract": _("Sub Contract / TPS"),
-        }
-        sections = [
-            section_map.get(section_type[0], section_type[1])
-            for section_type in SECTION_TYPES
-            if self.line_ids.filtered(lambda l: l.section_type == section_type[0])
-        ]
+        boq_vals_list = self._prepare_work_order_boq_lines(work_order)
+        sections = [vals["name"] for vals in boq_vals_list if vals["display_type"] == "line_section"]
 
-        wo_cost_center_model = self.env["pr.work.order.cost.center"]
-        analytic_model = self.env["account.analytic.account"]
         analytic_plan = self.env.ref("pr_account.pr_account_analytic_plan_our_project")
+        analytics = self.env["account.analytic.account"].create([{
+            "name": f"{order.name} - {section_name}",
+            "company_id": order.company_id.id,
+            "plan_id": analytic_plan.id,
+            "partner_id": order.partner_id.id,
+        } for section_name in sections])
 
-        for section_name in sections:
-            analytic = analytic_model.create({
-                "name": f"{order.name} - {section_name}",
-                "company_id": order.company_id.id,
-                "plan_id": analytic_plan.id,
-                "partner_id": order.partner_id.id,
-            })
+        self.env["pr.work.order.cost.center"].create([{
+            "work_order_id": work_order.id,
+            "section_name": section_name,
+            "analytic_account_id": analytic.id,
+            "partner_id": order.partner_id.id,
+            "department_id": False,
+            "section_id": False,
+        } for section_name, analytic in zip(sections, analytics)])
 
-            wo_cost_center_model.create({
-                "work_order_id": work_order.id,
-                "section_name": section_name,
-                "analytic_account_id": analytic.id,
-                "partner_id": order.partner_id.id,
-                "department_id": False,
-                "section_id": False,
-            })
+        self.env["pr.work.order.boq"].create(boq_vals_list)
 
-        for line_vals in self._prepare_work_order_boq_lines(work_order):
-            work_order.boq_line_ids.create(line_vals)
+        self.env["project.task"].create([{
+            "name": section_name,
+            "project_id": project.id,
+            "work_order_id": work_order.id,
+            "company_id": work_order.company_id.id,
+        } for section_name in sections])
+        return work_order
 
-        for boq in work_order.boq_line_ids:
-            if boq.display_type == 'line_section':
-                self.env['project.task'].create({
-                    'name': boq.name,
-                    'project_id': project.id,
-                    'work_order_id': work_order.id,
-                    'company_id': work_order.company_id.id,
-                })
+    def action_create_work_order(self):
+        self.ensure_one()
+        if self.work_order_id:
+            return {
+                "type": "ir.actions.act_window",
+                "name": _("Work Order"),
+                "res_model": "pr.work.order",
+                "res_id": self.work_order_id.id,
+                "view_mode": "form",
+                "target": "current",
+            }
+        order = self._ensure_sale_order()
+        if order.state != "sale":
+            raise UserError(_("You can only create a work order after the quotation is confirmed."))
+
+        if order.work_order_id:
+            self.with_context(allow_estimation_write=True).work_order_id = order.work_order_id.id
+            return {
+                "type": "ir.actions.act_window",
+                "name": _("Work Order"),
+                "res_model": "pr.work.order",
+                "res_id": order.work_order_id.id,
+                "view_mode": "form",
+                "target": "current",
+            }
+
+        work_order = self._create_work_order(order)
+        project = work_order.project_id
 
         order.write({
             "work_order_id": work_order.id,
@@ -764,21 +909,24 @@ class PetroraqEstimationLine(models.Model):
         estimations._ensure_unlocked()
 
         records = super().create(vals_list)
-        records.mapped("estimation_id")._rebuild_display_lines()
+        records.mapped("estimation_id")._rebuild_display_lines(set(records.mapped("section_type")))
         return records
 
     def write(self, vals):
         self.mapped("estimation_id")._ensure_unlocked()
         estimations = self.mapped("estimation_id")
+        section_types = set(self.mapped("section_type"))
         res = super().write(vals)
-        (estimations | self.mapped("estimation_id"))._rebuild_display_lines()
+        section_types.update(self.mapped("section_type"))
+        (estimations | self.mapped("estimation_id"))._rebuild_display_lines(section_types)
         return res
 
     def unlink(self):
         self.mapped("estimation_id")._ensure_unlocked()
         estimations = self.mapped("estimation_id")
+        section_types = set(self.mapped("section_type"))
         res = super().unlink()
-        estimations._rebuild_display_lines()
+        estimations._rebuild_display_lines(section_types)
         return res
 
 
@@ -794,6 +942,26 @@ class PetroraqEstimationDisplayLine(models.Model):
         ondelete="cascade",
     )
     sequence = fields.Integer(default=10)
+    source_line_id = fields.Many2one(
+        "petroraq.estimation.line",
+        string="Estimation Line",
+        ondelete="cascade",
+        index="btree_not_null",
+        readonly=True,
+    )
+    section_id = fields.Many2one(
+        "petroraq.estimation.display.line",
+        string="Section Header",
+        ondelete="set null",
+        index="btree_not_null",
+        readonly=True,
+    )
+    section_child_ids = fields.One2many(
+        "petroraq.estimation.display.line",
+        "section_id",
+        string="Section Lines",
+        readonly=True,
+    )
     display_type = fields.Selection(
         [
             ("line_section", "Section"),
@@ -847,47 +1015,41 @@ class PetroraqEstimationDisplayLine(models.Model):
 
     @api.depends(
         "display_type",
-        "sequence",
-        "section_type",
-        "quantity",
-        "quantity_hours",
-        "unit_cost",
-        "estimation_id.display_line_ids.display_type",
-        "estimation_id.display_line_ids.sequence",
-        "estimation_id.display_line_ids.section_type",
-        "estimation_id.display_line_ids.quantity",
-        "estimation_id.display_line_ids.quantity_hours",
-        "estimation_id.display_line_ids.unit_cost",
+        "section_child_ids.display_type",
+        "section_child_ids.section_type",
+        "section_child_ids.quantity",
+        "section_child_ids.quantity_hours",
+        "section_child_ids.unit_cost",
     )
     def _compute_section_subtotal_amount(self):
+        """Only a header sums its own section rows, so a change to one row recomputes one section."""
         label = _("Sub Total")
         for line in self:
             line.section_subtotal_amount = 0.0
             line.section_subtotal_display = False
-
-        for estimation in self.mapped("estimation_id"):
+            if line.display_type != "line_section":
+                continue
             subtotal = 0.0
-            current_section = None
-            ordered_lines = estimation.display_line_ids.sorted(key=lambda l: (l.sequence or 0, l.id or 0))
-
-            for line in ordered_lines:
-                if line.display_type == "line_section":
-                    if current_section:
-                        current_section._set_section_subtotal_values(subtotal, label)
-                    current_section = line
-                    subtotal = 0.0
-                    line.section_subtotal_amount = 0.0
-                    line.section_subtotal_display = False
-                    continue
-
-                if line.display_type:
+            for child in line.section_child_ids:
+                if child.display_type:
                     continue
+                qty = child.quantity_hours if child.section_type in ("labor", "equipment") else (child.quantity or 0.0)
+                subtotal += qty * (child.unit_cost or 0.0)
+            line._set_section_subtotal_values(subtotal, label)
 
-                qty = line.quantity_hours if line.section_type in ("labor", "equipment") else (line.quantity or 0.0)
-                subtotal += qty * (line.unit_cost or 0.0)
-
-            if current_section:
-                current_section._set_section_subtotal_values(subtotal, label)
+    def _get_display_changes(self, vals):
+        """Subset of ``vals`` differing from the row's current values."""
+        self.ensure_one()
+        changes = {}
+        for field_name, value in vals.items():
+            if field_name == "section_key":
+                if (self.section_id.estimation_id.id, self.section_id.section_type) != value:
+                    changes[field_name] = value
+                continue
+            field = self._fields[field_name]
+            if field.convert_to_write(self[field_name], self) != value:
+                changes[field_name] = value
+        return changes
 
     def _set_section_subtotal_values(self, amount, label):
         self.ensure_one()
@@ -1,4 +1,5 @@
 from copy import deepcopy
+from functools import partial
 
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError, ValidationError
@@ -6,6 +7,19 @@ from odoo.tools import format_amount, html_escape
 from odoo.tools.float_utils import float_round, float_compare
 
 
+def _costing_line_amounts(cost_unit, qty, oh_percent, risk_percent, profit_percent, round_):
+    """
+    Line-total based costing of one line, see ``_costing_line_breakdown``.
+    Returns (cost, overhead, risk, buffer, profit, sale) line amounts.
+    """
+    cost_line = round_(cost_unit * qty) if qty else 0.0
+    oh_line = round_(cost_line * oh_percent / 100.0)
+    risk_line = round_(cost_line * risk_percent / 100.0)
+    buffer_line = round_(cost_line + oh_line + risk_line)
+    profit_line = round_(buffer_line * profit_percent / 100.0)
+    return cost_line, oh_line, risk_line, buffer_line, profit_line, round_(buffer_line + profit_line)
+
+
 class SaleOrder(models.Model):
     _inherit = "sale.order"
     _description = "Quotation"
@@ -435,16 +449,11 @@ class SaleOrder(models.Model):
 
         base_u = currency.round(base_unit or 0.0)
 
-        cost_line = currency.round((base_unit or 0.0) * qty) if qty else 0.0
-
-        oh_line = currency.round(cost_line * (self.overhead_percent or 0.0) / 100.0)
-        risk_line = currency.round(cost_line * (self.risk_percent or 0.0) / 100.0)
-
-        buffer_line = currency.round(cost_line + oh_line + risk_line)
-
-        profit_line = currency.round(buffer_line * (self.profit_percent or 0.0) / 100.0)
-
-        sale_line = currency.round(buffer_line + profit_line)
+        cost_line, oh_line, risk_line, buffer_line, profit_line, sale_line = _costing_line_amounts(
+            base_unit or 0.0, qty,
+            self.overhead_percent or 0.0, self.risk_percent or 0.0, self.profit_percent or 0.0,
+            currency.round,
+        )
 
         unit_sale = sale_line / qty if qty else 0.0
 
@@ -463,62 +472,77 @@ class SaleOrder(models.Model):
             "buffer_line": buffer_line,
         }
 
-    def _costing_compute_totals(self):
+    def _costing_read_columns(self):
+        """Costing lines of the order with their cost, qty, discount and subtotal columns."""
+        self.ensure_one()
+        lines = self._iter_costing_lines()
+        return {
+            "lines": lines,
+            "costs": lines.mapped("cost_price_unit"),
+            "quantities": lines.mapped("product_uom_qty"),
+            "discounts": lines.mapped("discount"),
+            "subtotals": lines.mapped("price_subtotal"),
+        }
+
+    def _costing_kernel(self, columns=None, percents=None):
+        """
+        Cost every costing line of the order in a single pass.
+        The line columns are read once, then the overhead, risk, profit, discount
+        and VAT math runs over them with the currency rounding of
+        ``_costing_line_breakdown``. ``columns`` and ``percents`` allow to run
+        several scenarios over the same columns. Returns the lines, their sale
+        totals (same order) and the order totals.
+        """
         self.ensure_one()
         currency = self.currency_id or self.company_id.currency_id
-        rounding_method = self.company_id.tax_calculation_rounding_method  # 'round_globally' / 'round_per_line'
+        round_ = partial(float_round, precision_rounding=currency.rounding)
+        round_per_line = self.company_id.tax_calculation_rounding_method == "round_per_line"
         vat_rate = 0.15
+        percents = percents or {}
+        oh_percent = percents.get("overhead_percent", self.overhead_percent) or 0.0
+        risk_percent = percents.get("risk_percent", self.risk_percent) or 0.0
+        profit_percent = percents.get("profit_percent", self.profit_percent) or 0.0
+
+        columns = columns or self._costing_read_columns()
+        lines = columns["lines"]
+        costs, quantities = columns["costs"], columns["quantities"]
+        discounts, subtotals = columns["discounts"], columns["subtotals"]
 
         base_total = oh_total = risk_total = profit_total = gross_sale = 0.0
-        vat_total = 0.0
+        vat_total = discount_total = 0.0
+        line_totals = []
 
-        for line in self._iter_costing_lines():
-            b = self._costing_line_breakdown(
-                base_unit=line.cost_price_unit or 0.0,
-                qty=line.product_uom_qty or 0.0,
-                currency=currency,
+        for cost, qty, discount, subtotal in zip(costs, quantities, discounts, subtotals):
+            cost_line, oh_line, risk_line, _buffer, profit_line, sale_line = _costing_line_amounts(
+                cost or 0.0, qty or 0.0, oh_percent, risk_percent, profit_percent, round_,
             )
+            line_totals.append(sale_line)
 
-            base_total += b["base_line"]
-            oh_total += b["oh_line"]
-            risk_total += b["risk_line"]
-            profit_total += b["profit_line"]
-
-            line_gross = b["total_line"]  # sale_line (truth)
-            gross_sale += line_gross
-
-            if rounding_method == "round_per_line":
-                disc = (line.discount or 0.0) / 100.0
-                line_net = currency.round(line_gross * (1.0 - disc))
-                vat_total += currency.round(line_net * vat_rate)
-
-        buffer_total_no_vat = currency.round(base_total + oh_total + risk_total)
-        profit_total = currency.round(profit_total)
-        gross_sale = currency.round(gross_sale)
-
-        discount_total = 0.0
-        for line in self._iter_costing_lines():
-            line_gross = self._costing_line_breakdown(
-                base_unit=line.cost_price_unit or 0.0,
-                qty=line.product_uom_qty or 0.0,
-                currency=currency,
-            )["total_line"]
-            disc = (line.discount or 0.0) / 100.0
-            if disc:
-                discount_total += currency.round(line_gross * disc)
-
-        for line in self.order_line.filtered(lambda l: not l.display_type and not l.is_downpayment):
-            if (line.price_subtotal or 0.0) < 0:
-                discount_total += currency.round(-(line.price_subtotal or 0.0))
-
-        discount_total = currency.round(discount_total)
+            base_total += cost_line
+            oh_total += oh_line
+            risk_total += risk_line
+            profit_total += profit_line
+            gross_sale += sale_line
 
-        net_sale = currency.round(gross_sale - discount_total)
-        if rounding_method != "round_per_line":
-            vat_total = currency.round(net_sale * vat_rate)
-
-        final_total = currency.round(net_sale + vat_total)
-        return {
+            disc = (discount or 0.0) / 100.0
+            if disc:
+                discount_total += round_(sale_line * disc)
+            if round_per_line:
+                vat_total += round_(round_(sale_line * (1.0 - disc)) * vat_rate)
+            if (subtotal or 0.0) < 0:
+                discount_total += round_(-subtotal)
+
+        buffer_total_no_vat = round_(base_total + oh_total + risk_total)
+        profit_total = round_(profit_total)
+        gross_sale = round_(gross_sale)
+        discount_total = round_(discount_total)
+
+        net_sale = round_(gross_sale - discount_total)
+        if not round_per_line:
+            vat_total = round_(net_sale * vat_rate)
+
+        final_total = round_(net_sale + vat_total)
+        totals = {
             "currency": currency,
             "base_total": base_total,
             "oh_total": oh_total,
@@ -531,6 +555,42 @@ class SaleOrder(models.Model):
             "vat_total": vat_total,
             "final_total": final_total,
         }
+        return lines, line_totals, totals
+
+    def _costing_compute_totals(self):
+        self.ensure_one()
+        return self._costing_kernel()[2]
+
+    def costing_scenarios(self, scenarios):
+        """
+        What-if costing of the order, nothing is written.
+        ``scenarios`` is a list of dicts with any of ``overhead_percent``,
+        ``risk_percent`` and ``profit_percent``; missing keys keep the order's
+        value. Returns the costing totals of each scenario, in the same order.
+        """
+        self.ensure_one()
+        scenarios = [self._costing_check_scenario(scenario) for scenario in scenarios]
+        columns = self._costing_read_columns()
+        results = []
+        for scenario in scenarios:
+            totals = self._costing_kernel(columns=columns, percents=scenario)[2]
+            totals["currency"] = totals["currency"].id
+            results.append(dict(scenario, **totals))
+        return results
+
+    @api.model
+    def _costing_check_scenario(self, scenario):
+        percents = {}
+        for field_name in ("overhead_percent", "risk_percent", "profit_percent"):
+            if field_name not in scenario:
+                continue
+            value = scenario[field_name] or 0.0
+            if value < 0:
+                raise UserError(_("Percentage cannot be negative."))
+            if value > 100:
+                raise UserError(_("Percentage cannot exceed 100%."))
+            percents[field_name] = float(value)
+        return percents
 
     @api.depends(
         "order_line.display_type",
@@ -164,10 +164,10 @@ class SaleOrderLine(models.Model):
             line.section_subtotal_display = False
 
         for order in self.mapped("order_id"):
-            currency = order.currency_id or order.company_id.currency_id
-
             subtotal = 0.0
             current_section = None
+            costing_lines, line_totals, _totals = order._costing_kernel()
+            sale_totals = dict(zip(costing_lines, line_totals))
 
             ordered_lines = order.order_line.sorted(key=lambda l: (l.sequence or 0, l.id or 0))
             for line in ordered_lines:
@@ -184,12 +184,7 @@ class SaleOrderLine(models.Model):
                     continue
 
                 # Costing subtotal (same as PDF)
-                breakdown = order._costing_line_breakdown(
-                    base_unit=line.cost_price_unit or 0.0,  # ✅ use COST as base
-                    qty=line.product_uom_qty or 0.0,
-                    currency=currency,
-                )
-                subtotal += breakdown["total_line"]
+                subtotal += sale_totals.get(line, 0.0)
 
             if current_section:
                 current_section._set_section_subtotal_values(subtotal, label)
@@ -0,0 +1,66 @@
+"""
+Benchmark of the work order generation from a large estimation.
+
+Run it from an Odoo shell on a database with petroraq_sale_workflow installed:
+
+    odoo-bin shell -d <database> < petroraq_sale_workflow/scripts/benchmark_work_order.py
+
+A synthetic estimation of ``LINE_COUNT`` lines is created, its quotation and
+work order are generated, and everything is rolled back at the end.
+"""
+import time
+
+LINE_COUNT = 5000
+
+
+def run(env, line_count=LINE_COUNT):
+    cr = env.cr
+    cr.execute("SAVEPOINT benchmark_work_order")
+    try:
+        partner = env["res.partner"].create({"name": "Benchmark Customer"})
+        products = env["product.product"].create([{
+            "name": f"Benchmark Product {index}",
+            "standard_price": 10.0 + index,
+        } for index in range(50)])
+        section_types = ["material", "labor", "equipment", "subcontract"]
+        estimation = env["petroraq.estimation"].create({
+            "partner_id": partner.id,
+            "overhead_percent": 10.0,
+            "risk_percent": 5.0,
+            "profit_percent": 8.0,
+        })
+
+        start = time.perf_counter()
+        env["petroraq.estimation.line"].create([{
+            "estimation_id": estimation.id,
+            "section_type": section_types[index % 4],
+            "product_id": products[index % 50].id,
+            "name": f"Benchmark line {index}",
+            "quantity": 1.0 + index % 7,
+            "resource_count": 1.0,
+            "days": 1.0 + index % 3,
+            "unit_cost": 10.0 + index % 13,
+        } for index in range(line_count)])
+        env.flush_all()
+        lines_time = time.perf_counter() - start
+
+        order = estimation._ensure_sale_order()
+        env.flush_all()
+
+        queries = cr.sql_log_count
+        start = time.perf_counter()
+        work_order = estimation._create_work_order(order)
+        env.flush_all()
+        work_order_time = time.perf_counter() - start
+        queries = cr.sql_log_count - queries
+
+        print(f"estimation lines : {line_count} in {lines_time:.2f}s")
+        print(f"work order       : {len(work_order.boq_line_ids)} BOQ lines, "
+              f"{len(work_order.cost_center_ids)} cost centers in {work_order_time:.2f}s, {queries} queries")
+    finally:
+        cr.execute("ROLLBACK TO SAVEPOINT benchmark_work_order")
+        env.invalidate_all()
+
+
+if "env" in globals():
+    run(env)  # noqa: F821
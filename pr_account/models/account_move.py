@@ -3,6 +3,9 @@ from odoo.exceptions import UserError
 import requests
 import json
 
+# Voucher links of the journal entries, filled by _compute_pr_vouchers.
+PR_VOUCHER_FIELDS = ("bpv_id", "cpv_id", "brv_id", "crv_id")
+
 
 class AccountMove(models.Model):
     # region [Initial]
@@ -146,22 +149,26 @@ class AccountMove(models.Model):
         return journal
 
     def _compute_pr_vouchers(self):
-        BankPayment = self.env["pr.account.bank.payment"]
-        CashPayment = self.env["pr.account.cash.payment"]
-        BankReceipt = self.env["pr.account.bank.receipt"]
-        CashReceipt = self.env["pr.account.cash.receipt"]
-        # JournalVoucher = self.env["pr.account.journal.voucher"]
+        # One grouped query per voucher model for the whole recordset instead of
+        # four searches per move.
+        move_ids = [move_id for move_id in self.ids if move_id]
+        voucher_by_move = {}
+        for field_name in PR_VOUCHER_FIELDS:
+            Voucher = self.env[self._fields[field_name].comodel_name]
+            voucher_by_move[field_name] = dict(Voucher._read_group(
+                [("journal_entry_id", "in", move_ids)],
+                ["journal_entry_id"],
+                ["id:min"],
+            )) if move_ids else {}
 
         for move in self:
-            move.bpv_id = BankPayment.search([("journal_entry_id", "=", move.id)], limit=1)
-            move.cpv_id = CashPayment.search([("journal_entry_id", "=", move.id)], limit=1)
-            move.brv_id = BankReceipt.search([("journal_entry_id", "=", move.id)], limit=1)
-            move.crv_id = CashReceipt.search([("journal_entry_id", "=", move.id)], limit=1)
-            # move.jv_id = JournalVoucher.search([("journal_entry_id", "=", move.id)], limit=1)
-
-            move.has_pr_voucher = bool(
-                move.bpv_id or move.cpv_id or move.brv_id or move.crv_id
-            )
+            has_pr_voucher = False
+            for field_name in PR_VOUCHER_FIELDS:
+                voucher = self.env[self._fields[field_name].comodel_name].browse(
+                    voucher_by_move[field_name].get(move._origin))
+                move[field_name] = voucher
+                has_pr_voucher = has_pr_voucher or bool(voucher)
+            move.has_pr_voucher = has_pr_voucher
 
     def get_attachments_data(self):
         for move in self:
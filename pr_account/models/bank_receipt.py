@@ -8,7 +8,7 @@ from odoo.exceptions import ValidationError
 class AccountBankReceipt(models.Model):
     # region [Initial]
     _name = 'pr.account.bank.receipt'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'pr.voucher.posting.mixin']
     _description = 'Bank Receipt'
     _order = "id"
     _rec_name = 'name'
@@ -52,7 +52,8 @@ class AccountBankReceipt(models.Model):
     bank_receipt_line_ids = fields.One2many("pr.account.bank.receipt.line", "bank_receipt_id",
                                             string="Bank Receipt Lines")
     total_amount = fields.Float(string="Amount", compute="_compute_total_amount", store=True, tracking=True)
-    journal_entry_id = fields.Many2one("account.move", string="Journal Entry", readonly=True, tracking=True)
+    journal_entry_id = fields.Many2one("account.move", string="Journal Entry", readonly=True, tracking=True,
+                                       index="btree_not_null")
 
     @api.constrains("bank_receipt_line_ids")
     def _check_positive_amount_line(self):
@@ -96,9 +97,7 @@ class AccountBankReceipt(models.Model):
 
     def make_all_draft(self):
         bank_receipt_ids = self.env["pr.account.bank.receipt"].sudo().search([("id", "!=", False)])
-        if bank_receipt_ids:
-            for rec in bank_receipt_ids:
-                rec.sudo().action_post()
+        bank_receipt_ids.action_post()
 
     def action_draft(self):
         for bank_receipt in self:
@@ -112,29 +111,27 @@ class AccountBankReceipt(models.Model):
             bank_payment.state = "submit"
 
     def action_post(self):
-        for bank_receipt in self:
-            if bank_receipt.bank_receipt_line_ids:
-                journal_entry_id = self.env['account.move'].create({
-                    # 'name': bank_receipt.name,
-                    'ref': bank_receipt.name,
-                    'date': bank_receipt.accounting_date,
-                    'move_type': 'entry',
-                })
-                if journal_entry_id:
-                    journal_entry_id = journal_entry_id.with_context(check_move_validity=False)
-                    move_line = self.env['account.move.line'].with_context(check_move_validity=False,
-                                                                           skip_invoice_sync=True)
-                    line_ids = [
-                        move_line.create(bank_receipt.prepare_debit_move_line_vals(move_id=journal_entry_id))
-                    ]
-                    for line in bank_receipt.bank_receipt_line_ids:
-                        line_ids.append(move_line.create(line.prepare_credit_move_line_vals(move_id=journal_entry_id)))
-                        if line.tax_id:
-                            line_ids.append(
-                                move_line.create(line.prepare_credit_tax_move_line_vals(move_id=journal_entry_id)))
-                    journal_entry_id.action_post()
-                    bank_receipt.journal_entry_id = journal_entry_id.id
-            bank_receipt.state = "posted"
+        self._post_journal_entries()
+        self.write({"state": "posted"})
+
+    def _prepare_journal_entry_vals(self):
+        self.ensure_one()
+        if not self.bank_receipt_line_ids:
+            return False
+        return {
+            'ref': self.name,
+            'date': self.accounting_date,
+            'move_type': 'entry',
+        }
+
+    def _prepare_journal_entry_line_vals_list(self):
+        self.ensure_one()
+        line_vals_list = [self.prepare_debit_move_line_vals()]
+        for line in self.bank_receipt_line_ids:
+            line_vals_list.append(line.prepare_credit_move_line_vals())
+            if line.tax_id:
+                line_vals_list.append(line.prepare_credit_tax_move_line_vals())
+        return line_vals_list
 
     def action_cancel(self):
         for bank_receipt in self:
@@ -8,7 +8,7 @@ from odoo.exceptions import ValidationError
 class AccountCashPayment(models.Model):
     # region [Initial]
     _name = 'pr.account.cash.payment'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'pr.voucher.posting.mixin']
     _description = 'Cash Payment'
     _order = "id"
     _rec_name = 'name'
@@ -64,7 +64,8 @@ class AccountCashPayment(models.Model):
                                    tracking=True)
     rejected_amount = fields.Float(string="Rejected Amount", compute="_compute_rejected_amount", store=True,
                                    tracking=True)
-    journal_entry_id = fields.Many2one("account.move", string="Journal Entry", readonly=True, tracking=True)
+    journal_entry_id = fields.Many2one("account.move", string="Journal Entry", readonly=True, tracking=True,
+                                       index="btree_not_null")
     check_process_state = fields.Boolean(compute="_compute_check_process_state")
 
     @api.constrains("company_id")
@@ -134,9 +135,7 @@ class AccountCashPayment(models.Model):
 
     def make_all_draft(self):
         cash_payment_ids = self.env["pr.account.cash.payment"].sudo().search([("id", "!=", False)])
-        if cash_payment_ids:
-            for rec in cash_payment_ids:
-                rec.sudo().action_post()
+        cash_payment_ids.action_post()
 
     def action_draft(self):
         for cash_payment in self:
@@ -165,31 +164,27 @@ class AccountCashPayment(models.Model):
             bank_payment.accounting_manager_state = "finance_approve"
 
     def action_post(self):
-        for cash_payment in self:
-            if cash_payment.cash_payment_line_ids:
-                journal_entry_id = self.env['account.move'].create({
-                    # 'name': cash_payment.name,
-                    'ref': cash_payment.name,
-                    'date': cash_payment.accounting_date,
-                    'move_type': 'entry',
-                })
-                if journal_entry_id:
-                    journal_entry_id = journal_entry_id.with_context(check_move_validity=False)
-                    move_line = self.env['account.move.line'].with_context(check_move_validity=False,
-                                                                           skip_invoice_sync=True)
-                    line_ids = [
-                        move_line.create(cash_payment.prepare_credit_move_line_vals(move_id=journal_entry_id))
-                    ]
-                    for line in cash_payment.cash_payment_line_ids.filtered(lambda l: l.state == "approve"):
-                        # for line in cash_payment.cash_payment_line_ids:
-                        line_ids.append(move_line.create(line.prepare_debit_move_line_vals(move_id=journal_entry_id)))
-                        if line.tax_id:
-                            line_ids.append(
-                                move_line.create(line.prepare_debit_tax_move_line_vals(move_id=journal_entry_id)))
-                    journal_entry_id.action_post()
-                    cash_payment.journal_entry_id = journal_entry_id.id
-            cash_payment.state = "posted"
-            cash_payment.accounting_manager_state = "posted"
+        self._post_journal_entries()
+        self.write({"state": "posted", "accounting_manager_state": "posted"})
+
+    def _prepare_journal_entry_vals(self):
+        self.ensure_one()
+        if not self.cash_payment_line_ids:
+            return False
+        return {
+            'ref': self.name,
+            'date': self.accounting_date,
+            'move_type': 'entry',
+        }
+
+    def _prepare_journal_entry_line_vals_list(self):
+        self.ensure_one()
+        line_vals_list = [self.prepare_credit_move_line_vals()]
+        for line in self.cash_payment_line_ids.filtered(lambda l: l.state == "approve"):
+            line_vals_list.append(line.prepare_debit_move_line_vals())
+            if line.tax_id:
+                line_vals_list.append(line.prepare_debit_tax_move_line_vals())
+        return line_vals_list
 
     def action_cancel(self):
         for cash_payment in self:
@@ -8,7 +8,7 @@ from odoo.exceptions import ValidationError
 class AccountCashReceipt(models.Model):
     # region [Initial]
     _name = 'pr.account.cash.receipt'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'pr.voucher.posting.mixin']
     _description = 'Cash Receipt'
     _order = "id"
     _rec_name = 'name'
@@ -52,7 +52,8 @@ class AccountCashReceipt(models.Model):
     cash_receipt_line_ids = fields.One2many("pr.account.cash.receipt.line", "cash_receipt_id",
                                             string="Cash Receipt Lines")
     total_amount = fields.Float(string="Amount", compute="_compute_total_amount", store=True, tracking=True)
-    journal_entry_id = fields.Many2one("account.move", string="Journal Entry", readonly=True, tracking=True)
+    journal_entry_id = fields.Many2one("account.move", string="Journal Entry", readonly=True, tracking=True,
+                                       index="btree_not_null")
     check_process_state = fields.Boolean(compute="_compute_check_process_state")
 
     @api.constrains("cash_receipt_line_ids")
@@ -93,9 +94,7 @@ class AccountCashReceipt(models.Model):
 
     def make_all_draft(self):
         cash_receipt_ids = self.env["pr.account.cash.receipt"].sudo().search([("id", "!=", False)])
-        if cash_receipt_ids:
-            for rec in cash_receipt_ids:
-                rec.sudo().action_post()
+        cash_receipt_ids.action_post()
 
     def action_draft(self):
         for cash_receipt in self:
@@ -109,29 +108,27 @@ class AccountCashReceipt(models.Model):
             bank_payment.state = "submit"
 
     def action_post(self):
-        for cash_receipt in self:
-            if cash_receipt.cash_receipt_line_ids:
-                journal_entry_id = self.env['account.move'].create({
-                    # 'name': cash_receipt.name,
-                    'ref': cash_receipt.name,
-                    'date': cash_receipt.accounting_date,
-                    'move_type': 'entry',
-                })
-                if journal_entry_id:
-                    journal_entry_id = journal_entry_id.with_context(check_move_validity=False)
-                    move_line = self.env['account.move.line'].with_context(check_move_validity=False,
-                                                                           skip_invoice_sync=True)
-                    line_ids = [
-                        move_line.create(cash_receipt.prepare_debit_move_line_vals(move_id=journal_entry_id))
-                    ]
-                    for line in cash_receipt.cash_receipt_line_ids:
-                        line_ids.append(move_line.create(line.prepare_credit_move_line_vals(move_id=journal_entry_id)))
-                        if line.tax_id:
-                            line_ids.append(
-                                move_line.create(line.prepare_credit_tax_move_line_vals(move_id=journal_entry_id)))
-                    journal_entry_id.action_post()
-                    cash_receipt.journal_entry_id = journal_entry_id.id
-            cash_receipt.state = "posted"
+        self._post_journal_entries()
+        self.write({"state": "posted"})
+
+    def _prepare_journal_entry_vals(self):
+        self.ensure_one()
+        if not self.cash_receipt_line_ids:
+            return False
+        return {
+            'ref': self.name,
+            'date': self.accounting_date,
+            'move_type': 'entry',
+        }
+
+    def _prepare_journal_entry_line_vals_list(self):
+        self.ensure_one()
+        line_vals_list = [self.prepare_debit_move_line_vals()]
+        for line in self.cash_receipt_line_ids:
+            line_vals_list.append(line.prepare_credit_move_line_vals())
+            if line.tax_id:
+                line_vals_list.append(line.prepare_credit_tax_move_line_vals())
+        return line_vals_list
 
     def action_cancel(self):
         for cash_receipt in self:
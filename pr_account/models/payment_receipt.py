@@ -8,7 +8,7 @@ class PaymentReceipt(models.Model):
     # region [Initial]
     _name = "pr.payment.receipt"
     _description = "Payment Receipt"
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'pr.voucher.posting.mixin']
     _order = "id"
     _rec_name = 'name'
     # endregion [Initial]
@@ -144,26 +144,25 @@ class PaymentReceipt(models.Model):
             receipt.state = "cancel"
 
     def action_post(self):
-        for receipt in self:
-            journal_entry_id = self.env['account.move'].create({
-                'name': receipt.name,
-                'ref': receipt.name,
-                'date': receipt.receipt_date,
-                'move_type': 'entry',
-            })
-            if journal_entry_id:
-                journal_entry_id = journal_entry_id.with_context(check_move_validity=False)
-                move_line = self.env['account.move.line'].with_context(check_move_validity=False,
-                                                                       skip_invoice_sync=True)
-                line_ids = [
-                    move_line.create(receipt.prepare_debit_move_line_vals(move_id=journal_entry_id)),
-                    move_line.create(receipt.prepare_credit_move_line_vals(move_id=journal_entry_id)),
-                ]
-                if receipt.tax_id:
-                    line_ids.insert(1, move_line.create(receipt.prepare_debit_tax_move_line_vals(move_id=journal_entry_id)))
-                journal_entry_id.action_post()
-                receipt.journal_entry_id = journal_entry_id.id
-            receipt.state = "posted"
+        self._post_journal_entries()
+        self.write({"state": "posted"})
+
+    def _prepare_journal_entry_vals(self):
+        self.ensure_one()
+        return {
+            'name': self.name,
+            'ref': self.name,
+            'date': self.receipt_date,
+            'move_type': 'entry',
+        }
+
+    def _prepare_journal_entry_line_vals_list(self):
+        self.ensure_one()
+        line_vals_list = [self.prepare_debit_move_line_vals()]
+        if self.tax_id:
+            line_vals_list.append(self.prepare_debit_tax_move_line_vals())
+        line_vals_list.append(self.prepare_credit_move_line_vals())
+        return line_vals_list
 
     def prepare_debit_move_line_vals(self, move_id=False):
         for receipt in self:
@@ -8,7 +8,7 @@ class TransactionPayment(models.Model):
     # region [Initial]
     _name = "pr.transaction.payment"
     _description = "Transaction Payment"
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'pr.voucher.posting.mixin']
     _order = "id"
     _rec_name = 'name'
     # endregion [Initial]
@@ -143,26 +143,25 @@ class TransactionPayment(models.Model):
             payment.state = "cancel"
 
     def action_post(self):
-        for payment in self:
-            journal_entry_id = self.env['account.move'].create({
-                'name': payment.name,
-                'ref': payment.name,
-                'date': payment.payment_date,
-                'move_type': 'entry',
-            })
-            if journal_entry_id:
-                journal_entry_id = journal_entry_id.with_context(check_move_validity=False)
-                move_line = self.env['account.move.line'].with_context(check_move_validity=False,
-                                                                       skip_invoice_sync=True)
-                line_ids = [
-                    move_line.create(payment.prepare_debit_move_line_vals(move_id=journal_entry_id)),
-                    move_line.create(payment.prepare_credit_move_line_vals(move_id=journal_entry_id)),
-                ]
-                if payment.tax_id:
-                    line_ids.insert(1, move_line.create(payment.prepare_debit_tax_move_line_vals(move_id=journal_entry_id)))
-                journal_entry_id.action_post()
-                payment.journal_entry_id = journal_entry_id.id
-            payment.state = "posted"
+        self._post_journal_entries()
+        self.write({"state": "posted"})
+
+    def _prepare_journal_entry_vals(self):
+        self.ensure_one()
+        return {
+            'name': self.name,
+            'ref': self.name,
+            'date': self.payment_date,
+            'move_type': 'entry',
+        }
+
+    def _prepare_journal_entry_line_vals_list(self):
+        self.ensure_one()
+        line_vals_list = [self.prepare_debit_move_line_vals()]
+        if self.tax_id:
+            line_vals_list.append(self.prepare_debit_tax_move_line_vals())
+        line_vals_list.append(self.prepare_credit_move_line_vals())
+        return line_vals_list
 
     def prepare_debit_move_line_vals(self, move_id=False):
         for payment in self:
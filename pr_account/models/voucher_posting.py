@@ -0,0 +1,48 @@
+from odoo import models, Command
+
+
+class PrVoucherPostingMixin(models.AbstractModel):
+    """
+    Posts the journal entries of a batch of vouchers at once.
+    Every move is built with its full ``line_ids`` command list, all of them are
+    created in one ``create`` and posted together, then every voucher is linked
+    back to its move through the ORM so tracking and ``write`` overrides apply.
+    Vouchers override the two ``_prepare_*`` hooks, by default nothing is posted.
+    """
+    _name = 'pr.voucher.posting.mixin'
+    _description = 'PR Voucher Posting'
+
+    def _prepare_journal_entry_line_vals_list(self):
+        """Values of the journal items of the voucher, in posting order."""
+        self.ensure_one()
+        return []
+
+    def _prepare_journal_entry_vals(self):
+        """Header values of the journal entry of the voucher, False when there is nothing to post."""
+        self.ensure_one()
+        return False
+
+    def _post_journal_entries(self):
+        """Create and post the journal entries of the vouchers and return them."""
+        voucher_ids = []
+        move_vals_list = []
+        for voucher in self:
+            move_vals = voucher._prepare_journal_entry_vals()
+            if not move_vals:
+                continue
+            move_vals['line_ids'] = [
+                Command.create(line_vals) for line_vals in voucher._prepare_journal_entry_line_vals_list()
+            ]
+            voucher_ids.append(voucher.id)
+            move_vals_list.append(move_vals)
+        if not move_vals_list:
+            return self.env['account.move']
+
+        moves = self.env['account.move'].with_context(
+            check_move_validity=False, skip_invoice_sync=True,
+        ).create(move_vals_list)
+        moves.action_post()
+
+        for voucher, move in zip(self.browse(voucher_ids), moves):
+            voucher.write({'journal_entry_id': move.id})
+        return moves
@@ -28,7 +28,9 @@
         'views/menus.xml',
         'views/res_partner.xml',
         'views/product_template.xml',
+        'views/translation_memory.xml',
         'data/product_sequence.xml',
+        'data/translation_memory_data.xml',
         'wizards/pr_reject_record.xml',
     ],
     # only loaded in demonstration mode
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
 
 from . import res_partner
-from . import product_template
\ No newline at end of file
+from . import product_template
+from . import translation_memory
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import logging
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+try:
+    from googletrans import Translator
+except ImportError:
+    Translator = None
+
+# texts without a translation filled per run of the background job
+FILL_BATCH_SIZE = 200
+
+
+class TranslationMemory(models.Model):
+    """
+    Persisted translations of the partner, product and label texts printed on
+    the reports. Reports look all their texts up at once with ``_lookup`` and
+    never wait on a translation service: a text missing from the memory is
+    taken from the translations stored in Odoo when there is one, otherwise it
+    is recorded as pending and translated later by the background job.
+    """
+    _name = 'pr.translation.memory'
+    _description = 'Translation Memory'
+    _order = 'id'
+    _log_access = False
+
+    digest = fields.Char(string="Digest", required=True, readonly=True)
+    lang = fields.Char(string="Language", required=True, readonly=True)
+    source = fields.Text(string="Source", required=True, readonly=True)
+    value = fields.Text(string="Translation")
+    origin = fields.Selection([
+        ('odoo', 'Odoo Translation'),
+        ('machine', 'Machine Translation'),
+        ('manual', 'Manual'),
+    ], string="Origin")
+    pending = fields.Boolean(string="Pending", default=True, index=True)
+    last_attempt = fields.Datetime(string="Last Attempt", readonly=True)
+
+    _sql_constraints = [
+        ('digest_lang_uniq', 'unique(digest, lang)', 'A text has one translation per language.'),
+    ]
+
+    @api.model
+    def _get_digest(self, text):
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def write(self, vals):
+        if 'value' in vals and 'origin' not in vals:
+            vals = dict(vals, origin='manual', pending=not vals['value'])
+        res = super().write(vals)
+        for lang in set(self.mapped('lang')):
+            self.env.cr.cache.pop((self._name, lang), None)
+        return res
+
+    # region [Lookup]
+
+    @api.model
+    def _lookup(self, texts, lang='ar_001'):
+        """
+        Return {text: translation} for ``texts`` in one query, an empty string
+        for the texts still waiting on the background job. Results are kept on
+        the cursor so the other lookups of the same print do not query again.
+        """
+        cache = self.env.cr.cache.setdefault((self._name, lang), {})
+        missing = {text for text in texts if text and text not in cache}
+        if missing:
+            digests = {self._get_digest(text): text for text in missing}
+            self.env.cr.execute(
+                "SELECT digest, value FROM pr_translation_memory WHERE lang = %s AND digest = ANY(%s)",
+                [lang, list(digests)],
+            )
+            for digest, value in self.env.cr.fetchall():
+                cache[digests.pop(digest)] = value or ''
+            if digests:
+                cache.update(self._record_missing(list(digests.values()), lang))
+        return {text: cache.get(text, '') for text in texts if text}
+
+    @api.model
+    def _translate(self, text, lang='ar_001', prefetch=None):
+        """
+        Return the translation of ``text``. When it is not known to the cursor
+        yet, the texts returned by the ``prefetch`` callable, e.g. all the texts
+        of the printed documents, are looked up along with it.
+        """
+        if not text:
+            return ''
+        cache = self.env.cr.cache.get((self._name, lang), {})
+        if text not in cache:
+            texts = set(prefetch()) if prefetch else set()
+            texts.add(text)
+            cache = self._lookup(texts, lang)
+        return cache.get(text, '')
+
+    @api.model
+    def _record_missing(self, texts, lang):
+        """
+        Store the texts unknown to the memory with their Odoo translation when
+        there is one, the others as pending for the background job.
+        """
+        translations = self._get_odoo_translations(texts, lang)
+        rows = []
+        for text in texts:
+            value = translations.get(text)
+            rows.append((self._get_digest(text), lang, text, value, value and 'odoo', not value))
+        # concurrent prints may record the same texts, the first one wins
+        self.env.cr.execute(
+            f"""
+            INSERT INTO pr_translation_memory (digest, lang, source, value, origin, pending)
+            VALUES {", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(rows))}
+            ON CONFLICT (digest, lang) DO NOTHING
+            """,
+            [value for row in rows for value in row],
+        )
+        if len(translations) < len(texts):
+            self.env.ref('pr_base.ir_cron_translation_memory_fill').sudo()._trigger()
+        return {text: translations.get(text, '') for text in texts}
+
+    @api.model
+    def _get_translation_sources(self):
+        """
+        Return the (model, field, translated field) whose stored values
+        translate the reports' texts: the jsonb translations of the field when
+        ``translated field`` is None, else the value of the other field.
+        """
+        return [
+            ('res.partner', 'name', 'arabic_name'),
+            ('res.partner', 'street', 'arabic_street'),
+            ('res.partner', 'street2', 'arabic_street2'),
+            ('product.template', 'name', None),
+            ('res.country', 'name', None),
+            ('uom.uom', 'name', None),
+        ]
+
+    @api.model
+    def _get_odoo_translations(self, texts, lang):
+        translations = {}
+        for model, field, translated_field in self._get_translation_sources():
+            remaining = [text for text in texts if text not in translations]
+            if not remaining:
+                break
+            table = self.env[model]._table
+            if translated_field:
+                query = f"""
+                    SELECT "{field}", "{translated_field}" FROM "{table}"
+                     WHERE "{field}" = ANY(%s) AND "{translated_field}" IS NOT NULL
+                """
+                params = [remaining]
+            else:
+                query = f"""
+                    SELECT "{field}"->>'en_US', "{field}"->>%s FROM "{table}"
+                     WHERE "{field}"->>'en_US' = ANY(%s) AND "{field}" ? %s
+                """
+                params = [lang, remaining, lang]
+            self.env.cr.execute(query, params)
+            for text, value in self.env.cr.fetchall():
+                if value and value != text:
+                    translations.setdefault(text, value)
+        return translations
+
+    # endregion [Lookup]
+
+    # region [Background Fill]
+
+    @api.model
+    def _cron_fill_pending(self, batch_size=FILL_BATCH_SIZE):
+        """
+        Translate the pending texts, from Odoo translations first and the
+        translation service after. The texts never attempted come first, then
+        the ones attempted the longest ago, so the texts nothing can translate
+        do not hold the queue.
+        """
+        pending = self.search(
+            [('pending', '=', True)], order='last_attempt asc nulls first, id', limit=batch_size)
+        if not pending:
+            return
+        untried = pending.filtered(lambda entry: not entry.last_attempt)
+        now = self.env.cr.now()
+        failed = self.browse()
+        for lang, entries in pending.grouped('lang').items():
+            translations = self._get_odoo_translations(entries.mapped('source'), lang)
+            translator = Translator() if Translator else None
+            for entry in entries:
+                value, origin = translations.get(entry.source), 'odoo'
+                if not value and translator:
+                    value, origin = self._machine_translate(translator, entry.source, lang), 'machine'
+                if value:
+                    entry.write({'value': value, 'origin': origin, 'pending': False, 'last_attempt': now})
+                else:
+                    failed |= entry
+        # texts nothing could translate stay pending, behind the others, for the next scheduled run
+        failed.write({'last_attempt': now})
+        if untried and len(pending) == batch_size:
+            self.env.ref('pr_base.ir_cron_translation_memory_fill').sudo()._trigger()
+
+    @api.model
+    def _machine_translate(self, translator, text, lang):
+        try:
+            translation = translator.translate(text, dest=lang.split('_')[0])
+        except Exception as e:
+            _logger.warning("Error in translating %r: %s", text, e)
+            return ''
+        return getattr(translation, 'text', '') or ''
+
+    # endregion [Background Fill]
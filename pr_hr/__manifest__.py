@@ -28,6 +28,7 @@
         'security/hr_security.xml',
         'data/data.xml',
         'data/res_country_data.xml',
+        'data/hr_expiry_index_data.xml',
         'views/menu_items.xml',
         'views/hr_job.xml',
         'views/hr_department.xml',
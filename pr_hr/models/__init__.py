@@ -4,9 +4,11 @@ from . import hr_department_subrule
 from . import hr_department
 from . import hr_job
 from . import hr_employee
+from . import hr_expiry_index
 from . import hr_employee_iqama
 from . import hr_employee_medical_insurance
 from . import res_country
 from . import res_company
 from . import res_config_settings
 from . import res_groups
+from . import hr_notification_dispatcher
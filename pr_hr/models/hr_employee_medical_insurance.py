@@ -5,6 +5,9 @@ from odoo.exceptions import UserError, ValidationError
 from hijri_converter import Gregorian
 from datetime import date
 from dateutil.relativedelta import relativedelta
+from datetime import timedelta
+
+from .hr_expiry_index import EXPIRY_ALERT_DAYS
 
 
 class HREmployeeMedicalInsurance(models.Model):
@@ -15,8 +18,9 @@ class HREmployeeMedicalInsurance(models.Model):
     # region [Initial]
     _name = 'hr.employee.medical.insurance'
     _description = 'Employee Medical Insurance'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'pr.hr.expiry.mixin']
     _order = "id"
+    _expiry_index_fields = ('expiry_date', 'active', 'employee_id', 'name')
     # endregion [Initial]
 
     # region [Fields]
@@ -42,6 +46,11 @@ class HREmployeeMedicalInsurance(models.Model):
 
     # region [Methods]
 
+    def _get_expiry_index_entries(self):
+        if not self.active or not self.expiry_date:
+            return []
+        return [('medical_insurance', self.expiry_date - timedelta(days=EXPIRY_ALERT_DAYS), self.expiry_date)]
+
     @api.constrains("identification_id")
     def _check_identification_id(self):
         for employee in self:
@@ -0,0 +1,238 @@
+from datetime import timedelta
+
+from markupsafe import Markup
+
+from odoo import api, fields, models, tools, _
+
+WATERMARK_PARAM = "pr_hr.expiry_digest_watermark"
+# days before their expiry the iqamas and medical insurances are reported
+EXPIRY_ALERT_DAYS = 30
+
+EXPIRY_DIGEST_BODY = """
+    Dear {recipient_name},<br/><br/>
+
+    The following documents reached their alert date:<br/>
+    <ul>{items}</ul><br/>
+
+    Thank you for your attention to this matter.<br/><br/>
+    Best regards,<br/>
+    <strong>HR Department</strong><br/>
+    Petroraq Engineering
+    """
+
+
+class HrExpiryIndex(models.Model):
+    """
+    One row per alert of an expiring HR document (iqama, medical insurance,
+    contract periods, work permits), kept up to date by the documents through
+    pr.hr.expiry.mixin. The daily digest reads the rows whose report date fell
+    since its last run with one range scan on (date, expiry_type). The report
+    date is the alert date of the document, or the next digest when the alert
+    date already passed while the document has not expired yet.
+    """
+    # region [Initial]
+    _name = 'pr.hr.expiry.index'
+    _description = 'HR Expiry Index'
+    _order = 'date, expiry_type, id'
+    _log_access = False
+    # endregion [Initial]
+
+    # region [Fields]
+    expiry_type = fields.Selection([
+        ('iqama', 'Iqama Expiry'),
+        ('medical_insurance', 'Medical Insurance Expiry'),
+    ], string="Expiry Type", required=True)
+    date = fields.Date(string="Report Date", required=True)
+    alert_date = fields.Date(string="Alert Date")
+    expiry_date = fields.Date(string="Expiry Date")
+    res_model = fields.Char(string="Document Model", required=True)
+    res_id = fields.Many2oneReference(string="Document", model_field='res_model', required=True)
+    name = fields.Char(string="Document Name")
+    employee_id = fields.Many2one('hr.employee', string="Employee", ondelete='cascade')
+
+    _sql_constraints = [
+        ('document_type_uniq', 'unique(res_model, res_id, expiry_type)',
+         'A document has one alert per expiry type.'),
+    ]
+    # endregion [Fields]
+
+    def init(self):
+        tools.create_index(self._cr, 'pr_hr_expiry_index_date_type_idx',
+                           self._table, ['date', 'expiry_type'])
+        tools.create_index(self._cr, 'pr_hr_expiry_index_document_idx',
+                           self._table, ['res_model', 'res_id'])
+
+    # region [Expiry Types]
+
+    @api.model
+    def _get_expiry_types(self):
+        """
+        Recipients of the digest per expiry type: the users of ``groups``, the
+        fixed ``emails``, and the department manager and employee of the
+        document when ``notify_manager`` or ``notify_employee`` are set.
+        """
+        return {
+            'iqama': {'groups': ['hr.group_hr_manager']},
+            'medical_insurance': {'groups': ['hr.group_hr_manager']},
+        }
+
+    # endregion [Expiry Types]
+
+    # region [Digest]
+
+    @api.model
+    def _get_watermark(self):
+        watermark = self.env['ir.config_parameter'].sudo().get_param(WATERMARK_PARAM)
+        if watermark:
+            return fields.Date.to_date(watermark)
+        return fields.Date.today() - timedelta(days=1)
+
+    @api.model
+    def _cron_send_digests(self):
+        """
+        Queue one digest per recipient with the alerts dated after the
+        watermark and up to today, so the days the cron missed are caught up,
+        then move the watermark to today.
+        """
+        today = fields.Date.today()
+        watermark = self._get_watermark()
+        if watermark >= today:
+            return self.env['mail.mail']
+        entries = self.sudo().search([('date', '>', watermark), ('date', '<=', today)])
+        mails = self._queue_digests(entries)
+        self.env['ir.config_parameter'].sudo().set_param(WATERMARK_PARAM, fields.Date.to_string(today))
+        return mails
+
+    @api.model
+    def _get_digest_recipients(self, entries):
+        """Return {email: (name, entries)} of the digests to send."""
+        dispatcher = self.env['pr.hr.notification.dispatcher']
+        expiry_types = self._get_expiry_types()
+        group_recipients = {}
+        digests = {}
+        for entry in entries:
+            config = expiry_types.get(entry.expiry_type, {})
+            recipients = []
+            groups = tuple(config.get('groups', ()))
+            if groups:
+                if groups not in group_recipients:
+                    group_recipients[groups] = [
+                        (email, employee.name) for employee, email in dispatcher._get_group_recipients(groups)]
+                recipients += group_recipients[groups]
+            recipients += [(email, email) for email in config.get('emails', ())]
+            employee = entry.employee_id
+            manager = employee.department_id.manager_id
+            if config.get('notify_manager') and manager.work_email:
+                recipients.append((manager.work_email, manager.name))
+            if config.get('notify_employee') and employee.work_email:
+                recipients.append((employee.work_email, employee.name))
+            for email, name in recipients:
+                name, entry_ids = digests.setdefault(email.strip().lower(), (name, []))
+                if not entry_ids or entry_ids[-1] != entry.id:
+                    entry_ids.append(entry.id)
+        return {email: (name, self.browse(entry_ids)) for email, (name, entry_ids) in digests.items()}
+
+    @api.model
+    def _queue_digests(self, entries):
+        if not entries:
+            return self.env['mail.mail']
+        dispatcher = self.env['pr.hr.notification.dispatcher']
+        type_labels = dict(self._fields['expiry_type']._description_selection(self.env))
+        vals_list = []
+        for email, (name, recipient_entries) in self._get_digest_recipients(entries).items():
+            items = Markup().join(
+                Markup("<li>{}: {} - {} ({})</li>").format(
+                    type_labels.get(entry.expiry_type, entry.expiry_type),
+                    entry.employee_id.name or '',
+                    entry.name or '',
+                    entry.expiry_date or entry.date,
+                ) for entry in recipient_entries)
+            vals_list.append({
+                "subject": _("HR Expiry Alerts - %s", fields.Date.today()),
+                "body_html": dispatcher._render_body(EXPIRY_DIGEST_BODY, {
+                    "recipient_name": name,
+                    "items": items,
+                }),
+                "email_to": email,
+            })
+        return dispatcher.queue_mails(vals_list)
+
+    # endregion [Digest]
+
+
+class HrExpiryMixin(models.AbstractModel):
+    """
+    Documents with an expiry alert: they keep their rows of pr.hr.expiry.index
+    in sync when they are created, when one of ``_expiry_index_fields`` is
+    written and when they are deleted.
+    """
+    # region [Initial]
+    _name = 'pr.hr.expiry.mixin'
+    _description = 'HR Expiry Document'
+    _expiry_index_fields = ()
+    # endregion [Initial]
+
+    def _get_expiry_index_entries(self):
+        """Return the (expiry type, alert date, expiry date) of the alerts of the document."""
+        return []
+
+    def _sync_expiry_index(self):
+        """
+        Replace the index rows of the documents whose alert changed. The rows of
+        unchanged alerts are kept as they are so that they are not reported again.
+        """
+        index = self.env['pr.hr.expiry.index'].sudo()
+        existing = {
+            (row.res_id, row.expiry_type): row
+            for row in index.search([('res_model', '=', self._name), ('res_id', 'in', self.ids)])
+        }
+        today = fields.Date.today()
+        next_digest = max(index._get_watermark() + timedelta(days=1), today)
+        kept = index
+        vals_list = []
+        for record in self:
+            for expiry_type, alert_date, expiry_date in record._get_expiry_index_entries():
+                if not alert_date:
+                    continue
+                row = existing.get((record.id, expiry_type))
+                if row and row.alert_date == alert_date and row.expiry_date == expiry_date:
+                    kept |= row
+                    continue
+                date = alert_date
+                if alert_date < next_digest and (not expiry_date or expiry_date >= today):
+                    # entered or moved inside its alert window: reported by the next digest
+                    date = next_digest
+                vals_list.append({
+                    'expiry_type': expiry_type,
+                    'date': date,
+                    'alert_date': alert_date,
+                    'expiry_date': expiry_date,
+                    'res_model': record._name,
+                    'res_id': record.id,
+                    'name': record.display_name,
+                    'employee_id': record.employee_id.id,
+                })
+        (index.browse([row.id for row in existing.values()]) - kept).unlink()
+        return index.create(vals_list)
+
+    @api.model
+    def _rebuild_expiry_index(self):
+        """Index the existing documents, called by the data files on install and update."""
+        self.with_context(active_test=False).search([])._sync_expiry_index()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._sync_expiry_index()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if set(self._expiry_index_fields).intersection(vals):
+            self._sync_expiry_index()
+        return res
+
+    def unlink(self):
+        self.env['pr.hr.expiry.index'].sudo().search(
+            [('res_model', '=', self._name), ('res_id', 'in', self.ids)]).unlink()
+        return super().unlink()
@@ -0,0 +1,94 @@
+from markupsafe import escape
+
+from odoo import api, models
+
+DEFAULT_EMAIL_FROM = "hr@petroraq.com"
+
+
+class HrNotificationDispatcher(models.AbstractModel):
+    """
+    Shared sender of the HR approval notifications.
+    Recipients of a group are resolved with one search, bodies are rendered from
+    the caller's template and mails are only queued: the mail queue cron sends
+    them in batches over one SMTP connection instead of the approval transaction
+    waiting on the server once per recipient.
+    """
+    # region [Initial]
+    _name = 'pr.hr.notification.dispatcher'
+    _description = 'HR Notification Dispatcher'
+    # endregion [Initial]
+
+    # region [Recipients]
+
+    @api.model
+    def _get_group_recipients(self, group_xmlids):
+        """
+        Return the (employee, work email) of the users of the given groups,
+        using the first employee linked to each user like the approval mails did.
+        """
+        group_ids = [self.env.ref(xmlid).id for xmlid in group_xmlids]
+        employees = self.env["hr.employee"].sudo().search([
+            ("user_id.groups_id", "in", group_ids),
+            ("user_id.active", "=", True),
+        ])
+        recipients = []
+        seen_users = set()
+        for employee in employees:
+            if employee.user_id.id in seen_users:
+                continue
+            seen_users.add(employee.user_id.id)
+            if employee.work_email:
+                recipients.append((employee, employee.work_email))
+        return recipients
+
+    # endregion [Recipients]
+
+    # region [Rendering]
+
+    @api.model
+    def _render_body(self, template, values):
+        """
+        Fill a ``str.format`` template, escaping the values since the result is
+        sent as HTML.
+        """
+        return template.format_map({key: escape(value) for key, value in values.items()})
+
+    # endregion [Rendering]
+
+    # region [Queue]
+
+    @api.model
+    def queue_mails(self, vals_list):
+        """
+        Create the mails in one batch, dropping the ones without receiver and the
+        duplicates of the same receiver and subject, then wake the mail queue up.
+        """
+        unique_vals = {}
+        for vals in vals_list:
+            receiver = (vals.get("email_to") or "").strip().lower()
+            if not receiver:
+                continue
+            vals.setdefault("email_from", DEFAULT_EMAIL_FROM)
+            unique_vals.setdefault((receiver, vals.get("subject")), vals)
+        if not unique_vals:
+            return self.env["mail.mail"]
+        mails = self.env["mail.mail"].sudo().create(list(unique_vals.values()))
+        self.env.ref("mail.ir_cron_mail_scheduler_action").sudo()._trigger()
+        return mails
+
+    @api.model
+    def notify_groups(self, group_xmlids, template, messages):
+        """
+        Queue the mails of ``messages``, a list of (subject, values), to every
+        employee of the groups' users; ``template`` receives the values plus the
+        ``recipient_name``.
+        """
+        recipients = self._get_group_recipients(group_xmlids)
+        vals_list = [{
+            "subject": subject,
+            "body_html": self._render_body(template, dict(values, recipient_name=employee.name)),
+            "email_to": email,
+        } for subject, values in messages for employee, email in recipients]
+        return self.queue_mails(vals_list)
+
+    # endregion [Queue]
@@ -114,10 +114,14 @@ class HrAttendanceNotification(models.Model):
             notification.write({'state': 'sub'})
 
     def action_done(self):
-        for notification in self:
-            if notification.state != "sub":
-                continue
-            for sheet in notification.att_sheet_ids:
-                if sheet.state == 'confirm':
-                    sheet._send_notification()
-            notification.write({'state': 'done'})
\ No newline at end of file
+        notifications = self.filtered(lambda notification: notification.state == "sub")
+        sheets = notifications.att_sheet_ids.filtered(lambda sheet: sheet.state == 'confirm')
+        result = sheets._send_notification()
+        skipped = result['skipped']
+        for notification in notifications:
+            missing = notification.att_sheet_ids.employee_id & skipped
+            if missing:
+                notification.message_post(body=_(
+                    "Shortage notifications were not sent, no work email for: %s", ", ".join(missing.mapped('name'))))
+        notifications.write({'state': 'done'})
+        return sheets._notification_result_action(result)
\ No newline at end of file
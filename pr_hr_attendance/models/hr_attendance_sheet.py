@@ -9,10 +9,30 @@ import math
 from random import randint
 import logging
 from datetime import datetime, timedelta
-import pandas as pd
 
 _logger = logging.getLogger(__name__)
 
+SHORTAGE_NOTICE_BODY = """
+    Dear Mr/Mrs. {employee_name},<br/><br/>
+
+    We wish to inform you that a discrepancy in your recorded work hours has been identified for <strong>{date_from}</strong>. On this date, your attendance reflects a shortage of <strong>{hours} hours </strong> and <strong>{minutes} minutes.</strong><br/><br/>
+
+    Thank you for your attention to this matter.<br/><br/>
+    Best regards,<br/>
+    <strong>HR Department</strong><br/>
+    Petroraq Engineering
+    """
+ABSENCE_NOTICE_BODY = """
+    Dear Mr/Mrs. {employee_name},<br/><br/>
+
+    We wish to inform you that a discrepancy in your recorded work hours has been identified for <strong>{date_from}</strong>. On this date, your attendance reflects an absence of <strong>{no_absence} days </strong>.</strong><br/><br/>
+
+    Thank you for your attention to this matter.<br/><br/>
+    Best regards,<br/>
+    <strong>HR Department</strong><br/>
+    Petroraq Engineering
+    """
+
 
 class HrAttendanceSheet(models.Model):
     """
@@ -74,116 +94,74 @@ class HrAttendanceSheet(models.Model):
             sheet.early_check_out_minutes = sum(early_lines.mapped("early_check_out_minutes")) if early_lines else 0
         return res
 
-    def get_attendances(self):
-        res = super().get_attendances()
-        for att_sheet in self:
-            for line in att_sheet.line_ids:
-                if line.ac_sign_in:
-                    if line.pl_sign_in != 0:
-                        if line.pl_sign_in + 1 >= line.ac_sign_in >= line.pl_sign_in - 1:
-                            line.late_in = 0
-                            line.late_in_minutes = 0
-                            # pl_sign_out_custom = line.ac_sign_in + 9
-                            pl_sign_out_custom = line.ac_sign_in + (line.pl_sign_out - line.pl_sign_in)
-                            if line.ac_sign_out < pl_sign_out_custom:
-                                early_check_out = pl_sign_out_custom - line.ac_sign_out
-                                line.early_check_out = early_check_out
-                                line.early_check_out_minutes = early_check_out * 60
-                            # Compute Overtime
-                            elif line.ac_sign_out > pl_sign_out_custom and line.employee_id.add_overtime:
-                                line.act_overtime = (line.ac_sign_out - pl_sign_out_custom - 2) if (
-                                                                                                           line.ac_sign_out - pl_sign_out_custom) > 2 else 0
-                                line.overtime = (line.ac_sign_out - pl_sign_out_custom - 2) if (
-                                                                                                       line.ac_sign_out - pl_sign_out_custom) > 2 else 0
-
-                        # # Ramadan
-                        # if line.pl_sign_in >= line.ac_sign_in:
-                        #     line.late_in = 0
-                        #     line.late_in_minutes = 0
-                        #     if line.ac_sign_out < line.pl_sign_out:
-                        #         early_check_out = line.pl_sign_out - line.ac_sign_out
-                        #         line.early_check_out = early_check_out
-                        #         line.early_check_out_minutes = early_check_out * 60
-                        #     # Compute Overtime
-                        #     elif line.ac_sign_out > line.pl_sign_out and line.employee_id.add_overtime:
-                        #         line.act_overtime = line.ac_sign_out - line.pl_sign_out - 2
-                        #         line.overtime = line.ac_sign_out - line.pl_sign_out - 2
-                        # elif line.ac_sign_in > (line.pl_sign_in + 1):
-                        elif line.ac_sign_in > line.pl_sign_in + 1:
-                            line.late_in = line.ac_sign_in - (line.pl_sign_in + 1)
-                            line.late_in_minutes = (line.ac_sign_in - (line.pl_sign_in + 1)) * 60
-
-                            # Early Checkout
-                            pl_sign_out_custom = line.pl_sign_out + 1
-                            if line.ac_sign_out < pl_sign_out_custom:
-                                early_check_out = pl_sign_out_custom - line.ac_sign_out
-                                line.early_check_out = early_check_out
-                                line.early_check_out_minutes = early_check_out * 60
-                            # Compute Overtime
-                            elif line.ac_sign_out > pl_sign_out_custom and line.employee_id.add_overtime:
-                                line.act_overtime = (line.ac_sign_out - pl_sign_out_custom - 2) if (
-                                                                                                           line.ac_sign_out - pl_sign_out_custom) > 2 else 0
-                                line.overtime = (line.ac_sign_out - pl_sign_out_custom - 2) if (
-                                                                                                       line.ac_sign_out - pl_sign_out_custom) > 2 else 0
-
-
-                        #############
-                        elif line.ac_sign_in < line.pl_sign_in - 1:
-                            line.late_in = 0
-                            line.late_in_minutes = 0
-                            # pl_sign_out_custom = line.ac_sign_in + 9
-                            pl_sign_out_custom = line.pl_sign_out - 1
-                            if line.ac_sign_out < pl_sign_out_custom:
-                                early_check_out = pl_sign_out_custom - line.ac_sign_out
-                                line.early_check_out = early_check_out
-                                line.early_check_out_minutes = early_check_out * 60
-                            # Compute Overtime
-                            elif line.ac_sign_out > pl_sign_out_custom and line.employee_id.add_overtime:
-                                line.act_overtime = (line.ac_sign_out - pl_sign_out_custom - 2) if (
-                                                                                                           line.ac_sign_out - pl_sign_out_custom) > 2 else 0
-                                line.overtime = (line.ac_sign_out - pl_sign_out_custom - 2) if (
-                                                                                                       line.ac_sign_out - pl_sign_out_custom) > 2 else 0
-
-                    # Compute Overtime If Employee Work In Weekend Or In Public Holiday
-                    if line.ac_sign_in and line.pl_sign_in == 0:
-                        line.act_overtime = line.ac_sign_out - line.ac_sign_in if (
-                                                                                          line.ac_sign_out - line.ac_sign_in) > 0 else 0
-                        line.overtime = line.ac_sign_out - line.ac_sign_in if (
-                                                                                      line.ac_sign_out - line.ac_sign_in) > 0 else 0
-
-                # Check Absence Before Weekend
-                # if line.status == "weekend":
-                #     line_before_id = att_sheet.line_ids.filtered(lambda l: (l.date == line.date - relativedelta(days=1)) and l.status == "ab")
-                #     line_after_id = att_sheet.line_ids.filtered(lambda l: (l.date == line.date + relativedelta(days=1)) and l.status == "ab")
-                #     if not line_after_id:
-                #         line_after_id = att_sheet.line_ids.filtered(
-                #             lambda l: (l.date == line.date + relativedelta(days=2)) and l.status == "ab")
-                #     if line_before_id and line_after_id:
-                #         line.status = "ab"
-            # Check Leave Day Although Weekend
-            leave_ids = self.env["hr.leave"].search([
-                ("employee_id", "=", att_sheet.employee_id.id),
-                ("state", "=", "validate"),
-                ("request_date_from", "<=", att_sheet.date_to),
-                ("request_date_to", ">=", att_sheet.date_from),
-            ])
-            for leave in leave_ids:
-                # Convert the string dates to pandas datetime objects
-                # start_date = pd.to_datetime(leave.request_date_from, format="%d/%m/%Y")
-                start_date = pd.to_datetime(leave.request_date_from, dayfirst=True)
-                # end_date = pd.to_datetime(leave.request_date_to, format="%d/%m/%Y")
-                end_date = pd.to_datetime(leave.request_date_to, dayfirst=True)
-                dates_between = pd.date_range(start=start_date, end=end_date)
-
-                for date in dates_between:
-                    date_line = date.date()
-                    # if att_sheet.employee_id.id == 116:
-                    #     print(222)
-                    if date_line.weekday() not in [4, 5]:
-                        filtered_line = att_sheet.line_ids.filtered(lambda l: l.date == date_line)
-                        if filtered_line:
-                            filtered_line.status = "leave"
-        return res
+    def _prepare_attendance_line_vals(self, vals_list):
+        """
+        Apply the grace window, early check out, overtime and leave day rules
+        to the line values before they are created.
+        """
+        vals_list = super()._prepare_attendance_line_vals(vals_list)
+        add_overtime = self.employee_id.add_overtime
+        for vals in vals_list:
+            self._adjust_attendance_line_vals(vals, add_overtime)
+        # Check Leave Day Although Weekend
+        leave_dates = self._get_validated_leave_dates()
+        if leave_dates:
+            for vals in vals_list:
+                if fields.Date.to_date(vals.get("date")) in leave_dates:
+                    vals["status"] = "leave"
+        return vals_list
+
+    @api.model
+    def _adjust_attendance_line_vals(self, vals, add_overtime):
+        ac_sign_in = vals.get("ac_sign_in") or 0
+        ac_sign_out = vals.get("ac_sign_out") or 0
+        pl_sign_in = vals.get("pl_sign_in") or 0
+        pl_sign_out = vals.get("pl_sign_out") or 0
+        if not ac_sign_in:
+            return vals
+        pl_sign_out_custom = False
+        if pl_sign_in != 0:
+            if pl_sign_in + 1 >= ac_sign_in >= pl_sign_in - 1:
+                vals.update(late_in=0, late_in_minutes=0)
+                pl_sign_out_custom = ac_sign_in + (pl_sign_out - pl_sign_in)
+            elif ac_sign_in > pl_sign_in + 1:
+                late_in = ac_sign_in - (pl_sign_in + 1)
+                vals.update(late_in=late_in, late_in_minutes=late_in * 60)
+                pl_sign_out_custom = pl_sign_out + 1
+            elif ac_sign_in < pl_sign_in - 1:
+                vals.update(late_in=0, late_in_minutes=0)
+                pl_sign_out_custom = pl_sign_out - 1
+        if pl_sign_out_custom is not False:
+            if ac_sign_out < pl_sign_out_custom:
+                early_check_out = pl_sign_out_custom - ac_sign_out
+                vals.update(early_check_out=early_check_out, early_check_out_minutes=early_check_out * 60)
+            # Compute Overtime
+            elif ac_sign_out > pl_sign_out_custom and add_overtime:
+                overtime = (ac_sign_out - pl_sign_out_custom - 2) if (ac_sign_out - pl_sign_out_custom) > 2 else 0
+                vals.update(act_overtime=overtime, overtime=overtime)
+        # Compute Overtime If Employee Work In Weekend Or In Public Holiday
+        if pl_sign_in == 0:
+            overtime = ac_sign_out - ac_sign_in if (ac_sign_out - ac_sign_in) > 0 else 0
+            vals.update(act_overtime=overtime, overtime=overtime)
+        return vals
+
+    def _get_validated_leave_dates(self):
+        """Working days, Friday and Saturday excluded, of the validated leaves of the sheet employee."""
+        self.ensure_one()
+        leaves = self.env["hr.leave"].search([
+            ("employee_id", "=", self.employee_id.id),
+            ("state", "=", "validate"),
+            ("request_date_from", "<=", self.date_to),
+            ("request_date_to", ">=", self.date_from),
+        ])
+        leave_dates = set()
+        for leave in leaves:
+            day = leave.request_date_from
+            while day <= leave.request_date_to:
+                if day.weekday() not in [4, 5]:
+                    leave_dates.add(day)
+                day += timedelta(days=1)
+        return leave_dates
 
     # endregion [Compute Methods]
 
@@ -258,86 +236,79 @@ class HrAttendanceSheet(models.Model):
         worked_days_lines = overtime + late + early_co + absence + difftime
         return worked_days_lines
 
-    def _send_notification(self):
-        for sheet in self:
-            employee_id = sheet.employee_id
-            employee_email = employee_id.work_email
-            minutes = sheet.tot_late_in_minutes + sheet.early_check_out_minutes
-            total_hours = minutes // 60
-            total_minutes = minutes % 60
-            no_absence = sheet.no_absence
-            if not employee_email:
-                raise ValidationError(f"The Employee {employee_id.name} Does Not Have Email, Please Check !!")
+    def _prepare_notification_mails(self):
+        """
+        Build the shortage/absence notices of all the sheets in one pass.
+        Returns the mail values and the employees skipped for lack of email.
+        """
+        dispatcher = self.env["pr.hr.notification.dispatcher"]
+        sheets_data = self.read(['employee_id', 'date_from', 'tot_late_in_minutes', 'early_check_out_minutes',
+                                 'no_absence'], load=None)
+        employees = self.env['hr.employee'].browse({data['employee_id'] for data in sheets_data})
+        employees_data = {data['id']: data for data in employees.read(['name', 'code', 'work_email'])}
+
+        vals_list = []
+        skipped = self.env['hr.employee']
+        for data in sheets_data:
+            employee = employees_data[data['employee_id']]
+            minutes = data['tot_late_in_minutes'] + data['early_check_out_minutes']
+            no_absence = data['no_absence']
             if minutes > 0:
-                # mail_server = self.env["ir.mail_server"]
-                mail = self.env["mail.mail"]
-                try:
-                    # body_message = f"Hello {employee_id.name},\nWe Want To Inform You That: According To Your Attendance {sheet.date_from}\nWe Deduct From You {round(amount, 2)} SR\n\nThanks"
-                    body_message = f"""
-                                    Dear Mr/Mrs. {employee_id.name},<br/><br/>
-    
-    We wish to inform you that a discrepancy in your recorded work hours has been identified for <strong>{sheet.date_from}</strong>. On this date, your attendance reflects a shortage of <strong>{int(round(total_hours, 2))} hours </strong> and <strong>{int(round(total_minutes, 2))} minutes.</strong><br/><br/>
-    
-    Thank you for your attention to this matter.<br/><br/>
-    Best regards,<br/>
-    <strong>HR Department</strong><br/>
-    Petroraq Engineering
-    """
-                    receivers_emails = [employee_email]
-                    for receiver in receivers_emails:
-                        # message = mail_server.build_email(
-                        #     # email_from=self.env.company.email or self.env.user.company_id.email,
-                        #     email_from="hr@petroraq.com",
-                        #     subject=f"{employee_id.code} - Shortage Notifications Of {sheet.date_from} Attendance",
-                        #     body=body_message,
-                        #     subtype="html",
-                        #     email_to=[receiver],
-                        # )
-
-                        message = {
-                            # email_from=self.env.company.email or self.env.user.company_id.email,
-                            "email_from": "hr@petroraq.com",
-                            "subject": f"{employee_id.code} - Shortage Notifications Of {sheet.date_from} Attendance",
-                            "body_html": body_message,
-                            # "recipient_ids": [receiver],
-                            "email_to": receiver,
-                        }
-
-                        # mail_server.send_email(message)
-                        mail_id = mail.sudo().create(message)
-                        if mail_id:
-                            mail_id.sudo().send()
-                except Exception as e:
-                    _logger.error("Success email is not sent {}".format(e))
+                template = SHORTAGE_NOTICE_BODY
             elif no_absence > 0:
-                mail = self.env["mail.mail"]
-                try:
-                    # body_message = f"Hello {employee_id.name},\nWe Want To Inform You That: According To Your Attendance {sheet.date_from}\nWe Deduct From You {round(amount, 2)} SR\n\nThanks"
-                    body_message = f"""
-                                                    Dear Mr/Mrs. {employee_id.name},<br/><br/>
-
-                    We wish to inform you that a discrepancy in your recorded work hours has been identified for <strong>{sheet.date_from}</strong>. On this date, your attendance reflects an absence of <strong>{int(round(no_absence, 2))} days </strong>.</strong><br/><br/>
-
-                    Thank you for your attention to this matter.<br/><br/>
-                    Best regards,<br/>
-                    <strong>HR Department</strong><br/>
-                    Petroraq Engineering
-                    """
-                    receivers_emails = [employee_email]
-                    for receiver in receivers_emails:
-                        message = {
-                            "email_from": "hr@petroraq.com",
-                            "subject": f"{employee_id.code} - Shortage Notifications Of {sheet.date_from} Attendance",
-                            "body_html": body_message,
-                            "email_to": receiver,
-                        }
-
-                        mail_id = mail.sudo().create(message)
-                        if mail_id:
-                            mail_id.sudo().send()
-                except Exception as e:
-                    _logger.error("Success email is not sent {}".format(e))
-            self.write({'state': 'done'})
+                template = ABSENCE_NOTICE_BODY
+            else:
+                continue
+            if not employee['work_email']:
+                skipped |= employees.browse(employee['id'])
+                continue
+            body_message = dispatcher._render_body(template, {
+                "employee_name": employee['name'],
+                "date_from": data['date_from'],
+                "hours": int(round(minutes // 60, 2)),
+                "minutes": int(round(minutes % 60, 2)),
+                "no_absence": int(round(no_absence, 2)),
+            })
+            vals_list.append({
+                "email_from": "hr@petroraq.com",
+                "subject": f"{employee['code']} - Shortage Notifications Of {data['date_from']} Attendance",
+                "body_html": body_message,
+                "email_to": employee['work_email'],
+            })
+        return vals_list, skipped
+
+    def _send_notification(self):
+        """
+        Queue the shortage notices of all the sheets at once and mark them done.
+        Employees without email are reported back instead of aborting the run.
+        """
+        vals_list, skipped = self._prepare_notification_mails()
+        mails = self.env["pr.hr.notification.dispatcher"].queue_mails(vals_list)
+        self.write({'state': 'done'})
+        if skipped:
+            _logger.warning("Shortage notifications skipped, no work email for: %s", ", ".join(skipped.mapped('name')))
+        return {'queued': len(mails), 'skipped': skipped}
+
+    def action_send_notification(self):
+        result = self.filtered(lambda sheet: sheet.state == 'confirm')._send_notification()
+        return self._notification_result_action(result)
+
+    @api.model
+    def _notification_result_action(self, result):
+        message = _("%s shortage notification(s) queued.", result['queued'])
+        if result['skipped']:
+            message += " " + _("Skipped, no work email: %s", ", ".join(result['skipped'].mapped('name')))
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _("Shortage Notifications"),
+                'message': message,
+                'type': 'warning' if result['skipped'] else 'success',
+                'sticky': bool(result['skipped']),
+                'next': {'type': 'ir.actions.act_window_close'},
+            },
+        }
 
 
 class AttendanceSheetLine(models.Model):
@@ -14,6 +14,23 @@ import pandas as pd
 
 _logger = logging.getLogger(__name__)
 
+SHORTAGE_REQUEST_BODY = """Dear Mr/Mrs. {recipient_name},<br/><br/>
+
+    We wish to inform you that your employee {employee_name} has been asked for <strong>Shortage Request For {date}</strong>.<br/><br/>
+    You can check the request to take a decision by clicking this button <a class="btn btn-primary" href="{record_url}" role="button">Shortage Request</a><br/><br/><br/>
+    Thank you for your attention to this matter.<br/><br/>
+    Best regards,<br/>
+    <strong>HR Department</strong><br/>
+    Petroraq Engineering
+    """
+SHORTAGE_RESULT_BODY = """Dear Mr/Mrs. {recipient_name},<br/><br/>
+
+    We wish to inform you that your Shortage Request {name} has been <strong>{result}</strong>.<br/><br/>
+    Thank you for your attention to this matter.<br/><br/>
+    Best regards,<br/>
+    <strong>HR Department</strong><br/>
+    Petroraq Engineering
+    """
 
 class HrShortageRequest(models.Model):
     """
@@ -104,108 +121,61 @@ class HrShortageRequest(models.Model):
 
     # region [Emails]
 
+    def _get_email_subject(self):
+        self.ensure_one()
+        return f"{self.employee_id.code} - Shortage Request For {self.date}"
+
     def _prepare_email_vals(self, body_message, receiver):
         for rec in self:
             message = {
                 "email_from": "hr@petroraq.com",
-                "subject": f"{rec.employee_id.code} - Shortage Request For {rec.date}",
+                "subject": rec._get_email_subject(),
                 "body_html": body_message,
                 "email_to": receiver,
             }
             return message
 
+    def _get_email_values(self):
+        self.ensure_one()
+        base_url = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
+        return {
+            "name": self.name,
+            "employee_name": self.employee_id.name,
+            "date": self.date,
+            "record_url": base_url + "/web#id=" + str(
+                self.id) + "&view_type=form&model=pr.hr.shortage.request&view_type=form",
+        }
+
+    def _notify_groups(self, group_xmlids, template):
+        messages = [(rec._get_email_subject(), rec._get_email_values()) for rec in self]
+        self.env["pr.hr.notification.dispatcher"].notify_groups(group_xmlids, template, messages)
+
     def _send_manager_email(self):
+        dispatcher = self.env["pr.hr.notification.dispatcher"]
+        vals_list = []
         for rec in self:
-            base_url = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
-            record_url = base_url + "/web#id=" + str(rec.id) + "&view_type=form&model=pr.hr.shortage.request&view_type=form"
-
-            body_message = f"""Dear Mr/Mrs. {rec.employee_id.parent_id.name},<br/><br/>
-
-                We wish to inform you that your employee {rec.employee_id.name} has been asked for <strong>Shortage Request For {rec.date}</strong>.<br/><br/>
-                You can check the request to take a decision by clicking this button <a class="btn btn-primary" href="{record_url}" role="button">Shortage Request</a><br/><br/><br/>
-                Thank you for your attention to this matter.<br/><br/>
-                Best regards,<br/>
-                <strong>HR Department</strong><br/>
-                Petroraq Engineering
-                """
+            values = dict(rec._get_email_values(), recipient_name=rec.employee_id.parent_id.name)
+            body_message = dispatcher._render_body(SHORTAGE_REQUEST_BODY, values)
             receiver = rec.employee_id.parent_id.work_email
-            mail = self.env["mail.mail"]
-            mail_id = mail.sudo().create(rec._prepare_email_vals(body_message=body_message, receiver=receiver))
-            if mail_id:
-                mail_id.sudo().send()
+            vals_list.append(rec._prepare_email_vals(body_message=body_message, receiver=receiver))
+        dispatcher.queue_mails(vals_list)
 
     def _send_hr_supervisor_email(self):
-        for rec in self:
-            base_url = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
-            record_url = base_url + "/web#id=" + str(
-                rec.id) + "&view_type=form&model=pr.hr.shortage.request&view_type=form"
-
-            # group_ids = [self.env.ref('hr_attendance.group_hr_attendance_officer').id]
-            group_ids = [self.env.ref('pr_hr_attendance.custom_group_hr_attendance_supervisor').id]
-            user_ids = self.env['res.users'].sudo().search([('groups_id', 'in', group_ids)])
-            if user_ids:
-                for user in user_ids:
-                    employee_id = self.env["hr.employee"].sudo().search([("user_id", "=", user.id)], limit=1)
-                    if employee_id and employee_id.work_email:
-                        body_message = f"""Dear Mr/Mrs. {employee_id.name},<br/><br/>
-
-                            We wish to inform you that your employee {rec.employee_id.name} has been asked for <strong>Shortage Request For {rec.date}</strong>.<br/><br/>
-                            You can check the request to take a decision by clicking this button <a class="btn btn-primary" href="{record_url}" role="button">Shortage Request</a><br/><br/><br/>
-                            Thank you for your attention to this matter.<br/><br/>
-                            Best regards,<br/>
-                            <strong>HR Department</strong><br/>
-                            Petroraq Engineering
-                            """
-                        receiver = employee_id.work_email
-                        mail = self.env["mail.mail"]
-                        mail_id = mail.sudo().create(
-                            rec._prepare_email_vals(body_message=body_message, receiver=receiver))
-                        if mail_id:
-                            mail_id.sudo().send()
+        # self._notify_groups(['hr_attendance.group_hr_attendance_officer'], SHORTAGE_REQUEST_BODY)
+        self._notify_groups(['pr_hr_attendance.custom_group_hr_attendance_supervisor'], SHORTAGE_REQUEST_BODY)
 
     def _send_hr_manager_email(self):
-        for rec in self:
-            base_url = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
-            record_url = base_url + "/web#id=" + str(rec.id) + "&view_type=form&model=pr.hr.shortage.request&view_type=form"
-
-            group_ids = [self.env.ref('hr_attendance.group_hr_attendance_manager').id]
-            user_ids = self.env['res.users'].sudo().search([('groups_id', 'in', group_ids)])
-            if user_ids:
-                for user in user_ids:
-                    employee_id = self.env["hr.employee"].sudo().search([("user_id", "=", user.id)], limit=1)
-                    if employee_id and employee_id.work_email:
-                        body_message = f"""Dear Mr/Mrs. {employee_id.name},<br/><br/>
-            
-                            We wish to inform you that your employee {rec.employee_id.name} has been asked for <strong>Shortage Request For {rec.date}</strong>.<br/><br/>
-                            You can check the request to take a decision by clicking this button <a class="btn btn-primary" href="{record_url}" role="button">Shortage Request</a><br/><br/><br/>
-                            Thank you for your attention to this matter.<br/><br/>
-                            Best regards,<br/>
-                            <strong>HR Department</strong><br/>
-                            Petroraq Engineering
-                            """
-                        receiver = employee_id.work_email
-                        mail = self.env["mail.mail"]
-                        mail_id = mail.sudo().create(
-                            rec._prepare_email_vals(body_message=body_message, receiver=receiver))
-                        if mail_id:
-                            mail_id.sudo().send()
+        self._notify_groups(['hr_attendance.group_hr_attendance_manager'], SHORTAGE_REQUEST_BODY)
 
     def _send_result_to_employee(self, result):
+        dispatcher = self.env["pr.hr.notification.dispatcher"]
+        vals_list = []
         for rec in self:
-
-            body_message = f"""Dear Mr/Mrs. {rec.employee_id.name},<br/><br/>
-
-                We wish to inform you that your Shortage Request {rec.name} has been <strong>{result}</strong>.<br/><br/>
-                Thank you for your attention to this matter.<br/><br/>
-                Best regards,<br/>
-                <strong>HR Department</strong><br/>
-                Petroraq Engineering
-                """
+            values = dict(rec._get_email_values(), recipient_name=rec.employee_id.name, result=result)
+            body_message = dispatcher._render_body(SHORTAGE_RESULT_BODY, values)
             receiver = rec.employee_id.work_email
-            mail = self.env["mail.mail"]
-            mail_id = mail.sudo().create(rec._prepare_email_vals(body_message=body_message, receiver=receiver))
-            if mail_id:
-                mail_id.sudo().send()
+            vals_list.append(rec._prepare_email_vals(body_message=body_message, receiver=receiver))
+        dispatcher.queue_mails(vals_list)
 
     # endregion [Emails]
 
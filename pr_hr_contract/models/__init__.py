@@ -3,5 +3,6 @@
 from . import hr_employee
 from . import hr_contract
 from . import hr_contract_gosi
+from . import hr_expiry_index
 # from . import res_bank
 
@@ -17,7 +17,8 @@ class HrContract(models.Model):
     """
     """
     # region [Initial]
-    _inherit = 'hr.contract'
+    _inherit = ['hr.contract', 'pr.hr.expiry.mixin']
+    _expiry_index_fields = ('state', 'employee_id', 'date_start', 'trial_period', 'notice_period', 'contract_period')
     # endregion [Initial]
 
     # region [Fields]
@@ -378,96 +379,21 @@ class HrContract(models.Model):
     # endregion [Actions]
 
     # region [Cron Methods]
-    @api.model
-    def _cron_hr_contract_periods_check(self):
-        cron_id = self.env.ref('pr_hr_contract.cron_hr_contract_periods_check')
-        cron_update_vals = {
-            'description': 'Hr contract periods check',
-            'implement_date': fields.Datetime.now(),
-        }
-        # cron_update_id = self.env['bof.cron.update'].sudo().create(cron_update_vals)
-        try:
-            today = fields.Date.today()
-            # Check Contracts That After 3 Weeks Trial Period Ends,
-            # We Send Mail To Employee Manager To Make A Decision He Wants Him Or Not
-            trial_end_contract_ids = self.env['hr.contract'].search([('state', '=', 'open'),
-                                                                     ('trial_end_date', '=',
-                                                                      (today - relativedelta(weeks=3)))])
-            for trial_contract in trial_end_contract_ids:
-                contract_notification_id = self.env['bof.hr.contract.notification'].sudo().create({
-                    'employee_id': trial_contract.employee_id.id,
-                    'notification_type': 'trial',
-                    'end_date': trial_contract.trial_end_date,
-                })
-                odoobot = self.env.ref('base.partner_root')
-                notification_clickable_url = trial_contract._get_clickable_link(contract_notification_id)
-                subject = f'{trial_contract.name} - Trial Period State'
-                body = f'Dear {trial_contract.employee_id.manager_id.name}\n' \
-                       f'We Would Like To Inform You That:\n' \
-                       f'Trial Period Of This Employee {trial_contract.employee_id.name} Finishes Within 3 Weeks \n\n ' \
-                       f'You Should Make A Decision You Want This Employee With You Or Not \n\n Contract Notification {notification_clickable_url} \n\n Thanks'
-
-                # Department Manager
-                self._action_send_mail(subject=subject, body=body,
-                                       user_id=trial_contract.employee_id.department_id.manager_id.user_id,
-                                       author_id=odoobot)
-
-                # HR Manager
-                hr_manager_ids = self.env['res.users'].sudo().search(
-                    [('groups_id', 'in', self.env.ref('hr_contract.group_hr_contract_manager').id)])
-                for hr_manager in hr_manager_ids:
-                    self._action_send_mail(subject=subject, body=body,
-                                           user_id=hr_manager,
-                                           author_id=odoobot)
-
-                # Employee
-                self._action_send_mail(subject=subject, body=body,
-                                       user_id=trial_contract.employee_id.user_id,
-                                       author_id=odoobot)
-
-            # Check Contracts That After a Month Notice Period Ends
-            # We Send Mail To Employee Manager To Evaluate This Employee
-            notice_period_contract_ids = self.env['hr.contract'].search([('state', '=', 'open'),
-                                                                         ('notice_end_date', '=',
-                                                                          (today - relativedelta(months=1)))])
-            for notice_contract in notice_period_contract_ids:
-                contract_notification_id = self.env['bof.hr.contract.notification'].sudo().create({
-                    'employee_id': notice_contract.employee_id.id,
-                    'notification_type': 'end_contract',
-                    'end_date': notice_contract.expected_end_date,
-                })
-                odoobot = self.env.ref('base.partner_root')
-                notification_clickable_url = notice_contract._get_clickable_link(contract_notification_id)
-                subject = f'{notice_contract.name} - Evaluation'
-                body = f'Dear {notice_contract.employee_id.manager_id.name}\n' \
-                       f'We Would Like To Inform You That:\n' \
-                       f'Notice Period Of This Employee {notice_contract.employee_id.name} Finishes Within 1 Month \n\n ' \
-                       f'You Should Evaluate This Employee \n\n Contract Notification {notification_clickable_url} \n\n Thanks'
-
-                # Department Manager
-                self._action_send_mail(subject=subject, body=body,
-                                       user_id=notice_contract.employee_id.department_id.manager_id.user_id,
-                                       author_id=odoobot)
-
-            # HR Manager
-            hr_manager_ids = self.env['res.users'].sudo().search(
-                [('groups_id', 'in', self.env.ref('hr_contract.group_hr_contract_manager').id)])
-            for hr_manager in hr_manager_ids:
-                self._action_send_mail(subject=subject, body=body,
-                                       user_id=hr_manager,
-                                       author_id=odoobot)
-            # Employee
-            self._action_send_mail(subject=subject, body=body,
-                                   user_id=notice_contract.employee_id.user_id,
-                                   author_id=odoobot)
-        except Exception as e:
-            # raise UserError(f'{e}')
-            cron_update_id.write({
-                'failed_error': e,
-                'model': self._name,
-                # 'ir_cron': cron_id.id,
-                'nextcall': cron_id.nextcall,
-            })
+
+    def _get_expiry_index_entries(self):
+        """
+        Alert the HR managers, the department manager and the employee three
+        weeks before the end of the trial period and one month before the end
+        of the notice period.
+        """
+        if self.state != 'open':
+            return []
+        entries = []
+        if self.trial_end_date:
+            entries.append(('contract_trial', self.trial_end_date - relativedelta(weeks=3), self.trial_end_date))
+        if self.notice_end_date:
+            entries.append(('contract_notice', self.notice_end_date - relativedelta(months=1), self.notice_end_date))
+        return entries
 
     # endregion [Cron Methods]
 
@@ -0,0 +1,25 @@
+from odoo import api, fields, models
+
+
+class HrExpiryIndex(models.Model):
+    # region [Initial]
+    _inherit = 'pr.hr.expiry.index'
+    # endregion [Initial]
+
+    # region [Fields]
+    expiry_type = fields.Selection(selection_add=[
+        ('contract_trial', 'Contract Trial Period End'),
+        ('contract_notice', 'Contract Notice Period End'),
+    ], ondelete={'contract_trial': 'cascade', 'contract_notice': 'cascade'})
+    # endregion [Fields]
+
+    @api.model
+    def _get_expiry_types(self):
+        expiry_types = super()._get_expiry_types()
+        contract_alert = {
+            'groups': ['hr_contract.group_hr_contract_manager'],
+            'notify_manager': True,
+            'notify_employee': True,
+        }
+        expiry_types.update(contract_trial=contract_alert, contract_notice=contract_alert)
+        return expiry_types
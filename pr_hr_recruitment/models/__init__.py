@@ -4,6 +4,7 @@ from . import hr_job
 from . import hr_applicant_onboarding
 from . import hr_applicant
 from . import hr_work_permit
+from . import hr_expiry_index
 from . import bank_payment
 from . import mail_alias
 
@@ -0,0 +1,17 @@
+from odoo import api, fields, models
+
+
+class HrExpiryIndex(models.Model):
+    _inherit = 'pr.hr.expiry.index'
+
+    expiry_type = fields.Selection(selection_add=[
+        ('work_permit_iqama', 'Work Permit Iqama Expiry'),
+        ('work_permit_renewal', 'Work Permit Renewal'),
+    ], ondelete={'work_permit_iqama': 'cascade', 'work_permit_renewal': 'cascade'})
+
+    @api.model
+    def _get_expiry_types(self):
+        expiry_types = super()._get_expiry_types()
+        work_permit_alert = {'emails': ['hr@petroraq.com']}
+        expiry_types.update(work_permit_iqama=work_permit_alert, work_permit_renewal=work_permit_alert)
+        return expiry_types
@@ -9,8 +9,9 @@ _logger = logging.getLogger(__name__)
 class HRWorkPermit(models.Model):
     _name = 'hr.work.permit'
     _description = 'HR Work Permit/Iqama Flow'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'pr.hr.expiry.mixin']
     _order = "id"
+    _expiry_index_fields = ('name', 'employee_id', 'iqama_expiry_date', 'work_permit_renewal_date')
 
     # region [Fields]
 
@@ -82,51 +83,14 @@ class HRWorkPermit(models.Model):
             'res_id': self.bank_payment_id.id,
         }
 
-    def trigger_alerts(self):
-        # Trigger alerts for Iqama expiry and work permit renewal window
-        for rec in self:
-            if rec.iqama_expiry_date:
-                if fields.Date.today() >= rec.iqama_expiry_date:
-                    # Send Iqama Expiry Alert
-                    rec._send_notification()
-            if rec.work_permit_renewal_date:
-                if fields.Date.today() >= rec.work_permit_renewal_date:
-                    # Send Work Permit Renewal Reminder
-                    rec._send_notification()
-
-    @api.model
-    def _cron_check_alerts(self):
-        # Scheduled job to run daily to check for alerts
-        self.trigger_alerts()
-
-    def _send_notification(self):
-        for rec in self:
-            hr_email = "hr@petroraq.com"
-            mail = self.env["mail.mail"]
-            try:
-                body_message = f"""
-                                Dear HR,<br/><br/>
-
-We wish to inform you that a This Is Notification from the system about work permit/Iqama Expiry Of {rec.name}<br/><br/>
-
-Thank you for your attention to this matter.<br/><br/>
-Best regards,<br/>
-<strong>HR Department</strong><br/>
-Petroraq Engineering
-"""
-                receivers_emails = [hr_email]
-                for receiver in receivers_emails:
-                    message = {
-                        "email_from": "hr@petroraq.com",
-                        "subject": f"{rec.name} - Alert For Work Permit/Iqama Expiry",
-                        "body_html": body_message,
-                        "email_to": receiver,
-                    }
-                    mail_id = mail.sudo().create(message)
-                    if mail_id:
-                        mail_id.sudo().send()
-            except Exception as e:
-                _logger.error("Success email is not sent {}".format(e))
+    def _get_expiry_index_entries(self):
+        # Iqama expiry alert and work permit renewal reminder
+        entries = []
+        if self.iqama_expiry_date:
+            entries.append(('work_permit_iqama', self.iqama_expiry_date, self.iqama_expiry_date))
+        if self.work_permit_renewal_date:
+            entries.append(('work_permit_renewal', self.work_permit_renewal_date, self.work_permit_expiry_date))
+        return entries
 
     def unlink(self):
         if self.state != 'draft':
@@ -7,7 +7,7 @@
     'version': '0.1',
 
     # any module necessary for this one to work correctly
-    'depends': ['l10n_sa'],
+    'depends': ['l10n_sa', 'pr_base'],
     'assets': {
         'web.report_assets.common': [
             '/tax_Invoice_report/static/src/scss/custom_font.scss'
@@ -21,5 +21,6 @@
         'report/report_action.xml',
         'report/report_action_temp.xml',
         'views/views.xml',
+        'data/account_move_data.xml',
     ],
 }
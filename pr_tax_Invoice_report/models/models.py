@@ -8,12 +8,13 @@ from contextlib import ExitStack, contextmanager
 
 from odoo import models, fields, api, Command
 from odoo.exceptions import UserError
+from odoo.tools import split_every
 import qrcode
 import base64
+import hashlib
 from odoo import models, fields, api, _
 from io import BytesIO
 import binascii
-from googletrans import Translator
 
 try:
     from num2words import num2words
@@ -21,6 +22,12 @@ except ImportError:
     _logger.warning("The num2words python library is not installed, amount-to-text features won't be fully available.")
     num2words = None
 
+# pixels per QR module, about 250px for the version 4 code: plenty for print
+QR_BOX_SIZE = 6
+# invoices rendered per transaction batch by the backfill of the QR codes
+QR_BACKFILL_BATCH_SIZE = 500
+
+
 class generateQrCode():
 
     # this method will return image of qr with relevent url
@@ -28,7 +35,7 @@ class generateQrCode():
         qr = qrcode.QRCode(
             version=4,
             error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=20,
+            box_size=QR_BOX_SIZE,
             border=4,
         )
         qr.add_data(url)
@@ -43,22 +50,28 @@ class generateQrCode():
 class AccountMove(models.Model):
     _inherit = 'account.move'
 
-    custom_qr_image = fields.Binary("QR Code", compute='_generate_qr_code')
+    custom_qr_image = fields.Binary("QR Code", attachment=True, copy=False, readonly=True)
+    custom_qr_hash = fields.Char("QR Code Payload Hash", copy=False, readonly=True)
+
+    def _get_arabic_translation_texts(self):
+        """Texts of the invoices the report may print in Arabic."""
+        texts = set()
+        for move in self:
+            for partner in (move.partner_id, move.company_id.partner_id):
+                texts.update((partner.name, partner.city, partner.country_id.name))
+            texts.update(move.invoice_line_ids.product_id.mapped('name'))
+            texts.update(move.invoice_line_ids.mapped('name'))
+        texts.discard(False)
+        return texts
 
     @api.model
     def translate_to_arabic(self, text, _logger=None):
-        if not text:
-            return ''
-
-        translator = Translator()
-        try:
-            translation = translator.translate(text, dest='ar')
-            if translation and hasattr(translation, 'text'):
-                return translation.text
-            return ''
-        except Exception as e:
-            _logger.error(f"Error in translating text to Arabic: {e}")
-            return ''
+        # translations come from the translation memory, never from the network
+        # while rendering: the first text looked up brings the texts of all the
+        # printed invoices along in one query
+        moves = self.browse(self._prefetch_ids)
+        return self.env['pr.translation.memory'].sudo()._translate(
+            text, prefetch=moves._get_arabic_translation_texts)
 
     @api.model
     def translate_invoice_name(self, invoice_name):
@@ -128,8 +141,9 @@ class AccountMove(models.Model):
                 hexadecimal = "0" + hexadecimal
             return tag + hexadecimal + hex_string
 
-    # Generate Qr Code In Binary Field
-    def _generate_qr_code(self):
+    # TLV payload of the QR code, base64 encoded
+    def _get_custom_qr_payload(self):
+        self.ensure_one()
         if self.move_type in ('out_invoice', 'out_refund'):
             sellername = str(self.company_id.name)
             seller_vat_no = self.company_id.vat or ''
@@ -149,8 +163,40 @@ class AccountMove(models.Model):
         total_vat_hex = self._get_hex("05", "09", str(round(self.amount_tax, 2))) or ''
         # total_vat_hex = self._get_hex("05", "09", str(round(self.tax_totals_amount_tax, 2))) or ''
         qr_hex = "".join((p for p in (seller_hex, vat_hex, date_hex, total_with_vat_hex, total_vat_hex) if p))
-        qr_info = base64.b64encode(bytes.fromhex(qr_hex)).decode()
-        self.custom_qr_image = generateQrCode.generate_qr_code(qr_info)
+        return base64.b64encode(bytes.fromhex(qr_hex)).decode()
+
+    # Store the QR code of the moves whose payload changed since it was rendered
+    def _update_custom_qr_image(self):
+        images = {}
+        for move in self:
+            payload = move._get_custom_qr_payload()
+            payload_hash = hashlib.sha256(payload.encode()).hexdigest()
+            if move.custom_qr_hash == payload_hash:
+                continue
+            if payload_hash not in images:
+                images[payload_hash] = generateQrCode.generate_qr_code(payload)
+            move.write({
+                'custom_qr_image': images[payload_hash],
+                'custom_qr_hash': payload_hash,
+            })
+
+    def _post(self, soft=True):
+        posted = super()._post(soft=soft)
+        posted.filtered(lambda move: move.is_invoice(include_receipts=True))._update_custom_qr_image()
+        return posted
+
+    # Render the QR codes of the invoices posted before they were stored, called on module update
+    @api.model
+    def _backfill_custom_qr_image(self):
+        moves = self.search([
+            ('state', '=', 'posted'),
+            ('move_type', 'in', self.get_invoice_types(include_receipts=True)),
+            ('custom_qr_hash', '=', False),
+        ])
+        for move_ids in split_every(QR_BACKFILL_BATCH_SIZE, moves.ids):
+            self.browse(move_ids)._update_custom_qr_image()
+            self.env.flush_all()
+            self.env.invalidate_all()
 
 
 class ResPartner(models.Model):
@@ -24,6 +24,7 @@
         'report/custom_invoice_header_footer.xml',
         'views/views.xml',
         'data/custom_mail.xml',
+        'data/account_move_data.xml',
 
     ],
 }
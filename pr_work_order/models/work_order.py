@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError, ValidationError
 
@@ -479,12 +481,15 @@ class WorkOrderCostCenter(models.Model):
         "section_name",
     )
     def _compute_estimated_cost(self):
+        # one pass over the BOQ of each work order, whatever its number of cost centers
+        section_costs = {}
+        for work_order in self.work_order_id:
+            costs = section_costs[work_order.id] = defaultdict(float)
+            for line in work_order.boq_line_ids:
+                if line.display_type not in ("line_section", "line_note"):
+                    costs[line.section_name] += line.total
         for rec in self:
-            lines = rec.work_order_id.boq_line_ids.filtered(
-                lambda l: l.display_type not in ("line_section", "line_note")
-                          and l.section_name == rec.section_name
-            )
-            rec.estimated_cost = sum(lines.mapped("total"))
+            rec.estimated_cost = section_costs.get(rec.work_order_id.id, {}).get(rec.section_name, 0.0)
 
     @api.onchange("department_id", "section_id")
     def _sync_fields_to_analytic_account(self):
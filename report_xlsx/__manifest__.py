@@ -6,11 +6,17 @@
     "author": "ACSONE SA/NV," "Creu Blanca," "Odoo Community Association (OCA)",
     "website": "https://github.com/OCA/reporting-engine",
     "category": "Reporting",
-    "version": "17.0.1.0.1",
+    "version": "17.0.1.1.0",
     "development_status": "Mature",
     "license": "AGPL-3",
     "external_dependencies": {"python": ["xlsxwriter", "xlrd"]},
     "depends": ["base", "web"],
+    "data": [
+        "security/ir.model.access.csv",
+        "security/report_async_job_security.xml",
+        "data/ir_cron.xml",
+        "views/ir_actions_report_views.xml",
+    ],
     "demo": ["demo/report.xml"],
     "installable": True,
     "assets": {
@@ -7,6 +7,8 @@ import logging
 
 from werkzeug.urls import url_decode
 
+from odoo import _
+from odoo.exceptions import AccessError, MissingError, UserError
 from odoo.http import (
     content_disposition,
     request,
@@ -105,3 +107,49 @@ class ReportController(ReportController):
                 return request.make_response(html_escape(json.dumps(error)))
         else:
             return super().report_download(data, context=context, token=token)
+
+    @route(
+        ["/report/async/<converter>/<reportname>"],
+        type="json",
+        auth="user",
+    )
+    def report_async_enqueue(
+        self, reportname, converter, docids=None, data=None, context=None
+    ):
+        """Queue the rendering of a report and answer with the job token
+        right away; the file is produced by the background worker."""
+        if converter not in ("xlsx", "pdf"):
+            raise UserError(_("Unsupported report format: %s", converter))
+        if isinstance(docids, str):
+            docids = [int(i) for i in docids.split(",") if i]
+        elif isinstance(docids, int):
+            docids = [docids]
+        env_context = dict(request.env.context, **(context or {}))
+        job = (
+            request.env["report.async.job"]
+            .with_context(**env_context)
+            .enqueue(reportname, converter, docids, data, context)
+        )
+        return job._get_status()
+
+    def _get_report_async_job(self, token):
+        job = request.env["report.async.job"].search([("token", "=", token)], limit=1)
+        if not job:
+            raise MissingError(_("This report is no longer available."))
+        return job
+
+    @route(["/report/async/status/<string:token>"], type="json", auth="user")
+    def report_async_status(self, token):
+        return self._get_report_async_job(token)._get_status()
+
+    @route(["/report/async/download/<string:token>"], type="http", auth="user")
+    def report_async_download(self, token):
+        try:
+            job = self._get_report_async_job(token)
+        except (AccessError, MissingError):
+            return request.not_found()
+        if job.state != "done" or not job.attachment_id:
+            return request.not_found()
+        stream = request.env["ir.binary"]._get_stream_from(job.sudo().attachment_id)
+        stream.download_name = job.filename
+        return stream.get_response(as_attachment=True)
@@ -1 +1,2 @@
 from . import ir_report
+from . import report_async_job
@@ -15,6 +15,14 @@ class ReportAction(models.Model):
     report_type = fields.Selection(
         selection_add=[("xlsx", "XLSX")], ondelete={"xlsx": "set default"}
     )
+    async_export = fields.Boolean(
+        string="Render in Background",
+        help="Render the report in a background job instead of the web request. "
+        "The user is notified when the file is ready to download.",
+    )
+
+    def _get_readable_fields(self):
+        return super()._get_readable_fields() | {"async_export"}
 
     @api.model
     def _render_xlsx(self, report_ref, docids, data):
@@ -0,0 +1,286 @@
+# Copyright 2026 Petroraq
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
+
+import hashlib
+import json
+import logging
+import threading
+import uuid
+from datetime import timedelta
+
+from odoo import _, api, exceptions, fields, models
+from odoo.tools.safe_eval import safe_eval, time
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_TTL = 60  # minutes
+CONVERTER_MIMETYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pdf": "application/pdf",
+}
+# Context keys that only matter to the web client and must not make two
+# otherwise identical requests look different.
+VOLATILE_CONTEXT_KEYS = {"params", "bin_size", "uid"}
+
+
+class ReportAsyncJob(models.Model):
+    _name = "report.async.job"
+    _description = "Background Report Rendering Job"
+    _order = "id desc"
+
+    token = fields.Char(
+        required=True,
+        readonly=True,
+        index=True,
+        copy=False,
+        default=lambda self: uuid.uuid4().hex,
+    )
+    request_key = fields.Char(required=True, readonly=True, index=True)
+    report_name = fields.Char(required=True, readonly=True)
+    converter = fields.Selection(
+        [("xlsx", "XLSX"), ("pdf", "PDF")], required=True, readonly=True
+    )
+    docids = fields.Char(readonly=True)
+    data = fields.Text(readonly=True)
+    context = fields.Text(readonly=True)
+    filename = fields.Char(readonly=True)
+    user_id = fields.Many2one("res.users", required=True, readonly=True, index=True)
+    company_id = fields.Many2one("res.company", readonly=True)
+    state = fields.Selection(
+        [
+            ("pending", "Pending"),
+            ("running", "Running"),
+            ("done", "Done"),
+            ("failed", "Failed"),
+        ],
+        default="pending",
+        required=True,
+        readonly=True,
+        index=True,
+    )
+    attachment_id = fields.Many2one("ir.attachment", readonly=True, ondelete="set null")
+    error = fields.Text(readonly=True)
+    date_done = fields.Datetime(readonly=True)
+
+    _sql_constraints = [
+        ("token_uniq", "unique(token)", "The job token must be unique."),
+    ]
+
+    # ------------------------------------------------------------------
+    # Enqueue
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _get_job_ttl(self):
+        """Minutes during which a finished job is handed out again for an
+        identical request instead of rendering the report a second time."""
+        ttl = self.env["ir.config_parameter"].sudo().get_param(
+            "report_xlsx.async_job_ttl", DEFAULT_JOB_TTL
+        )
+        try:
+            return max(int(ttl), 0)
+        except (TypeError, ValueError):
+            return DEFAULT_JOB_TTL
+
+    @api.model
+    def _make_request_key(self, report_name, converter, docids, data, context):
+        context = {
+            key: value
+            for key, value in (context or {}).items()
+            if key not in VOLATILE_CONTEXT_KEYS
+        }
+        payload = json.dumps(
+            [
+                self.env.uid,
+                report_name,
+                converter,
+                docids or [],
+                data or {},
+                context,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @api.model
+    def _get_job_filename(self, report, converter, docids):
+        filename = report.name
+        if docids and report.print_report_name and len(docids) == 1:
+            obj = self.env[report.model].browse(docids)
+            filename = safe_eval(
+                report.print_report_name, {"object": obj, "time": time}
+            )
+        return f"{filename}.{converter}"
+
+    @api.model
+    def enqueue(self, report_name, converter, docids=None, data=None, context=None):
+        """Register a rendering request and return the job serving it.
+
+        A job still in progress, or one finished within the TTL, for the exact
+        same request of the same user is returned as is so repeated clicks do
+        not render the report again.
+        """
+        report = self.env["ir.actions.report"]._get_report_from_name(report_name)
+        if not report:
+            raise exceptions.UserError(_("Report %s not found.", report_name))
+        docids = [int(i) for i in docids or []]
+        request_key = self._make_request_key(
+            report_name, converter, docids, data, context
+        )
+        ttl = self._get_job_ttl()
+        domain = [
+            ("request_key", "=", request_key),
+            ("user_id", "=", self.env.uid),
+            "|",
+            ("state", "in", ("pending", "running")),
+            "&",
+            ("state", "=", "done"),
+            ("date_done", ">=", fields.Datetime.now() - timedelta(minutes=ttl)),
+        ]
+        job = self.sudo().search(domain, limit=1)
+        if job and (job.state != "done" or job.attachment_id):
+            return job.sudo(False)
+        job = self.sudo().create(
+            {
+                "request_key": request_key,
+                "report_name": report_name,
+                "converter": converter,
+                "docids": ",".join(map(str, docids)),
+                "data": json.dumps(data or {}, default=str),
+                "context": json.dumps(context or {}, default=str),
+                "filename": self._get_job_filename(report, converter, docids),
+                "user_id": self.env.uid,
+                "company_id": self.env.company.id,
+            }
+        )
+        self.env.ref("report_xlsx.ir_cron_report_async_job")._trigger()
+        return job.sudo(False)
+
+    def _get_status(self):
+        self.ensure_one()
+        return {
+            "token": self.token,
+            "state": self.state,
+            "filename": self.filename,
+            "url": self._get_download_url() if self.state == "done" else False,
+            "error": self.error or False,
+        }
+
+    def _get_download_url(self):
+        self.ensure_one()
+        return f"/report/async/download/{self.token}"
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _acquire_next_job(self):
+        """Lock the oldest pending job so that concurrent workers never render
+        the same request twice."""
+        self.env.cr.execute(
+            """
+            SELECT id FROM report_async_job
+             WHERE state = 'pending'
+          ORDER BY id
+             LIMIT 1
+               FOR UPDATE SKIP LOCKED
+            """
+        )
+        row = self.env.cr.fetchone()
+        return self.browse(row[0]) if row else self.browse()
+
+    @api.model
+    def _cron_process_jobs(self, limit=20):
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        for _i in range(limit):
+            job = self._acquire_next_job()
+            if not job:
+                break
+            job._run()
+            if auto_commit:
+                self.env.cr.commit()  # pylint: disable=invalid-commit
+
+    def _render(self):
+        """Render the report as the requesting user and return its content."""
+        self.ensure_one()
+        context = json.loads(self.context or "{}")
+        if self.company_id:
+            context.setdefault("allowed_company_ids", [self.company_id.id])
+        report_model = (
+            self.env["ir.actions.report"]
+            .with_user(self.user_id)
+            .with_context(**context)
+        )
+        docids = [int(i) for i in self.docids.split(",")] if self.docids else None
+        data = json.loads(self.data or "{}")
+        if self.converter == "xlsx":
+            return report_model._render_xlsx(self.report_name, docids, data=data)[0]
+        return report_model._render_qweb_pdf(self.report_name, docids, data=data)[0]
+
+    def _run(self):
+        self.ensure_one()
+        self.state = "running"
+        try:
+            with self.env.cr.savepoint():
+                content = self._render()
+        except Exception as e:
+            _logger.exception("Background rendering of %s failed", self.report_name)
+            self.write(
+                {"state": "failed", "error": str(e), "date_done": fields.Datetime.now()}
+            )
+            self._notify_user()
+            return
+        attachment = self.env["ir.attachment"].create(
+            {
+                "name": self.filename,
+                "raw": content,
+                "mimetype": CONVERTER_MIMETYPES[self.converter],
+                "res_model": self._name,
+                "res_id": self.id,
+                "type": "binary",
+            }
+        )
+        self.write(
+            {
+                "state": "done",
+                "attachment_id": attachment.id,
+                "date_done": fields.Datetime.now(),
+            }
+        )
+        self._notify_user()
+
+    def _notify_user(self):
+        """Tell the requester the file is ready when web_notify is installed;
+        clients that stay on the page poll the job status instead."""
+        self.ensure_one()
+        users = self.user_id.sudo()
+        if not hasattr(users, "notify_success"):
+            return
+        if self.state == "done":
+            users.notify_success(
+                message=_("%s is ready for download.", self.filename),
+                title=_("Report ready"),
+                sticky=True,
+                action={
+                    "type": "ir.actions.act_url",
+                    "url": self._get_download_url(),
+                    "target": "self",
+                },
+            )
+        else:
+            users.notify_danger(
+                message=_("%(name)s could not be generated: %(error)s")
+                % {"name": self.filename, "error": self.error},
+                title=_("Report failed"),
+            )
+
+    @api.autovacuum
+    def _gc_expired_jobs(self):
+        limit = fields.Datetime.now() - timedelta(minutes=self._get_job_ttl())
+        jobs = self.sudo().search(
+            [("state", "in", ("done", "failed")), ("date_done", "<", limit)]
+        )
+        jobs.attachment_id.unlink()
+        jobs.unlink()
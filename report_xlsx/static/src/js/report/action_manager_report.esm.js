@@ -1,11 +1,56 @@
 /** @odoo-module **/
 
+import {_t} from "@web/core/l10n/translation";
+import {browser} from "@web/core/browser/browser";
 import {download} from "@web/core/network/download";
 import {registry} from "@web/core/registry";
 
+const ASYNC_POLL_DELAY = 3000;
+const ASYNC_POLL_ATTEMPTS = 200;
+
+/**
+ * Queue the report on the server and wait for the background job. The user
+ * can leave the page: web_notify (when installed) announces the finished file.
+ */
+async function downloadReportAsync(action, env) {
+    const actionContext = action.context || {};
+    let status = await env.services.rpc(
+        `/report/async/${action.report_type}/${action.report_name}`,
+        {
+            docids: actionContext.active_ids || null,
+            data: action.data || {},
+            context: {...env.services.user.context, ...actionContext},
+        }
+    );
+    env.services.notification.add(
+        _t("%s is being generated in the background.", status.filename),
+        {type: "info"}
+    );
+    for (let attempt = 0; attempt < ASYNC_POLL_ATTEMPTS; attempt++) {
+        if (status.state === "done") {
+            browser.location.href = status.url;
+            return;
+        }
+        if (status.state === "failed") {
+            env.services.notification.add(status.error, {type: "danger"});
+            return;
+        }
+        await new Promise((resolve) => browser.setTimeout(resolve, ASYNC_POLL_DELAY));
+        status = await env.services.rpc(`/report/async/status/${status.token}`);
+    }
+}
+
 registry
     .category("ir.actions.report handlers")
     .add("xlsx_handler", async function (action, options, env) {
+        if (action.report_type === "xlsx" && action.async_export) {
+            // Do not hold the action manager while the worker renders the file
+            downloadReportAsync(action, env);
+            if (options.onClose) {
+                options.onClose();
+            }
+            return Promise.resolve(true);
+        }
         if (action.report_type === "xlsx") {
             const type = action.report_type;
             let url = `/report/${type}/${action.report_name}`;
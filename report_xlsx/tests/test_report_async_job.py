@@ -0,0 +1,54 @@
+# Copyright 2026 Petroraq
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
+
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import common
+
+
+class TestReportAsyncJob(common.TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.job_model = cls.env["report.async.job"]
+        cls.report_name = "report_xlsx.partner_xlsx"
+        cls.docs = cls.env["res.company"].search([], limit=1).partner_id
+
+    def _enqueue(self):
+        return self.job_model.enqueue(self.report_name, "xlsx", self.docs.ids)
+
+    def test_enqueue_and_render(self):
+        job = self._enqueue()
+        self.assertEqual(job.state, "pending")
+        self.assertEqual(job._get_status()["url"], False)
+        self.job_model._cron_process_jobs()
+        self.assertEqual(job.state, "done")
+        self.assertTrue(job.attachment_id.raw)
+        self.assertEqual(job.attachment_id.res_model, "report.async.job")
+        self.assertEqual(job._get_status()["url"], job._get_download_url())
+
+    def test_reuse_within_ttl(self):
+        job = self._enqueue()
+        self.assertEqual(self._enqueue(), job)
+        self.job_model._cron_process_jobs()
+        self.assertEqual(self._enqueue(), job)
+        job.date_done = fields.Datetime.now() - timedelta(days=1)
+        self.assertNotEqual(self._enqueue(), job)
+
+    def test_failed_job(self):
+        job = self._enqueue()
+        job.sudo().report_name = "report_xlsx.missing_report"
+        self.job_model._cron_process_jobs()
+        self.assertEqual(job.state, "failed")
+        self.assertTrue(job.error)
+        self.assertFalse(job.attachment_id)
+
+    def test_gc_expired_jobs(self):
+        job = self._enqueue()
+        self.job_model._cron_process_jobs()
+        attachment = job.attachment_id
+        job.date_done = fields.Datetime.now() - timedelta(days=1)
+        self.job_model._gc_expired_jobs()
+        self.assertFalse(job.exists())
+        self.assertFalse(attachment.exists())
@@ -4,12 +4,25 @@
 # Copyright 2020 Ecosoft Co., Ltd. (<http://ecosoft.co.th>)
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
+from collections import defaultdict
+
 from odoo import fields, models
 
 
 class SaleOrder(models.Model):
     _name = "sale.order"
     _inherit = ["sale.order", "base.revision"]
+    # quotations may have thousands of lines, revisions clone them in SQL
+    _revision_copy_mode = "sql"
+    _revision_diff_fields = {
+        "name": None,
+        "product_uom_qty": "Product Unit of Measure",
+        "price_unit": "Product Price",
+        "discount": "Discount",
+        "price_subtotal": None,
+        "price_total": None,
+    }
+    _revision_diff_amount_field = "price_subtotal"
 
     current_revision_id = fields.Many2one(
         comodel_name="sale.order",
@@ -27,6 +40,13 @@ class SaleOrder(models.Model):
         )
     ]
 
+    def _get_revision_sql_line_domain(self, field):
+        # like sale.order copy_data(), down payment lines are not copied
+        domain = super()._get_revision_sql_line_domain(field)
+        if field.model_name == "sale.order" and field.name == "order_line":
+            domain = domain + [("is_downpayment", "=", False)]
+        return domain
+
     def _prepare_revision_data(self, new_revision):
         vals = super()._prepare_revision_data(new_revision)
         vals.update({"state": "cancel"})
@@ -42,3 +62,47 @@ class SaleOrder(models.Model):
             "default_current_revision_id": self.id,
         }
         return result
+
+    def _get_revision_diff_rows(self):
+        """Lines of the orders read with one query, sectioned by the line
+        section before them."""
+        self.env["sale.order.line"].flush_model(
+            ["order_id", "sequence", "display_type", "product_id"]
+            + list(self._revision_diff_fields)
+        )
+        self.env.cr.execute(
+            f"""
+            SELECT id, order_id, display_type, product_id,
+                   {", ".join(self._revision_diff_fields)}
+              FROM sale_order_line
+             WHERE order_id = ANY(%s)
+             ORDER BY order_id, sequence, id
+            """,
+            [self.ids],
+        )
+        rows_by_order = defaultdict(list)
+        sections = {}
+        for row in self.env.cr.dictfetchall():
+            order_id = row.pop("order_id")
+            display_type = row.pop("display_type")
+            if display_type == "line_section":
+                sections[order_id] = row["name"]
+                continue
+            if display_type:
+                continue
+            for name in self._revision_diff_fields:
+                if name != "name":
+                    row[name] = float(row[name] or 0.0)
+            row["section"] = sections.get(order_id) or ""
+            rows_by_order[order_id].append(row)
+        return rows_by_order
+
+    def _get_revision_diff_totals(self, previous):
+        totals = super()._get_revision_diff_totals(previous)
+        totals.update(
+            {
+                "amount_untaxed_delta": self.amount_untaxed - previous.amount_untaxed,
+                "amount_total_delta": self.amount_total - previous.amount_total,
+            }
+        )
+        return totals
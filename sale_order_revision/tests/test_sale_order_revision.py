@@ -1,6 +1,8 @@
 # Copyright 2021 Tecnativa - Víctor Martínez
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl)
 
+from odoo.exceptions import UserError
+
 from odoo.addons.base_revision.tests import test_base_revision
 
 
@@ -65,3 +67,126 @@ class TestSaleOrderRevision(test_base_revision.TestBaseRevision):
         self.assertEqual(revision_2.revision_number, 2)
         self.assertEqual(revision_2.name.endswith("-02"), True)
         self.assertEqual(revision_2.has_old_revisions, True)
+
+    def test_order_revision_lines(self):
+        sale_order_1 = self._create_tester(
+            [
+                {
+                    "order_line": [
+                        (0, 0, {"product_id": self.product.id, "price_unit": 10.0}),
+                        (
+                            0,
+                            0,
+                            {
+                                "product_id": self.product.id,
+                                "product_uom_qty": 3.0,
+                                "price_unit": 5.0,
+                            },
+                        ),
+                    ]
+                }
+            ]
+        )
+        self._revision_sale_order(sale_order_1)
+        revision_1 = sale_order_1.current_revision_id
+
+        # Check the lines are copied to the new revision
+        old_lines = sale_order_1.order_line
+        new_lines = revision_1.order_line
+        self.assertEqual(len(new_lines), 2)
+        self.assertFalse(new_lines & old_lines)
+        self.assertEqual(new_lines.mapped("product_uom_qty"), [1.0, 3.0])
+        self.assertEqual(new_lines.mapped("price_unit"), [10.0, 5.0])
+        self.assertEqual(set(new_lines.mapped("state")), {"draft"})
+        self.assertEqual(revision_1.amount_untaxed, sale_order_1.amount_untaxed)
+        self.assertEqual(sale_order_1.order_line, old_lines)
+
+    def test_order_revision_downpayment(self):
+        sale_order_1 = self._create_tester()
+        self.env["sale.order.line"].create(
+            {
+                "order_id": sale_order_1.id,
+                "name": "Down payment",
+                "product_uom_qty": 0.0,
+                "price_unit": 50.0,
+                "is_downpayment": True,
+            }
+        )
+        self.assertEqual(len(sale_order_1.order_line), 2)
+        self._revision_sale_order(sale_order_1)
+        revision_1 = sale_order_1.current_revision_id
+
+        # Like copy(), the down payment lines are not carried to the revision
+        self.assertEqual(len(revision_1.order_line), 1)
+        self.assertFalse(revision_1.order_line.is_downpayment)
+        self.assertEqual(revision_1.order_line.order_id, revision_1)
+        self.assertEqual(revision_1.order_line.product_id, self.product)
+
+    def test_order_revision_diff(self):
+        product_2 = self.env["product.product"].create({"name": "Test product 2"})
+        product_3 = self.env["product.product"].create({"name": "Test product 3"})
+        sale_order_1 = self._create_tester(
+            [
+                {
+                    "order_line": [
+                        (0, 0, {"display_type": "line_section", "name": "Civil"}),
+                        (0, 0, {"product_id": self.product.id, "price_unit": 10.0}),
+                        (0, 0, {"product_id": product_2.id, "price_unit": 20.0}),
+                        (0, 0, {"display_type": "line_section", "name": "Electrical"}),
+                        (0, 0, {"product_id": self.product.id, "price_unit": 30.0}),
+                    ]
+                }
+            ]
+        )
+        self._revision_sale_order(sale_order_1)
+        revision_1 = sale_order_1.current_revision_id
+        lines = revision_1.order_line.filtered(lambda line: not line.display_type)
+        lines[0].product_uom_qty = 3.0
+        lines[1].unlink()
+        revision_1.write(
+            {
+                "order_line": [
+                    (0, 0, {"product_id": product_3.id, "price_unit": 5.0}),
+                ]
+            }
+        )
+
+        diff = revision_1.get_revision_diff()
+        self.assertEqual(diff["revision_id"], sale_order_1.id)
+        self.assertEqual(len(diff["changed"]), 1)
+        changed = diff["changed"][0]
+        self.assertEqual(changed["section"], "Civil")
+        self.assertEqual(changed["product_id"], self.product.id)
+        self.assertIn("product_uom_qty", changed["changes"])
+        self.assertEqual(changed["amount_delta"], 20.0)
+        self.assertEqual(len(diff["removed"]), 1)
+        self.assertEqual(diff["removed"][0]["product_id"], product_2.id)
+        self.assertEqual(diff["removed"][0]["amount_delta"], -20.0)
+        self.assertEqual(len(diff["added"]), 1)
+        self.assertEqual(diff["added"][0]["product_id"], product_3.id)
+        self.assertEqual(diff["added"][0]["section"], "Electrical")
+        self.assertEqual(diff["amount_untaxed_delta"], 5.0)
+
+        # The original quotation has nothing to compare with
+        with self.assertRaises(UserError):
+            sale_order_1.get_revision_diff()
+
+    def test_order_revision_diff_revision_id(self):
+        sale_order_1 = self._create_tester()
+        self._revision_sale_order(sale_order_1)
+        revision_1 = sale_order_1.current_revision_id
+        self._revision_sale_order(revision_1)
+        revision_2 = revision_1.current_revision_id
+
+        # Any revision of the chain can be compared with
+        diff = revision_2.get_revision_diff(sale_order_1.id)
+        self.assertEqual(diff["res_id"], revision_2.id)
+        self.assertEqual(diff["revision_id"], sale_order_1.id)
+        self.assertEqual(revision_1.get_revision_diff(revision_2.id)["revision_id"], revision_2.id)
+
+        # Not with an order outside of it, nor with itself
+        other_order = self._create_tester()
+        with self.assertRaises(UserError):
+            revision_2.get_revision_diff(other_order.id)
+        with self.assertRaises(UserError):
+            revision_2.get_revision_diff(revision_2.id)
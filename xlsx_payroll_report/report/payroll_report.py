@@ -1,11 +1,83 @@
+from collections import defaultdict
+
 from odoo import models
-import string
+
+# Salary rule columns, in display order
+RULE_ORDER = ["Basic Salary",
+              "Accommodation",
+              "Transportation",
+              "Food",
+              "Other Payments",
+              # "Other Allowances",
+              "Car Allowance",
+              # "Car Allowances",
+              "Fixed Overtime",
+              "Overtime",
+
+              "Sick Time Off",
+              "Annual Time Off",
+              "Late In",
+              "Early Checkout",
+              "Absence",
+              "GOSI",
+              "Unpaid Leave",
+
+              "Gross",
+              "HRA",
+              "Advance Allowances",
+
+              "Annual Time Off DED",
+              "Sick Time Off DED",
+              "Net Salary", ]
 
 
 class PayrollReport(models.AbstractModel):
     _name = 'report.xlsx_payroll_report.xlsx_payroll_report'
     _inherit = 'report.report_xlsx.abstract'
 
+    def get_workbook_options(self):
+        """Stream rows to disk instead of keeping the whole workbook in memory.
+
+        Every sheet is written strictly top to bottom so the constant memory
+        mode of xlsxwriter can be used; set the system parameter
+        ``xlsx_payroll_report.constant_memory`` to ``False`` to disable it.
+        """
+        options = super().get_workbook_options()
+        param = self.env['ir.config_parameter'].sudo().get_param('xlsx_payroll_report.constant_memory', 'True')
+        if param.lower() not in ('0', 'false'):
+            options['constant_memory'] = True
+        return options
+
+    def _get_payroll_rules(self, slips):
+        """Salary rules shown as columns, filtered and sorted on RULE_ORDER."""
+        order_map = {name: index for index, name in enumerate(RULE_ORDER)}
+        groups = self.env['hr.payslip.line']._read_group([('slip_id', 'in', slips.ids)], ['salary_rule_id'])
+        salary_rules = [rule for rule, in groups if rule.name in order_map]
+        return sorted(salary_rules, key=lambda x: order_map.get(x.name, 9999))
+
+    def _get_payroll_matrix(self, slips, rules):
+        """Read the amounts of the whole batch as a slip x rule matrix.
+
+        One grouped query replaces the per slip ``line_ids`` reads; columns are
+        matched on the rule code like the payslip lines are.
+        """
+        cols_by_code = defaultdict(list)
+        for index, rule in enumerate(rules):
+            cols_by_code[rule.code].append(index)
+        matrix = {slip_id: [0.0] * len(rules) for slip_id in slips.ids}
+        if not cols_by_code:
+            return matrix
+        groups = self.env['hr.payslip.line']._read_group(
+            [('slip_id', 'in', slips.ids), ('code', 'in', list(cols_by_code))],
+            ['slip_id', 'code'],
+            ['amount:sum'],
+        )
+        for slip, code, amount in groups:
+            row = matrix[slip.id]
+            for index in cols_by_code[code]:
+                row[index] = amount
+        return matrix
+
     def generate_xlsx_report(self, workbook, data, lines):
 
         # ======================
@@ -95,28 +167,53 @@ class PayrollReport(models.AbstractModel):
             return name
 
         # ======================
-        # Fetch used structures
+        # Read the batch once and partition it by structure
         # ======================
+        slips = lines.slip_ids
+        sorted_rules = self._get_payroll_rules(slips)
+        matrix = self._get_payroll_matrix(slips, sorted_rules)
+
         used_structures = []
-        seen_ids = set()
-        for sal_structure in lines.slip_ids.struct_id:
-            if sal_structure.id not in seen_ids:
-                used_structures.append([sal_structure.id, sal_structure.name])
-                seen_ids.add(sal_structure.id)
+        slips_by_struct = defaultdict(list)
+        for slip in slips:
+            if slip.struct_id.id not in slips_by_struct:
+                used_structures.append([slip.struct_id.id, slip.struct_id.name])
+            slips_by_struct[slip.struct_id.id].append(slip)
+
+        rules = []
+        col_no = 3  # SHIFTED by +1 because we will add Emp ID, Name, Dept in cols 0..2
+        for rule in sorted_rules:
+            width = 12 if len(rule.name) < 8 else (len(rule.name) + 2)
+            rules.append([col_no, rule.code, rule.name, width])
+            col_no += 1
+        last_col = col_no - 1
+
+        # ======================
+        # Hide GOSI columns (display only, totals unaffected)
+        # ======================
+        HIDE_CODES = {
+            # "GOSI_COMP_ADD", "GOSI_EMP", "GOSI_COMP_DED"
+        }
+        HIDE_TITLES = {
+            # "GOSI",
+            # "GOSI Company Contribution",
+            # "GOSI Employee Deduction",
+            # "GOSI Company Deduction",
+            # "Annual Time Off DED",
+            # "Sick Time Off DED",
+            # "Sick Time Off",
+            # "Annual Time Off",
+        }
 
         struct_count = 1
         for used_struct in used_structures:
+            struct_slips = slips_by_struct[used_struct[0]]
             sheet = workbook.add_worksheet(str(struct_count) + ' - ' + str(used_struct[1]))
 
             # Print & view options (styling only)
             sheet.set_landscape()
             sheet.set_paper(9)  # A4
             sheet.fit_to_pages(1, 0)
-            sheet.hide_gridlines(2)
-
-            # Page setup / print styling
-            sheet.set_landscape()
-            sheet.fit_to_pages(1, 0)
             sheet.set_print_scale(100)
             sheet.set_margins(left=0.3, right=0.3, top=0.4, bottom=0.4)
             sheet.hide_gridlines(2)
@@ -124,87 +221,20 @@ class PayrollReport(models.AbstractModel):
             # Freeze panes below header row (title rows + header row)
             sheet.freeze_panes(6, 0)
 
-            cols = list(string.ascii_uppercase) + [
-                'AA', 'AB', 'AC', 'AD', 'AE', 'AF', 'AG', 'AH', 'AI', 'AJ', 'AK', 'AL',
-                'AM', 'AN', 'AO', 'AP', 'AQ', 'AR', 'AS', 'AT', 'AU', 'AV', 'AW', 'AX', 'AY', 'AZ'
-            ]
-
-            rules = []
-            col_no = 3  # SHIFTED by +1 because we will add Emp ID, Name, Dept in cols 0..2
-
-            # Salary rules (KEEP your logic)
-            salary_rule_ids = lines.slip_ids.line_ids.mapped("salary_rule_id")
-            order = ["Basic Salary",
-                     "Accommodation",
-                     "Transportation",
-                     "Food",
-                     "Other Payments",
-                     # "Other Allowances",
-                     "Car Allowance",
-                     # "Car Allowances",
-                     "Fixed Overtime",
-                     "Overtime",
-
-                     "Sick Time Off",
-                     "Annual Time Off",
-                     "Late In",
-                     "Early Checkout",
-                     "Absence",
-                     "GOSI",
-                     "Unpaid Leave",
-
-                     "Gross",
-                     "HRA",
-                     "Advance Allowances",
-
-                     "Annual Time Off DED",
-                     "Sick Time Off DED",
-                     "Net Salary", ]
-
-            salary_rule_ids = salary_rule_ids.filtered(lambda s: s.name in order)
-
-            order_map = {name: index for index, name in enumerate(order)}
-            sorted_rules = sorted(salary_rule_ids, key=lambda x: order_map.get(x.name, 9999))
-
-            for rule in sorted_rules:
-                row = [None, None, None, None, None]
-                row[0] = col_no
-                row[1] = rule.code
-                row[2] = rule.name
-                col_title = str(cols[col_no]) + ':' + str(cols[col_no])
-                row[3] = col_title
-                row[4] = 12 if len(rule.name) < 8 else (len(rule.name) + 2)
-                rules.append(row)
-                col_no += 1
-
-            # # --- Add Saudi GOSI virtual columns (display only) ---
-            # # to hide comment the below code including loop these will than not be included
-            # extra_cols = [
-            #     ("GOSI_COMP_ADD", "GOSI Company Contribution"),
-            #     ("GOSI_EMP", "GOSI Employee Deduction"),
-            #     ("GOSI_COMP_DED", "GOSI Company Deduction"),
-            # ]
-            # for code, name in extra_cols:
-            #     rowx = [None, None, None, None, None]
-            #     rowx[0] = col_no
-            #     rowx[1] = code
-            #     rowx[2] = name
-            #     col_title = f"{cols[col_no]}:{cols[col_no]}"
-            #     rowx[3] = col_title
-            #     rowx[4] = 22
-            #     rules.append(rowx)
-            #     col_no += 1
-
-            # Report details (KEEP your logic)
-            batch_period = ""
-            company_name = ""
-            for item in lines.slip_ids:
-                if item.struct_id.id == used_struct[0]:
-                    batch_period = f"{item.date_from.strftime('%d %B %Y')}  To  {item.date_to.strftime('%d %B %Y')}"
-                    company_name = item.company_id.name or ""
-                    break
-
-            last_col = col_no - 1
+            # Column widths (set before any row is written, see constant_memory)
+            sheet.set_column('A:A', 12)
+            sheet.set_column('B:B', 28)
+            sheet.set_column('C:C', 18)
+            for rule in rules:
+                if rule[1] in HIDE_CODES or rule[2] in HIDE_TITLES:
+                    sheet.set_column(rule[0], rule[0], 0.1, None, {'hidden': True})
+                else:
+                    sheet.set_column(rule[0], rule[0], rule[3])
+
+            # Report details (first payslip of the structure)
+            item = struct_slips[0]
+            batch_period = f"{item.date_from.strftime('%d %B %Y')}  To  {item.date_to.strftime('%d %B %Y')}"
+            company_name = item.company_id.name or ""
 
             # ======================
             # Title bars (PDF-like)
@@ -228,104 +258,46 @@ class PayrollReport(models.AbstractModel):
             # ======================
             header_row = 5
             sheet.set_row(header_row, 18)
-
-            sheet.write(header_row, 0, 'Employee ID', header_blue)
-            sheet.write(header_row, 1, 'Employee Name', header_blue)
-            sheet.write(header_row, 2, 'Department', header_blue)
-            for rule in rules:
-                sheet.write(header_row, rule[0], rule[2], header_blue)
+            sheet.write_row(header_row, 0, ['Employee ID', 'Employee Name', 'Department'], header_blue)
+            sheet.write_row(header_row, 3, [rule[2] for rule in rules], header_blue)
 
             # Autofilter on header row (styling / usability)
             sheet.autofilter(header_row, 0, header_row, last_col)
 
-            # Column widths
-            sheet.set_column('A:A', 12)
-            sheet.set_column('B:B', 28)
-            sheet.set_column('C:C', 18)
-            for rule in rules:
-                sheet.set_column(rule[3], rule[4])
-
             # ======================
-            # Hide GOSI columns (display only, totals unaffected)
-            # ======================
-            HIDE_CODES = {
-                # "GOSI_COMP_ADD", "GOSI_EMP", "GOSI_COMP_DED"
-            }
-            HIDE_TITLES = {
-                # "GOSI",
-                # "GOSI Company Contribution",
-                # "GOSI Employee Deduction",
-                # "GOSI Company Deduction",
-                # "Annual Time Off DED",
-                # "Sick Time Off DED",
-                # "Sick Time Off",
-                # "Annual Time Off",
-            }
-
-            for r in rules:
-                code = r[1]
-                title = r[2]
-                if code in HIDE_CODES or title in HIDE_TITLES:
-                    col_idx = r[0]
-                    sheet.set_column(col_idx, col_idx, 0.1, None, {'hidden': True})
-
-            # ======================
-            # Data rows (same logic, just styled)
+            # Data rows, one write_row per block of same-styled cells
             # ======================
             row = header_row + 1
             first_data_row = row  # for totals formula
-            has_payslips = False
-
-            for slip in lines.slip_ids:
-                if slip.struct_id.id != used_struct[0]:
-                    continue
 
-                has_payslips = True
+            for slip in struct_slips:
                 is_alt = ((row - first_data_row) % 2 == 1)
 
                 txt_fmt = cell_txt_alt if is_alt else cell_txt
                 txt_left_fmt = cell_txt_left_alt if is_alt else cell_txt_left
-                money_pos_fmt = cell_money_alt if is_alt else cell_money
-                money_neg_fmt = cell_money_alt if is_alt else cell_money  # keep same format; Excel shows minus
-
-                sheet.write(row, 0, slip.employee_id.code or '', txt_fmt)
-                sheet.write(row, 1, slip.employee_id.name or '', txt_left_fmt)
-                sheet.write(row, 2, slip.employee_id.department_id.name or '', txt_left_fmt)
-
-                # Fill all rule columns (by code)
-                # (Small perf improvement: build dict {code: amount} once per slip)
-                slip_amount_by_code = {l.code: l.amount for l in slip.line_ids}
-
-                DEDUCTION_CODES = {
-                    "ABS", "LATE", "ECO", "LEAVE90", "DIFFT", "UNPAID", "PAID87",
-                    "SICKTO89", "BTD",
-                    # add your own deduction rule codes here if needed
-                    "GOSI", "GOSI_EMP", "GOSI_COMP_DED",
-                }
+                # Excel shows negative amounts in red through the number format
+                money_fmt = cell_money_alt if is_alt else cell_money
 
-                for rule in rules:
-                    val = slip_amount_by_code.get(rule[1], 0.0)
-                    fmt = money_pos_fmt if val >= 0 else money_neg_fmt
-                    sheet.write(row, rule[0], val, fmt)
+                employee = slip.employee_id
+                sheet.write(row, 0, employee.code or '', txt_fmt)
+                sheet.write_row(row, 1, [employee.name or '', employee.department_id.name or ''], txt_left_fmt)
+                sheet.write_row(row, 3, matrix[slip.id], money_fmt)
 
                 row += 1
 
-            if has_payslips:
-                total_row = row
-                sheet.write(total_row, 0, 'Total', total_blue_txt)
-                sheet.write(total_row, 1, '', total_blue_txt)
-                sheet.write(total_row, 2, '', total_blue_txt)
-
-                # sum each numeric column from col 3..last_col
-                for c in range(3, last_col + 1):
-                    col_letter = xl_col_to_name(c)
-                    # Excel rows are 1-based:
-                    start = first_data_row + 1
-                    end = total_row
-                    sheet.write_formula(
-                        total_row, c,
-                        f"=SUM({col_letter}{start}:{col_letter}{end})",
-                        total_blue_money
-                    )
+            total_row = row
+            sheet.write_row(total_row, 0, ['Total', '', ''], total_blue_txt)
+
+            # sum each numeric column from col 3..last_col
+            for c in range(3, last_col + 1):
+                col_letter = xl_col_to_name(c)
+                # Excel rows are 1-based:
+                start = first_data_row + 1
+                end = total_row
+                sheet.write_formula(
+                    total_row, c,
+                    f"=SUM({col_letter}{start}:{col_letter}{end})",
+                    total_blue_money
+                )
 
             struct_count += 1